@@ -0,0 +1,73 @@
+"""Throughput of batch_search against a loop of intelligent_search calls
+
+    python -m benchmarks.bench_batch --rows 50000 --workers 1 2 4
+
+The queries are one per color x region x season combination, the way the
+merchandising jobs build them, plus a share of repeats.
+"""
+import argparse
+import itertools
+import os
+import random
+import tempfile
+import time
+
+from orchid_search import OrchidSearchDB
+
+from .synthetic import COLORS, REGIONS, SEASONS, populate
+
+
+def merchandising_queries(repeat_share: float = 0.2, seed: int = 7):
+    queries = [f"{color} {region} {season}"
+               for color, region, season in itertools.product(COLORS, REGIONS, SEASONS)]
+    rng = random.Random(seed)
+    queries += rng.choices(queries, k=int(len(queries) * repeat_share))
+    rng.shuffle(queries)
+    return queries
+
+
+def throughput(fn, count: int) -> float:
+    start = time.perf_counter()
+    fn()
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--mode", default="fts")
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+
+    queries = merchandising_queries()
+    with tempfile.TemporaryDirectory() as tmp:
+        db = OrchidSearchDB(os.path.join(tmp, "orchids.db"), pool_size=max(args.workers),
+                            cache_size=0, nlp_mode="fast")
+        db.connect()
+        db.create_tables()
+        populate(db, args.rows)
+        print(f"{args.rows} rows, {len(queries)} queries ({len(set(queries))} distinct), mode={args.mode}")
+
+        def loop():
+            for query in queries:
+                db.intelligent_search(query, limit=args.limit, mode=args.mode)
+
+        # Each run starts with cold preprocessing, as a fresh job would
+        db._analysis_cache.clear()
+        db.preprocessor.lemmatize.cache_clear()
+        base = throughput(loop, len(queries))
+        print(f"  {'intelligent_search loop':<28} {base:>8.0f} queries/s")
+
+        for executor in ("thread", "process"):
+            for workers in args.workers:
+                db._analysis_cache.clear()
+                db.preprocessor.lemmatize.cache_clear()
+                rate = throughput(lambda: db.batch_search(queries, mode=args.mode, limit=args.limit,
+                                                          workers=workers, executor=executor), len(queries))
+                print(f"  {f'batch_search {executor} x{workers}':<28} {rate:>8.0f} queries/s  {rate / base:>5.1f}x")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Category filters and facet counts from the in-memory bitmap index vs SQL
+
+    python -m benchmarks.bench_bitmap --rows 1000000
+
+Builds the bitsets for the seven category columns, reports their memory,
+then times each filter expression both ways: counting its matches,
+per-value counts for every category column among them, and a 50-row
+semantic_search whose ids the bitmaps pick and one query hydrates. Exits
+non-zero if the bitmaps select other orchids, or count other facet
+values, than SQL does for any expression.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from orchid_search import OrchidSearchDB
+from orchid_search.bitmap import BitmapIndex, categories_sql, parse_categories
+
+from .synthetic import populate
+
+CASES = {
+    "one value": {'Genus': 'Dendrobium'},
+    "3 facets": {'Fragrance': ['Fragrant', 'Highly fragrant'], 'Temperature_Preference': 'Intermediate',
+                 'Growth_Habit': 'Epiphytic'},
+    "rare values": {'Genus': ['Vanda', 'Aerides'], 'Conservation_Status': ['Endangered', 'Critically Endangered']},
+    "or / not": ('or', {'Genus': 'Masdevallia'},
+                 ('and', {'Horticultural_Difficulty': 'Easy'}, ('not', {'Pseudobulb': 'Present'}))),
+    "7 facets": ('and', {'Genus': ['Dendrobium', 'Bulbophyllum', 'Cymbidium']},
+                 ('not', {'Fragrance': 'None'}), {'Horticultural_Difficulty': ['Easy', 'Easy to moderate']},
+                 {'Growth_Habit': 'Epiphytic'}, ('not', {'Temperature_Preference': 'Cool'}),
+                 {'Conservation_Status': ['Least Concern', 'Near Threatened']}, {'Pseudobulb': 'Present'}),
+}
+
+
+def timed_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def bench(rows: int, repeat: int) -> int:
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        db = OrchidSearchDB(os.path.join(tmp, "orchids.db"), cache_size=0, nlp_mode="fast")
+        db.connect()
+        db.create_tables()
+        populate(db, rows)
+
+        start = time.perf_counter()
+        with db.pool.reader() as conn:
+            BitmapIndex.from_connection(conn)
+        build = (time.perf_counter() - start) * 1000
+        db.bitmap_index = True
+        memory = db.bitmap_memory()
+        print(f"\n{rows} rows: bitmaps built in {build:.0f}ms, {memory['bytes'] / 2**20:.1f} MiB "
+              f"({memory['ids_bytes'] / 2**20:.1f} MiB of ids and row mask)")
+        for column, info in memory['columns'].items():
+            print(f"  {column:<24} {info['values']:>4} values {info['dense']:>3} dense {info['sparse']:>4} sparse "
+                  f"{info['bytes'] / 2**10:>8.0f} KiB")
+
+        print(f"\nmedian of {repeat}")
+        print(f"  {'filter':<12} {'matches':>8} {'sql count':>10} {'bitmap':>8} {'sql facets':>11} {'bitmap':>8} "
+              f"{'sql 50':>8} {'bitmap':>8} {'same':>5}")
+        bitmaps = db._category_bitmaps()
+        for label, expr in CASES.items():
+            tree = parse_categories(expr)
+            where_clause, params = categories_sql(tree)
+
+            db.bitmap_index = False
+            expected = {row['id'] for row in db._fetchall(f"SELECT id FROM orchids WHERE {where_clause}", params)}
+            sql_facets = db.category_facets(expr)
+            sql_count = timed_ms(lambda: db._fetchone(f"SELECT COUNT(*) AS n FROM orchids WHERE {where_clause}",
+                                                      params), repeat)
+            sql_facet_ms = timed_ms(lambda: db.category_facets(expr), repeat)
+            sql_page = timed_ms(lambda: db.semantic_search(50, ["id", "Scientific_Name"], categories=expr), repeat)
+
+            db.bitmap_index = True
+            ids = set(bitmaps.select(bitmaps.evaluate(tree)).tolist())
+            page = db.semantic_search(50, ["id", "Scientific_Name"], categories=expr)
+            ok = (ids == expected and db.category_facets(expr) == sql_facets
+                  and page.ids == sorted(expected)[:50])
+            failures += not ok
+            bitmap_count = timed_ms(lambda: bitmaps.count(bitmaps.evaluate(tree)), repeat)
+            bitmap_facet_ms = timed_ms(lambda: db.category_facets(expr), repeat)
+            bitmap_page = timed_ms(lambda: db.semantic_search(50, ["id", "Scientific_Name"], categories=expr), repeat)
+
+            print(f"  {label:<12} {len(expected):>8} {sql_count:>8.1f}ms {bitmap_count:>6.2f}ms "
+                  f"{sql_facet_ms:>9.1f}ms {bitmap_facet_ms:>6.2f}ms {sql_page:>6.2f}ms {bitmap_page:>6.2f}ms "
+                  f"{'ok' if ok else 'FAIL':>5}")
+        db.close()
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    sys.exit(1 if bench(args.rows, args.repeat) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""OFFSET vs keyset pagination for the Browse tab, first and deep pages
+
+    python -m benchmarks.bench_browse --rows 500000 --page 5000
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from orchid_search import OrchidSearchDB
+from orchid_search.paging import SORTABLE_COLUMNS, encode_cursor
+
+from .synthetic import populate
+
+PAGE_SIZE = 25
+
+
+def timed_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500000)
+    parser.add_argument("--page", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = OrchidSearchDB(os.path.join(tmp, "orchids.db"), cache_size=0)
+        db.connect()
+        db.create_tables()
+        populate(db, args.rows)
+
+        full_count = timed_ms(lambda: db._fetchone("SELECT COUNT(*) AS count FROM orchids"), args.repeat)
+        kept_count = timed_ms(db.count, args.repeat)
+        print(f"COUNT(*) {full_count:.2f} ms   maintained total {kept_count:.3f} ms\n")
+
+        offset = (args.page - 1) * PAGE_SIZE
+        print(f"{'sort column':<20} {'order':<5} {'offset p1':>10} {f'offset p{args.page}':>13} "
+              f"{'keyset p1':>10} {f'keyset p{args.page}':>13}")
+        for column in SORTABLE_COLUMNS:
+            for order in ("ASC", "DESC"):
+                # Cursor pointing just before the deep page, as if reached by paging
+                anchor = db.get_page(column, order, limit=1, offset=offset - 1)[0]
+                cursor = encode_cursor(column, order, "next", anchor)
+                assert ([r['id'] for r in db.browse_page(column, order, PAGE_SIZE, cursor).rows]
+                        == [r['id'] for r in db.get_page(column, order, PAGE_SIZE, offset)])
+
+                results = [
+                    timed_ms(lambda: db.get_page(column, order, PAGE_SIZE, 0), args.repeat),
+                    timed_ms(lambda: db.get_page(column, order, PAGE_SIZE, offset), args.repeat),
+                    timed_ms(lambda: db.browse_page(column, order, PAGE_SIZE), args.repeat),
+                    timed_ms(lambda: db.browse_page(column, order, PAGE_SIZE, cursor), args.repeat),
+                ]
+                print(f"{column:<20} {order:<5} " + " ".join(f"{ms:>{w}.2f}" for ms, w in
+                                                                zip(results, (10, 13, 10, 13))))
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
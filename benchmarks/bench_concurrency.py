@@ -0,0 +1,89 @@
+"""Multi-threaded load test: search latency percentiles under concurrent sessions
+
+Each simulated session is a thread issuing a mix of smart, full-text and
+filter searches back to back, like a user clicking through the tabs.
+
+    python -m benchmarks.bench_concurrency --rows 50000 --sessions 1,8,32 --pool-sizes 1,8
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+
+from orchid_search import OrchidSearchDB
+from benchmarks.synthetic import populate
+
+WORKLOAD = [
+    lambda db: db.intelligent_search("pink fragrant orchids from Southeast Asia"),
+    lambda db: db.intelligent_search("white orchids cool temperature easy"),
+    lambda db: db.fulltext_search("pink AND fragrant"),
+    lambda db: db.semantic_search(genus="Phalaenopsis", min_temp=12),
+    lambda db: db.combined_search(text_query="fragrant", flower_color="White"),
+]
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_sessions(db: OrchidSearchDB, sessions: int, requests_per_session: int):
+    """Run concurrent sessions, returning (latencies_ms, wall_seconds)"""
+    latencies = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(sessions)
+
+    def session(seed):
+        rng = random.Random(seed)
+        local = []
+        barrier.wait()
+        for _ in range(requests_per_session):
+            search = rng.choice(WORKLOAD)
+            start = time.perf_counter()
+            search(db)
+            local.append((time.perf_counter() - start) * 1000)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return latencies, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--sessions", default="1,8,32")
+    parser.add_argument("--pool-sizes", default="1,8")
+    parser.add_argument("--requests", type=int, default=20, help="searches per session")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        seed_db = OrchidSearchDB(path)
+        seed_db.connect()
+        seed_db.create_tables()
+        populate(seed_db, args.rows)
+        seed_db.close()
+
+        print(f"{'pool':>4}  {'sessions':>8}  {'p50 ms':>8}  {'p99 ms':>8}  {'req/s':>8}")
+        for pool_size in [int(p) for p in args.pool_sizes.split(",")]:
+            db = OrchidSearchDB(path, pool_size=pool_size)
+            db.connect()
+            for sessions in [int(s) for s in args.sessions.split(",")]:
+                latencies, wall = run_sessions(db, sessions, args.requests)
+                print(f"{pool_size:>4}  {sessions:>8}  {statistics.median(latencies):>8.1f}  "
+                      f"{percentile(latencies, 99):>8.1f}  {len(latencies) / wall:>8.1f}")
+            db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Region resolution through the gazetteer closure table as the gazetteer grows
+
+    python -m benchmarks.bench_gazetteer --rows 100000 --sizes 1000 5000
+
+Grows the default gazetteer to each size with synthetic subdivisions under
+a new "Elsewhere" root, leaving Asia as it is, and times resolving a
+country, Asia (closure table vs a recursive walk of parent_id) and the
+growing subtree, a region filter, a smart search naming a region and
+rebuilding the query phrase map. Exits non-zero if "Asia" ever resolves
+to anything but the regions a plain-Python walk of the tree finds, or a
+region filter returns other orchids than the Python walk selects.
+"""
+import argparse
+import os
+import random
+import re
+import statistics
+import sys
+import tempfile
+import time
+
+from orchid_search import OrchidSearchDB
+from orchid_search.gazetteer import Gazetteer
+
+from .synthetic import populate
+
+RECURSIVE_SQL = """
+    WITH RECURSIVE down (id) AS (
+        SELECT id FROM regions WHERE name = ?
+        UNION ALL
+        SELECT r.id FROM regions r JOIN down ON r.parent_id = down.id
+    )
+    SELECT name FROM regions WHERE id IN (SELECT id FROM down) ORDER BY name
+"""
+
+
+def timed_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def grow(db: OrchidSearchDB, size: int, seed: int = 7) -> int:
+    """Add numbered subdivisions under Elsewhere until the gazetteer has size regions"""
+    rng = random.Random(seed)
+    names = ["Elsewhere"] + [row['name'] for row in db._fetchall(
+        "SELECT name FROM regions WHERE id IN (SELECT descendant_id FROM region_closure "
+        "WHERE ancestor_id = (SELECT id FROM regions WHERE name = 'Elsewhere')) ORDER BY id")]
+    total = db._fetchone("SELECT COUNT(*) AS n FROM regions")['n']
+    parents = {}
+    for i in range(total, size):
+        parent = rng.choice(names)
+        name = f"{parent} {i}"
+        parents[name] = parent
+        names.append(name)
+    return db.load_gazetteer(Gazetteer(parents)) if parents else 0
+
+
+def expected_descendants(db: OrchidSearchDB, root: str) -> set:
+    """Regions under root, itself included, by walking parent links in Python"""
+    parent_of = {row['name']: row['parent'] for row in db._fetchall(
+        "SELECT r.name, p.name AS parent FROM regions r LEFT JOIN regions p ON p.id = r.parent_id")}
+    found = set()
+    for name in parent_of:
+        node = name
+        while node is not None:
+            if node == root:
+                found.add(name)
+                break
+            node = parent_of[node]
+    return found
+
+
+def bench(rows: int, sizes, repeat: int) -> int:
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        db = OrchidSearchDB(os.path.join(tmp, "orchids.db"), cache_size=0, nlp_mode="fast")
+        db.connect()
+        db.create_tables()
+        populate(db, rows)
+        listed = {row['id']: {r.strip().lower() for r in re.split(r"[,;/]", row['Native_Regions'] or "")}
+                  for row in db._fetchall("SELECT id, Native_Regions FROM orchids")}
+
+        print(f"\n{rows} rows, median of {repeat}")
+        print(f"  {'regions':>8} {'closure':>8} {'country':>9} {'Asia':>9} {'recursive':>10} {'Elsewhere':>10} "
+              f"{'filter 50':>10} {'smart 50':>9} {'phrases':>9} {'asia':>6}")
+        for size in sizes:
+            grow(db, size)
+            regions, closure = db.conn.execute(
+                "SELECT (SELECT COUNT(*) FROM regions), (SELECT COUNT(*) FROM region_closure)").fetchone()
+
+            asia = db.resolve_regions("Asia")
+            expected = expected_descendants(db, "Asia")
+            ids = set(db.semantic_search(-1, ["id"], native_region="Asia").ids)
+            lowered = {name.lower() for name in expected}
+            ok = set(asia) == expected and ids == {i for i, names in listed.items() if names & lowered}
+            failures += not ok
+
+            country = timed_ms(lambda: db.resolve_regions("Indonesia"), repeat)
+            continent = timed_ms(lambda: db.resolve_regions("Asia"), repeat)
+            recursive = timed_ms(lambda: db._fetchall(RECURSIVE_SQL, ("Asia",)), repeat)
+            elsewhere = timed_ms(lambda: db.resolve_regions("Elsewhere"), repeat)
+            region_filter = timed_ms(lambda: db.semantic_search(50, ["id"], native_region="Asia"), repeat)
+            smart = timed_ms(lambda: db.intelligent_search("pink orchids from Southeast Asia", 50,
+                                                           columns=["id"]), repeat)
+
+            def rebuild_phrases():
+                db._region_phrases = None
+                db._region_matcher()
+            phrases = timed_ms(rebuild_phrases, repeat)
+
+            print(f"  {regions:>8} {closure:>8} {country:>7.2f}ms {continent:>7.2f}ms {recursive:>8.2f}ms "
+                  f"{elsewhere:>8.2f}ms {region_filter:>8.2f}ms {smart:>7.2f}ms {phrases:>7.1f}ms {'ok' if ok else 'FAIL':>6}"
+                  f"  ({len(asia)} in Asia, {len(ids)} orchids)")
+        db.close()
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[0, 1000, 5000],
+                        help="gazetteer sizes to grow to; 0 keeps the default gazetteer")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    sys.exit(1 if bench(args.rows, sorted(args.sizes), args.repeat) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Overhead of the instrumentation layer: disabled, tracing, and tracing with EXPLAIN
+
+    python -m benchmarks.bench_instrument --rows 20000
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from orchid_search import OrchidSearchDB
+from orchid_search.instrument import Instrumentation
+from orchid_search.results import SUMMARY_COLUMNS
+
+from .synthetic import populate
+
+CASES = [
+    ("intelligent_search", lambda db: db.intelligent_search("white cool easy", 50, columns=SUMMARY_COLUMNS)),
+    ("semantic_search", lambda db: db.semantic_search(50, genus="vanda", min_temp=15)),
+    ("combined_search", lambda db: db.combined_search("showy", 50, columns=SUMMARY_COLUMNS, min_temp=12)),
+    ("browse_page", lambda db: db.browse_page("Genus", limit=25)),
+    ("get_statistics", lambda db: db.get_statistics()),
+]
+
+SETTINGS = [
+    ("disabled", dict(enabled=False)),
+    ("enabled", dict(enabled=True)),
+    ("enabled+explain", dict(enabled=True, explain=True)),
+]
+
+
+def median_us(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = OrchidSearchDB(os.path.join(tmp, "orchids.db"), cache_size=0, nlp_mode="fast")
+        db.connect()
+        db.create_tables()
+        populate(db, args.rows)
+
+        print(f"{args.rows} rows, median of {args.repeat} (microseconds)")
+        print(f"  {'case':<20}" + "".join(f"{name:>17}" for name, _ in SETTINGS))
+        for label, search in CASES:
+            timings = []
+            for _, options in SETTINGS:
+                db.instrumentation = Instrumentation(**options)
+                search(db)
+                timings.append(median_us(lambda: search(db), args.repeat))
+            print(f"  {label:<20}" + "".join(f"{t:>17.1f}" for t in timings))
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
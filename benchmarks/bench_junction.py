@@ -0,0 +1,87 @@
+"""Region and color filters: LIKE over the delimited columns vs the junction tables
+
+    python -m benchmarks.bench_junction --rows 500000
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from orchid_search import OrchidSearchDB
+from orchid_search.db import MULTIVALUED_COLUMNS
+from orchid_search.results import SUMMARY_COLUMNS
+
+from .synthetic import populate
+
+SELECT = ", ".join(SUMMARY_COLUMNS)
+
+# (label, filters, the LIKE predicate the filters used to compile to, its parameters)
+CASES = [
+    ("region (common)", dict(native_region="Brazil"), "Native_Regions LIKE ?", ["%Brazil%"]),
+    ("region (rare)", dict(native_region="Comoros"), "Native_Regions LIKE ?", ["%Comoros%"]),
+    ("color", dict(flower_color="Lavender"), "Flower_Color LIKE ?", ["%Lavender%"]),
+    ("region+color", dict(native_region="Borneo", flower_color="Pink"),
+     "Native_Regions LIKE ? AND Flower_Color LIKE ?", ["%Borneo%", "%Pink%"]),
+    ("region IN (3)", dict(native_region=["Kenya", "Tanzania", "Reunion"]),
+     "(Native_Regions LIKE ? OR Native_Regions LIKE ? OR Native_Regions LIKE ?)",
+     ["%Kenya%", "%Tanzania%", "%Reunion%"]),
+    ("region+min_temp", dict(native_region="Madagascar", min_temp=18),
+     "Native_Regions LIKE ? AND Temperature_Min_C >= ?", ["%Madagascar%", 18]),
+]
+
+
+def timed_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def bench(rows: int, repeat: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        db = OrchidSearchDB(os.path.join(tmp, "orchids.db"), cache_size=0, nlp_mode="fast")
+        db.connect()
+        db.create_tables()
+        populate(db, rows)
+
+        print(f"\n{rows} rows, median of {repeat}")
+        print(f"  {'case':<18} {'LIKE 50':>10} {'joined 50':>10} {'LIKE all':>10} {'joined all':>11} {'matches':>8}")
+        for label, filters, predicate, params in CASES:
+            like_sql = f"SELECT {SELECT} FROM orchids WHERE {predicate} LIMIT ?"
+            like_first = timed_ms(lambda: db._fetchall(like_sql, params + [50]), repeat)
+            joined_first = timed_ms(lambda: db.semantic_search(50, SUMMARY_COLUMNS, **filters), repeat)
+
+            like_ids = {r['id'] for r in db._fetchall(like_sql, params + [-1])}
+            joined_ids = set(db.semantic_search(-1, SUMMARY_COLUMNS, **filters).ids)
+            like_all = timed_ms(lambda: db._fetchall(like_sql, params + [-1]), repeat)
+            joined_all = timed_ms(lambda: db.semantic_search(-1, SUMMARY_COLUMNS, **filters), repeat)
+            # LIKE is a substring match, so it can only find more
+            extra = f"  (+{len(like_ids - joined_ids)} substring-only)" if like_ids - joined_ids else ""
+            missing = "  MISSING" if joined_ids - like_ids else ""
+            print(f"  {label:<18} {like_first:>8.2f}ms {joined_first:>8.2f}ms {like_all:>8.1f}ms "
+                  f"{joined_all:>9.1f}ms {len(joined_ids):>8}{extra}{missing}")
+
+        stats_ms = timed_ms(db.get_statistics, repeat)
+        print(f"  get_statistics {stats_ms:.2f} ms -> {db.get_statistics()}")
+        for column, (lookup, junction, _) in MULTIVALUED_COLUMNS.items():
+            values, links = db.conn.execute(
+                f"SELECT (SELECT COUNT(*) FROM {lookup}), (SELECT COUNT(*) FROM {junction})"
+            ).fetchone()
+            print(f"  {column:<16} {values:>6} values, {links:>8} links")
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[500000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    for rows in args.rows:
+        bench(rows, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
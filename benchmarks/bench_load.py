@@ -0,0 +1,48 @@
+"""Benchmark OrchidSearchDB.load_data against a local synthetic CSV
+
+    python -m benchmarks.bench_load --rows 100000 --chunk-sizes 1,1000,10000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from orchid_search import OrchidSearchDB
+from benchmarks.synthetic import write_csv
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--chunk-sizes", default="1,1000,10000")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "orchids.csv")
+        write_csv(csv_path, args.rows)
+        size_mb = os.path.getsize(csv_path) / 1e6
+        print(f"{args.rows} rows, {size_mb:.1f} MB CSV")
+
+        for chunk_size in [int(c) for c in args.chunk_sizes.split(",")]:
+            db = OrchidSearchDB(os.path.join(tmp, f"load_{chunk_size}.db"))
+            db.connect()
+            db.create_tables()
+
+            last_report = [0.0]
+
+            def report(rows, elapsed):
+                # Throttle to ~2 lines/sec so tiny chunks don't flood the terminal
+                if elapsed - last_report[0] >= 0.5:
+                    last_report[0] = elapsed
+                    print(f"  chunk={chunk_size:<6} {rows:>9} rows  {rows / elapsed:>10,.0f} rows/sec")
+
+            start = time.perf_counter()
+            count = db.load_data(csv_path, chunk_size=chunk_size, progress=report)
+            elapsed = time.perf_counter() - start
+            print(f"  chunk={chunk_size:<6} {count:>9} rows  {count / elapsed:>10,.0f} rows/sec"
+                  f"  ({elapsed:.2f}s total)")
+            db.close()
+
+
+if __name__ == "__main__":
+    main()
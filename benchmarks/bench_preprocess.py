@@ -0,0 +1,74 @@
+"""Per-query preprocessing cost and cold start for the NLTK and fast tokenizer modes
+
+    python -m benchmarks.bench_preprocess --repeat 2000
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+from orchid_search.nlp import TOKENIZER_MODES, TextPreprocessor
+
+QUERIES = [
+    "pink fragrant orchids from Southeast Asia",
+    "white orchids cool temperature easy",
+    "large tropical flowers warm climate",
+    "Phalaenopsis with long-lasting blooms",
+    "beginner friendly orchid for a low light apartment",
+    "purple or lavender Cattleya, winter blooming",
+    "miniature epiphytic orchids from Costa Rica",
+    "the orchid's lip is yellow and spotted",
+    "Dendrobium species that tolerate dry winters",
+    "fragrant night-blooming Angraecum from Madagascar",
+]
+
+COLD_START = """
+import time
+start = time.perf_counter()
+from orchid_search.nlp import TextPreprocessor
+TextPreprocessor({mode!r}).preprocess("pink fragrant orchids from Southeast Asia")
+print(time.perf_counter() - start)
+"""
+
+
+def cold_start_seconds(mode: str) -> float:
+    """Time from import to the first preprocessed query in a fresh interpreter"""
+    out = subprocess.run([sys.executable, "-c", COLD_START.format(mode=mode)],
+                         capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def per_query_us(pre: TextPreprocessor, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        for query in QUERIES:
+            start = time.perf_counter()
+            pre.preprocess(query)
+            samples.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    reference = TextPreprocessor("nltk")
+    print(f"{'mode':<6}  {'cold start s':>12}  {'median us/query':>15}  {'mismatches':>10}")
+    for mode in TOKENIZER_MODES:
+        pre = TextPreprocessor(mode)
+        pre.warm_up()
+        mismatches = [q for q in QUERIES if pre.preprocess(q) != reference.preprocess(q)]
+        print(f"{mode:<6}  {cold_start_seconds(mode):>12.3f}  "
+              f"{per_query_us(pre, args.repeat):>15.1f}  {len(mismatches):>10}")
+        for q in mismatches:
+            print(f"        {q!r}: {pre.preprocess(q)} vs {reference.preprocess(q)}")
+
+    uncached = TextPreprocessor("nltk", lemma_cache_size=0)
+    uncached.warm_up()
+    print(f"{'nltk, no lemma cache':<22} {per_query_us(uncached, args.repeat // 10):>15.1f} us/query")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Vectorized environment scoring vs a per-row Python loop
+
+    python -m benchmarks.bench_recommend --rows 500000
+"""
+import argparse
+import heapq
+import statistics
+import time
+
+import numpy as np
+
+from orchid_search.scoring import (
+    CARE_WEIGHT, ENVIRONMENT_WEIGHT, HUMIDITY_TOLERANCE_PCT, HUMIDITY_WEIGHT, LIGHT_TOLERANCE_FC,
+    LIGHT_WEIGHT, SKILL_LEVELS, TEMP_TOLERANCE_C, TEMP_WEIGHT, UNKNOWN_MATCH, EnvironmentScorer,
+)
+
+USER = dict(user_temp=22.0, humidity=60.0, light_fc=1500.0, skill='beginner')
+
+
+def synthetic_scorer(n: int, seed: int = 42) -> EnvironmentScorer:
+    rng = np.random.default_rng(seed)
+    temp_min = rng.integers(8, 23, n).astype(np.float64)
+    humidity_min = rng.integers(40, 71, n).astype(np.float64)
+    light_min = rng.integers(800, 3000, n).astype(np.float64)
+    columns = {
+        'Temperature_Min_C': temp_min,
+        'Temperature_Max_C': temp_min + rng.integers(6, 15, n),
+        'Humidity_Min_Percent': humidity_min,
+        'Humidity_Max_Percent': humidity_min + rng.integers(10, 31, n),
+        'Light_Min_FC': light_min,
+        'Light_Max_FC': light_min + rng.integers(200, 1500, n),
+    }
+    difficulty = rng.choice([1.0, 1.5, 2.0, 3.0], n)
+    return EnvironmentScorer(np.arange(1, n + 1), columns, difficulty)
+
+
+def _match(value, low, high, tolerance):
+    if low != low or high != high:  # NaN
+        return UNKNOWN_MATCH
+    distance = max(low - value, 0.0) + max(value - high, 0.0)
+    return min(max(1.0 - distance / tolerance, 0.0), 1.0)
+
+
+def python_loop_top_k(scorer: EnvironmentScorer, k: int, user_temp, humidity, light_fc, skill):
+    """The same score computed row by row in plain Python"""
+    skill_level = SKILL_LEVELS[skill]
+    rows = zip(scorer.ids.tolist(), scorer.temp_min.tolist(), scorer.temp_max.tolist(),
+               scorer.humidity_min.tolist(), scorer.humidity_max.tolist(),
+               scorer.light_min.tolist(), scorer.light_max.tolist(), scorer.difficulty.tolist())
+    scored = []
+    for oid, tmin, tmax, hmin, hmax, lmin, lmax, difficulty in rows:
+        environment = (TEMP_WEIGHT * _match(user_temp, tmin, tmax, TEMP_TOLERANCE_C)
+                       + HUMIDITY_WEIGHT * _match(humidity, hmin, hmax, HUMIDITY_TOLERANCE_PCT)
+                       + LIGHT_WEIGHT * _match(light_fc, lmin, lmax, LIGHT_TOLERANCE_FC))
+        care = min(max(1.0 - 0.5 * max(difficulty - skill_level, 0.0), 0.0), 1.0)
+        score = 100.0 * (ENVIRONMENT_WEIGHT * environment + CARE_WEIGHT * care) / (
+            ENVIRONMENT_WEIGHT + CARE_WEIGHT)
+        scored.append((score, oid))
+    return heapq.nlargest(k, scored)
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500000)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    scorer = synthetic_scorer(args.rows)
+    print(f"{args.rows} species, {scorer.nbytes / 1e6:.1f} MB of score arrays")
+
+    numpy_ms, (ids, scores) = timed(lambda: scorer.recommend(k=args.k, **USER), args.repeat)
+    loop_ms, loop_top = timed(lambda: python_loop_top_k(scorer, args.k, **USER), max(1, args.repeat // 5))
+
+    assert np.allclose(scores, [s for s, _ in loop_top]), "vectorized and loop scores disagree"
+    print(f"numpy vectorized   {numpy_ms:>9.1f} ms")
+    print(f"python loop        {loop_ms:>9.1f} ms   ({loop_ms / numpy_ms:.0f}x slower)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Bytes moved and allocations of full row dicts vs projected, lazily hydrated results
+
+    python -m benchmarks.bench_results --rows 50000 --limits 50 5000
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from orchid_search import OrchidSearchDB
+from orchid_search.results import SUMMARY_COLUMNS
+
+from .synthetic import populate
+
+QUERY = "orchid"
+
+
+def payload_bytes(rows) -> int:
+    """Bytes of cell values handed over by SQLite: text/blob lengths plus 8 per number"""
+    total = 0
+    for row in rows:
+        for value in row:
+            total += len(value) if isinstance(value, (str, bytes)) else 8
+    return total
+
+
+def measure(fn, repeat: int):
+    """(median ms, peak traced bytes, allocated blocks still held by the result)"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    blocks_before = sys.getallocatedblocks()
+    result = fn()
+    blocks = sys.getallocatedblocks() - blocks_before
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return statistics.median(samples), peak, blocks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--limits", type=int, nargs="+", default=[50, 5000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = OrchidSearchDB(os.path.join(tmp, "orchids.db"), cache_size=0)
+        db.connect()
+        db.create_tables()
+        populate(db, args.rows)
+
+        print(f"{'limit':>6} {'variant':<26} {'fetched':>10} {'ms':>8} {'py peak':>10} {'blocks':>8}")
+        for limit in args.limits:
+            full_sql = "SELECT * FROM orchids WHERE id IN (SELECT rowid FROM orchids_fts WHERE orchids_fts MATCH ?) LIMIT ?"
+            projected_sql = full_sql.replace("*", db._projection(SUMMARY_COLUMNS), 1)
+            sizes = {
+                "full": payload_bytes(db.conn.execute(full_sql, (QUERY, limit))),
+                "projected": payload_bytes(db.conn.execute(projected_sql, (QUERY, limit))),
+            }
+
+            variants = [
+                ("SELECT * dicts", "full", lambda: db.fulltext_search(QUERY, limit)),
+                ("projection ResultSet", "projected",
+                 lambda: db.fulltext_search(QUERY, limit, columns=SUMMARY_COLUMNS)),
+                ("dicts -> DataFrame", "full",
+                 lambda: __import__("pandas").DataFrame(db.fulltext_search(QUERY, limit))),
+                ("ResultSet -> DataFrame", "projected",
+                 lambda: db.fulltext_search(QUERY, limit, columns=SUMMARY_COLUMNS).to_dataframe()),
+            ]
+            for label, size_key, fn in variants:
+                ms, peak, blocks = measure(fn, args.repeat)
+                print(f"{limit:>6} {label:<26} {sizes[size_key] / 1e3:>8.1f}kB {ms:>8.2f} "
+                      f"{peak / 1e3:>8.1f}kB {blocks:>8}")
+
+            # A screen of expanders reading every column: one batched query per 50 rows
+            results = db.fulltext_search(QUERY, limit, columns=SUMMARY_COLUMNS)
+            start = time.perf_counter()
+            for row in results[:10]:
+                row.to_dict()
+            print(f"{limit:>6} {'hydrate 10 expanders':<26} {'':>10} {(time.perf_counter() - start) * 1000:>8.2f}\n")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
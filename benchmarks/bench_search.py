@@ -0,0 +1,58 @@
+"""Compare intelligent_search latency on the FTS5/bm25 path against the LIKE path
+
+    python -m benchmarks.bench_search --sizes 5000,50000,500000
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from orchid_search import OrchidSearchDB
+from benchmarks.synthetic import populate
+
+QUERIES = [
+    "pink fragrant orchids from Southeast Asia",
+    "white orchids cool temperature easy",
+    "large tropical flowers warm climate",
+    "phalaenopsis",
+    "purple cloud forest epiphytic",
+]
+
+
+def time_query(db: OrchidSearchDB, query: str, mode: str, repeat: int) -> float:
+    """Median wall time of one query in milliseconds"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        db.intelligent_search(query, limit=50, mode=mode)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="5000,50000,500000")
+    parser.add_argument("--modes", default="fts,like")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",")]
+    modes = args.modes.split(",")
+
+    print(f"{'rows':>8}  {'mode':<5}  {'median ms':>10}  {'worst query ms':>14}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            db = OrchidSearchDB(os.path.join(tmp, "bench.db"))
+            db.connect()
+            db.create_tables()
+            populate(db, size)
+            for mode in modes:
+                per_query = [time_query(db, q, mode, args.repeat) for q in QUERIES]
+                print(f"{size:>8}  {mode:<5}  {statistics.median(per_query):>10.2f}  "
+                      f"{max(per_query):>14.2f}")
+            db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""Requests/sec and tail latency of the HTTP service under concurrent load
+
+    python -m benchmarks.bench_service --rows 50000 --concurrency 1 8 32 --duration 10
+
+The service runs in its own process on a snapshot built from synthetic
+rows, so client and server don't share a GIL; on a single machine they
+still share CPUs, which caps the numbers.
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+import httpx
+
+from orchid_search.snapshot import build_snapshot
+
+from .synthetic import write_csv
+
+QUERIES = [
+    "pink fragrant orchids from Southeast Asia",
+    "white orchids cool temperature easy",
+    "large tropical flowers warm climate",
+    "phalaenopsis",
+    "purple cloud forest epiphytic",
+]
+COLORS = ["pink", "white", "yellow", "purple", "green"]
+
+
+def request_mix(rows: int):
+    """(endpoint label, path) pairs in the proportions a browsing user might produce"""
+    rng = random.Random(7)
+    while True:
+        roll = rng.random()
+        if roll < 0.5:
+            yield "search", f"/search?q={rng.choice(QUERIES)}&limit=50"
+        elif roll < 0.7:
+            yield "similar", f"/recommend/similar/{rng.randint(1, rows)}"
+        elif roll < 0.85:
+            yield "beginners", f"/recommend/beginners?temperature_c={rng.uniform(15, 30):.1f}"
+        elif roll < 0.95:
+            yield "by-color", f"/recommend/by-color/{rng.choice(COLORS)}?limit=20"
+        else:
+            yield "search-5000", f"/search?q={rng.choice(QUERIES)}&limit=5000&format=ndjson"
+
+
+async def run_load(base_url: str, rows: int, concurrency: int, duration: float):
+    mix = request_mix(rows)
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    deadline = time.perf_counter() + duration
+
+    async def worker(client: httpx.AsyncClient):
+        while time.perf_counter() < deadline:
+            label, path = next(mix)
+            start = time.perf_counter()
+            response = await client.get(path)
+            await response.aread()
+            if response.status_code == 200:
+                latencies[label].append(time.perf_counter() - start)
+            else:
+                errors[label] += 1
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return latencies, errors, elapsed
+
+
+def percentile_ms(samples, q: float) -> float:
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(q * len(samples)))] * 1000
+
+
+def report(concurrency: int, latencies, errors, elapsed: float):
+    every = [s for samples in latencies.values() for s in samples]
+    print(f"\nconcurrency {concurrency}: {len(every) / elapsed:,.0f} req/s over {elapsed:.1f}s, "
+          f"{sum(errors.values())} errors")
+    print(f"  {'endpoint':<12} {'requests':>8} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for label in sorted(latencies) + ["all"]:
+        samples = every if label == "all" else latencies[label]
+        print(f"  {label:<12} {len(samples):>8} {statistics.median(samples) * 1000:>6.1f}ms "
+              f"{percentile_ms(samples, 0.95):>6.1f}ms {percentile_ms(samples, 0.99):>6.1f}ms")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_up(base_url: str, server: subprocess.Popen, timeout: float = 60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError("Service exited during startup")
+        try:
+            if httpx.get(f"{base_url}/health").status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("Service did not come up")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--pool-size", type=int, default=4)
+    parser.add_argument("--nlp-mode", default="nltk", choices=("nltk", "fast"))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "orchids.csv")
+        snapshot_path = os.path.join(tmp, "orchids.db")
+        write_csv(csv_path, args.rows)
+        build_snapshot(csv_path, snapshot_path, workers=1)
+
+        port = free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        server = subprocess.Popen(
+            [sys.executable, "-m", "orchid_search.service", "--db", snapshot_path, "--port", str(port),
+             "--pool-size", str(args.pool_size), "--nlp-mode", args.nlp_mode, "--max-pending", "1024"],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        )
+        try:
+            wait_until_up(base_url, server)
+            # Warm up the NLP resources and the page cache before measuring
+            asyncio.run(run_load(base_url, args.rows, 2, 2.0))
+            for concurrency in args.concurrency:
+                report(concurrency, *asyncio.run(run_load(base_url, args.rows, concurrency, args.duration)))
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Wall time and peak memory of the similar-orchids index build
+
+    python -m benchmarks.bench_similarity --rows 5000 100000 --workers 1 4
+"""
+import argparse
+import os
+import resource
+import tempfile
+import time
+import tracemalloc
+
+from orchid_search import OrchidSearchDB
+from orchid_search.similarity import SimilarityFeatures, build_neighbors
+
+from .synthetic import populate
+
+
+def _children_maxrss_mb() -> float:
+    # ru_maxrss is in KiB on Linux: the largest worker process so far
+    return resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+
+
+def bench(rows: int, workers_list, k: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        db = OrchidSearchDB(os.path.join(tmp, "orchids.db"))
+        db.connect()
+        db.create_tables()
+        populate(db, rows)
+
+        for workers in workers_list:
+            tracemalloc.start()
+            start = time.perf_counter()
+            features = SimilarityFeatures.from_connection(db.conn)
+            encoded = time.perf_counter()
+            neighbors = build_neighbors(features, k=k, workers=workers)
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            workers_rss = f"{_children_maxrss_mb():7.1f} MB" if workers > 1 else "      -"
+            print(f"{rows:>8} {workers:>7} {elapsed:>9.2f}s {encoded - start:>9.2f}s "
+                  f"{peak / 1e6:>9.1f} MB {workers_rss}   {len(neighbors)} pairs, "
+                  f"features {features.nbytes / 1e6:.1f} MB")
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[5000, 100000])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'workers':>7} {'wall':>10} {'encode':>10} {'py peak':>12} {'worker rss':>10}")
+    for rows in args.rows:
+        bench(rows, sorted(set(args.workers)), args.k)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Time to first interactive search: first start from CSV vs existing database vs snapshot
+
+    python -m benchmarks.bench_startup --rows 50000 --nlp-mode nltk
+
+Every measurement runs in a fresh interpreter, so imports and page cache
+state match a process start (the OS page cache stays warm between runs).
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from orchid_search.snapshot import build_snapshot
+
+from .synthetic import write_csv
+
+QUERY = "pink fragrant orchids from Southeast Asia"
+
+# Runs in the child interpreter; prints one JSON line of timings
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+mode, path, nlp_mode, query, eager = sys.argv[1:6]
+if eager == "1":
+    import pandas, nltk
+from orchid_search import OrchidSearchDB
+from orchid_search.snapshot import open_snapshot
+imported = time.perf_counter()
+
+if mode == "snapshot":
+    db = open_snapshot(path, nlp_mode=nlp_mode)
+else:
+    db = OrchidSearchDB(path if mode == "existing" else path + ".fresh.db", nlp_mode=nlp_mode)
+    db.connect()
+    db.create_tables()
+    if mode == "csv":
+        db.load_data(path)
+        db.build_similarity_index()
+    db.count()
+opened = time.perf_counter()
+
+db.intelligent_search(query, limit=50)
+searched = time.perf_counter()
+print(json.dumps({
+    "import": imported - start, "open": opened - imported, "search": searched - opened,
+    "total": searched - start, "pandas": "pandas" in sys.modules, "nltk": "nltk" in sys.modules,
+}))
+"""
+
+
+def run_child(mode: str, path: str, nlp_mode: str, eager: bool) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD, mode, path, nlp_mode, QUERY, "1" if eager else "0"],
+        check=True, capture_output=True, text=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--nlp-mode", default="nltk", choices=("nltk", "fast"))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "orchids.csv")
+        write_csv(csv_path, args.rows)
+        snapshot_path = os.path.join(tmp, "snapshot.db")
+        start = time.perf_counter()
+        build_snapshot(csv_path, snapshot_path, workers=1)
+        print(f"offline snapshot build: {time.perf_counter() - start:.1f}s, "
+              f"{os.path.getsize(snapshot_path) / 1e6:.1f} MB\n")
+
+        # A writable copy to time the "existing orchids.db" start
+        existing_path = os.path.join(tmp, "existing.db")
+        with open(snapshot_path, "rb") as src, open(existing_path, "wb") as dst:
+            dst.write(src.read())
+
+        cases = [
+            ("csv", csv_path, True, "first start from CSV, eager imports"),
+            ("existing", existing_path, True, "existing db, eager imports"),
+            ("existing", existing_path, False, "existing db, lazy imports"),
+            ("snapshot", snapshot_path, False, "snapshot, lazy imports"),
+        ]
+        print(f"{'startup':<38} {'import':>8} {'open':>8} {'1st search':>10} {'total':>8}  loaded")
+        for mode, path, eager, label in cases:
+            runs = []
+            # The CSV start builds its database once; it can't be repeated from scratch
+            for _ in range(1 if mode == "csv" else args.repeat):
+                runs.append(run_child(mode, path, args.nlp_mode, eager))
+            best = min(runs, key=lambda r: r["total"])
+            loaded = ",".join(m for m in ("pandas", "nltk") if best[m]) or "-"
+            print(f"{label:<38} " + " ".join(f"{best[k] * 1000:>{w}.0f}" for k, w in
+                                             (("import", 8), ("open", 8), ("search", 10), ("total", 8)))
+                  + f" ms  {loaded}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Sidebar statistics and filter dropdowns: full scans vs the facet tables
+
+    python -m benchmarks.bench_stats --rows 200000
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from orchid_search import OrchidSearchDB
+
+from .synthetic import populate
+
+SCAN_QUERIES = {
+    'statistics': [
+        "SELECT COUNT(*) FROM orchids",
+        "SELECT COUNT(DISTINCT Genus) FROM orchids",
+        "SELECT COUNT(DISTINCT Flower_Color) FROM orchids",
+        "SELECT COUNT(DISTINCT Native_Regions) FROM orchids",
+    ],
+    'unique genera': ["SELECT DISTINCT Genus FROM orchids WHERE Genus IS NOT NULL ORDER BY Genus"],
+    'facet counts': [
+        f"SELECT {c}, COUNT(*) FROM orchids GROUP BY {c}"
+        for c in ('Genus', 'Flower_Color', 'Native_Regions', 'Fragrance', 'Horticultural_Difficulty')
+    ],
+}
+
+
+def timed_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # No result cache, so every call hits SQLite like a fresh rerun would
+        db = OrchidSearchDB(os.path.join(tmp, "orchids.db"), cache_size=0)
+        db.connect()
+        db.create_tables()
+        populate(db, args.rows)
+
+        def scan(name):
+            with db.pool.reader() as conn:
+                for sql in SCAN_QUERIES[name]:
+                    conn.execute(sql).fetchall()
+
+        materialized = {
+            'statistics': db.get_statistics,
+            'unique genera': lambda: db.get_unique_values("Genus"),
+            'facet counts': db.get_facets,
+        }
+        print(f"{args.rows} rows")
+        print(f"{'':<16} {'scan':>10} {'facets':>10}")
+        for name, fn in materialized.items():
+            print(f"{name:<16} {timed_ms(lambda: scan(name), args.repeat):>8.2f}ms "
+                  f"{timed_ms(fn, args.repeat):>8.2f}ms")
+        filtered = timed_ms(lambda: db.get_facets(min_temp=15, fragrance="fragrant"), args.repeat)
+        print(f"{'filtered facets':<16} {'':>10} {filtered:>8.2f}ms")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
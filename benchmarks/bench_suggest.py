@@ -0,0 +1,140 @@
+"""Typeahead latency of NameIndex on a large name vocabulary, and suggest() through the database
+
+    python -m benchmarks.bench_suggest --names 1000000 --rows 20000
+
+Builds a NameIndex over --names distinct species names plus the genera
+and color-genus common names of the synthetic catalog, then times
+suggest() for prefixes of 1-3 and 4-8 characters drawn from the starts of
+names and of their later words, as users type them. Also times
+OrchidSearchDB.suggest() with the query cache off on a --rows catalog.
+Exits non-zero if any of a sample of prefixes ranks differently than a
+brute-force scan of every name.
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+
+from orchid_search import OrchidSearchDB
+from orchid_search.suggest import NameIndex, normalize
+
+from .synthetic import GENUS_PROFILES, SYLLABLES, populate
+
+COLORS = ['White', 'Pink', 'Yellow', 'Purple', 'Red', 'Green', 'Orange', 'Lavender']
+
+
+def vocabulary(n: int, seed: int = 42):
+    """(id, label, kind, popularity) for n distinct species, their genera and common names"""
+    rng = random.Random(seed)
+    genera = list(GENUS_PROFILES)
+    weights = [1 / (i + 1) for i in range(len(genera))]
+    seen = set()
+    names = []
+    per_genus = dict.fromkeys(genera, 0)
+    while len(names) < n:
+        genus = rng.choices(genera, weights)[0]
+        label = f"{genus} {''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 5)))}"
+        if label in seen:
+            continue
+        seen.add(label)
+        per_genus[genus] += 1
+        names.append((len(names) + 1, label, 'species', rng.choice((0, 0, 0, 1, 2))))
+    names += [(i, genus, 'genus', count) for i, (genus, count) in enumerate(per_genus.items())]
+    names += [(i, f"{color} {genus.lower()} orchid", 'common_name', per_genus[genus] // len(COLORS))
+              for i, (color, genus) in enumerate((c, g) for c in COLORS for g in genera)]
+    return names
+
+
+def typed_prefixes(labels, lengths, count: int, seed: int = 7):
+    """Prefixes of name and later-word starts, as typed into a search box"""
+    rng = random.Random(seed)
+    prefixes = []
+    while len(prefixes) < count:
+        words = rng.choice(labels).split()
+        start = " ".join(words[rng.randrange(len(words)):])
+        prefixes.append(start[:rng.choice(lengths)])
+    return prefixes
+
+
+def expected(index: NameIndex, prefix: str, k: int):
+    """Top k by brute force: exact labels, then label starts, then later words, each best name first"""
+    prefix = normalize(prefix)
+    if not prefix:
+        return []
+    matches = []
+    for rank, label in enumerate(index.labels):
+        key = normalize(label)
+        words = [" ".join(key.split(" ")[i:]) for i in range(1, len(key.split(" ")))]
+        words += [key[i + 1:] for i, c in enumerate(key) if c in "-(" and i + 1 < len(key)]
+        if key == prefix:
+            matches.append((0, rank))
+        elif key.startswith(prefix):
+            matches.append((1, rank))
+        elif any(w.startswith(prefix) for w in words):
+            matches.append((2, rank))
+    return [(int(index.ids[r]), index.labels[r], index.kinds[r]) for _, r in sorted(matches)[:k]]
+
+
+def percentiles(fn, prefixes):
+    samples = []
+    for prefix in prefixes:
+        start = time.perf_counter()
+        fn(prefix)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.99)], samples[-1]
+
+
+def bench(n: int, rows: int, queries: int, k: int) -> int:
+    names = vocabulary(n)
+    start = time.perf_counter()
+    index = NameIndex(names)
+    build = time.perf_counter() - start
+    print(f"\n{len(index)} names, {len(index.keys)} keys: built in {build:.1f}s, "
+          f"{len(index._top)} prefixes precomputed")
+
+    labels = index.labels
+    print(f"  {'prefixes':<16} {'p50':>8} {'p99':>8} {'max':>8}")
+    for label, lengths in (("1-3 chars", (1, 2, 3)), ("4-8 chars", (4, 5, 6, 7, 8))):
+        prefixes = typed_prefixes(labels, lengths, queries)
+        p50, p99, worst = percentiles(lambda p: index.suggest(p, k), prefixes)
+        print(f"  {label:<16} {p50 * 1000:>6.1f}us {p99 * 1000:>6.1f}us {worst * 1000:>6.1f}us")
+
+    # Brute force is slow, so check ranking on a smaller vocabulary
+    small = NameIndex(vocabulary(min(n, 20000)))
+    failures = 0
+    for prefix in typed_prefixes(small.labels, (1, 2, 3, 4, 6, 9), 200, seed=11) + ["", "zzz", "PINK  D"]:
+        if small.suggest(prefix, k) != expected(small, prefix, k):
+            failures += 1
+            print(f"  FAIL {prefix!r}: {small.suggest(prefix, k)} != {expected(small, prefix, k)}")
+    print(f"  ranking vs brute force: {'ok' if not failures else f'{failures} FAIL'}")
+
+    db = OrchidSearchDB(":memory:", cache_size=0, nlp_mode="fast")
+    db.connect()
+    db.create_tables()
+    populate(db, rows)
+    start = time.perf_counter()
+    db._name_index()
+    build = time.perf_counter() - start
+    prefixes = typed_prefixes([row['Scientific_Name'] for row in db._fetchall(
+        "SELECT Scientific_Name FROM orchids LIMIT 1000")], (1, 2, 3), queries)
+    p50, p99, worst = percentiles(lambda p: db.suggest(p, k), prefixes)
+    print(f"  db.suggest, {rows} rows (index built in {build * 1000:.0f}ms): "
+          f"p50 {p50 * 1000:.1f}us p99 {p99 * 1000:.1f}us max {worst * 1000:.1f}us")
+    db.close()
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--names", type=int, default=1000000)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=20000)
+    parser.add_argument("-k", type=int, default=8)
+    args = parser.parse_args()
+    sys.exit(1 if bench(args.names, args.rows, args.queries, args.k) else 0)
+
+
+if __name__ == "__main__":
+    main()
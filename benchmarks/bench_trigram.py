@@ -0,0 +1,91 @@
+"""Infix filters and text search: LIKE scans vs facet-value and trigram index routing
+
+    python -m benchmarks.bench_trigram --rows 100000 500000
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from orchid_search import OrchidSearchDB
+
+from .synthetic import populate
+
+CASES = [
+    ("semantic genus (common)", lambda db: db.semantic_search(50, genus="dendro")),
+    ("semantic genus (typo)", lambda db: db.semantic_search(50, genus="Phalenopsis")),
+    ("semantic genus+region", lambda db: db.semantic_search(50, genus="dendro", native_region="Madagascar")),
+    ("combined text (common)", lambda db: db.combined_search("orchid", 50)),
+    ("combined text (rare)", lambda db: db.combined_search("schilpur", 50)),
+    ("combined text+filters", lambda db: db.combined_search("showy", 50, genus="vanda", min_temp=15)),
+    ("fallback (common)", lambda db: db.fallback_search("showy", 50)),
+    ("fallback (rare)", lambda db: db.fallback_search("schilpur", 50)),
+]
+
+
+def timed_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def bench(rows: int, repeat: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        db = OrchidSearchDB(os.path.join(tmp, "orchids.db"), cache_size=0, nlp_mode="fast")
+        db.connect()
+        db.create_tables()
+        populate(db, rows)
+
+        print(f"\n{rows} rows")
+        print(f"  {'case':<26} {'LIKE':>9} {'indexed':>9} {'speedup':>8} {'rows':>5}")
+        for label, search in CASES:
+            db.infix_index = False
+            like_ids = sorted(r['id'] for r in search(db))
+            like_ms = timed_ms(lambda: search(db), repeat)
+            db.infix_index = True
+            indexed_ids = sorted(r['id'] for r in search(db))
+            indexed_ms = timed_ms(lambda: search(db), repeat)
+            # Without ORDER BY, LIMIT may keep different rows; only compare when all fit
+            same = "  MISMATCH" if len(like_ids) < 50 and like_ids != indexed_ids else ""
+            print(f"  {label:<26} {like_ms:>7.2f}ms {indexed_ms:>7.2f}ms {like_ms / indexed_ms:>7.1f}x "
+                  f"{len(indexed_ids):>5}{same}")
+
+        start = time.perf_counter()
+        suggestion = db.did_you_mean("pink Phalenopsis from Madagaskar")
+        first_ms = (time.perf_counter() - start) * 1000
+        warm_ms = timed_ms(lambda: db.did_you_mean("white Dendrobum from Indonsia"), repeat)
+        print(f"  did_you_mean: {first_ms:.1f} ms with vocabulary load "
+              f"({len(db._term_vocabulary())} words), {warm_ms:.2f} ms after -> {suggestion!r}")
+
+        size = {name: pages for name, pages in db.conn.execute(
+            "SELECT name, SUM(pgsize) FROM dbstat WHERE name LIKE 'orchids_trigram%' OR name = 'orchids' GROUP BY name"
+        )} if _has_dbstat(db) else {}
+        if size:
+            trigram = sum(v for k, v in size.items() if k.startswith('orchids_trigram'))
+            print(f"  trigram index {trigram / 1e6:.1f} MB vs orchids table {size['orchids'] / 1e6:.1f} MB")
+        db.close()
+
+
+def _has_dbstat(db: OrchidSearchDB) -> bool:
+    try:
+        db.conn.execute("SELECT 1 FROM dbstat LIMIT 1")
+        return True
+    except Exception:
+        return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100000, 500000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    for rows in args.rows:
+        bench(rows, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
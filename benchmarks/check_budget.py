@@ -0,0 +1,124 @@
+"""Check that search budgets and cancel tokens bound latency on adversarial queries
+
+    python -m benchmarks.check_budget --rows 50000 --budget-ms 100
+
+Runs queries built to be slow (many tokens, each with synonyms, over the
+LIKE and FTS paths) with and without a budget, cancels a running search
+from another thread, and supersedes a session's search with a new one.
+Exits non-zero if a budgeted search overruns its budget by more than
+--slack-ms, a cancelled or superseded search takes longer than that to
+return, a search cut short isn't flagged truncated, or a budget with time
+to spare changes any result.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from orchid_search import OrchidSearchDB
+from orchid_search.budget import CancelToken
+
+from .synthetic import populate
+
+# Every word has synonyms or matches widely, so each costs many LIKEs or postings
+ADVERSARIAL = [
+    ("like", "pink purple white yellow red green orange fragrant showy large small tropical "
+             "warm cool epiphytic terrestrial orchids forest mountain"),
+    ("like", " ".join(["fragrant spotted striped large flowering sweet scented"] * 4)),
+    ("fts", "pink OR purple OR white OR yellow orchid flower fragrant showy tropical warm epiphytic"),
+    ("fuzzy", "pnik purpel whte yelow fragant shwy tropicl epiphytc"),
+]
+ORDINARY = [("fts", "pink fragrant orchids from Southeast Asia"), ("like", "white cool easy"), ("fts", "phalaenopsis")]
+
+
+def elapsed_ms(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def search(db, mode, query, **kwargs):
+    return db.intelligent_search(query, 20, mode=mode, columns=["id"], **kwargs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--budget-ms", type=float, default=100)
+    parser.add_argument("--slack-ms", type=float, default=50)
+    args = parser.parse_args()
+    budget, slack = args.budget_ms, args.slack_ms
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        db = OrchidSearchDB(os.path.join(tmp, "orchids.db"), cache_size=0, nlp_mode="fast")
+        db.connect()
+        db.create_tables()
+        populate(db, args.rows)
+        db.did_you_mean("warm")  # load the vocabulary outside any budget
+
+        print(f"\n{args.rows} rows, budget {budget:.0f}ms, slack {slack:.0f}ms")
+        print(f"  {'mode':<6} {'query':<44} {'unbudgeted':>11} {'budgeted':>9} {'rows':>5} {'truncated':>9} {'ok':>4}")
+        for mode, query in ADVERSARIAL + ORDINARY:
+            full, full_ms = elapsed_ms(lambda: search(db, mode, query))
+            results, ms = elapsed_ms(lambda: search(db, mode, query, budget_ms=budget))
+            ok = ms <= budget + slack and (results.truncated or results.ids == full.ids)
+            # Only a search that needed the time may come back cut short
+            ok = ok and (results.truncated or full_ms < budget + slack)
+            failures += not ok
+            print(f"  {mode:<6} {query[:44]:<44} {full_ms:>9.1f}ms {ms:>7.1f}ms {len(results):>5} "
+                  f"{str(results.truncated):>9} {'ok' if ok else 'FAIL':>4}")
+
+            generous = search(db, mode, query, budget_ms=60000)
+            if generous.truncated or generous.ids != full.ids:
+                failures += 1
+                print(f"  FAIL a budget with time to spare changed {query!r}")
+
+        # Cancel from another thread, as a new request would
+        mode, query = ADVERSARIAL[0]
+        token = CancelToken()
+        outcome = {}
+
+        def cancelled_search():
+            outcome['results'] = search(db, mode, query, cancel=token)
+            outcome['returned'] = time.perf_counter()
+        worker = threading.Thread(target=cancelled_search)
+        worker.start()
+        time.sleep(budget / 1000)
+        cancelled_at = time.perf_counter()
+        token.cancel()
+        worker.join()
+        lag = (outcome['returned'] - cancelled_at) * 1000
+        ok = lag <= slack and outcome['results'].truncated
+        failures += not ok
+        print(f"  cancel: returned {lag:.1f}ms after cancel(), truncated={outcome['results'].truncated} "
+              f"{'ok' if ok else 'FAIL'}")
+
+        # A session's second search cancels its first
+        first = {}
+
+        def superseded_search():
+            with db.sessions.query("session-1") as cancel:
+                first['results'] = search(db, mode, query, cancel=cancel)
+            first['returned'] = time.perf_counter()
+        worker = threading.Thread(target=superseded_search)
+        worker.start()
+        time.sleep(budget / 1000)
+        superseded_at = time.perf_counter()
+        with db.sessions.query("session-1") as cancel:
+            second, second_ms = elapsed_ms(lambda: search(db, "fts", "phalaenopsis", cancel=cancel))
+        worker.join()
+        lag = (first['returned'] - superseded_at) * 1000
+        ok = lag <= slack + second_ms and first['results'].truncated and not second.truncated
+        ok = ok and len(db.sessions) == 0
+        failures += not ok
+        print(f"  supersede: first returned {lag:.1f}ms after the second started, truncated="
+              f"{first['results'].truncated}; second ran {second_ms:.1f}ms {'ok' if ok else 'FAIL'}")
+        db.close()
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Check intelligent_search(mode="like") at 1, 10 and 50-token queries
+
+    python -m benchmarks.check_like_query --rows 20000
+
+Every query must compile to the same SQL text with three parameters, and
+its ranking must match a plain-Python scoring of every token over every
+row from the regions the query names. Exits non-zero on any mismatch; prints the statement time per size.
+"""
+import argparse
+import json
+import re
+import sys
+import time
+
+from orchid_search import OrchidSearchDB
+from orchid_search.db import LIKE_SCORE_COLUMNS, LIKE_SEARCH_COLUMNS
+
+from .synthetic import COLORS, FEATURES, REGIONS, SEASONS, populate
+
+TOKEN_COUNTS = (1, 10, 50)
+LIMIT = 50
+
+
+def query_words():
+    words = [w.lower() for value in COLORS + REGIONS + SEASONS + FEATURES for w in value.split()]
+    return list(dict.fromkeys(w for w in words if len(w) > 2))
+
+
+def expected_ranking(rows, analysis, regions, limit):
+    """(id, relevance_score) of the top rows, scored the way the SQL documents it"""
+    regions = {r.lower() for r in regions}
+    scored = []
+    for row in rows:
+        if analysis.regions and not regions & {r.strip().lower() for r in re.split(r"[,;/]", row['Native_Regions'] or "")}:
+            continue
+        haystack = " | ".join(row[c] or "" for c in LIKE_SEARCH_COLUMNS).lower()
+        total = 0
+        for token in dict.fromkeys(analysis.text_tokens):
+            best = 0
+            for term in analysis.expanded_terms(token):
+                term = term.lower()
+                if term in haystack:
+                    best = max(best, next((s for c, s in LIKE_SCORE_COLUMNS.items()
+                                           if term in (row[c] or "").lower()), 1))
+            total += best
+        if total:
+            scored.append((-total, row['id']))
+    scored.sort()
+    return [(row_id, -score) for score, row_id in scored[:limit]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000)
+    args = parser.parse_args()
+
+    db = OrchidSearchDB(":memory:", cache_size=0, nlp_mode="fast")
+    db.connect()
+    db.create_tables()
+    populate(db, args.rows)
+    rows = db._fetchall(f"SELECT id, {', '.join(LIKE_SEARCH_COLUMNS)} FROM orchids")
+    words = query_words()
+
+    failures = 0
+    statements = set()
+    for count in TOKEN_COUNTS:
+        # Past the known words, numbered variants stand in for words that match nothing
+        tokens = [words[i] if i < len(words) else f"{words[i % len(words)]}{i}" for i in range(count)]
+        analysis = db.analyze_query(" ".join(tokens))
+        sql, params = db._like_intelligent_query(analysis, LIMIT, "o.id")
+        statements.add(sql)
+
+        start = time.perf_counter()
+        got = [(row['id'], row['relevance_score']) for row in db._fetchall(sql, params)]
+        ms = (time.perf_counter() - start) * 1000
+
+        regions = db.resolve_regions(list(analysis.regions.values())) if analysis.regions else []
+        ok = len(params) == 3 and got == expected_ranking(rows, analysis, regions, LIMIT)
+        failures += not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {count:>3} tokens  {len(json.loads(params[0])):>3} terms  "
+              f"{len(analysis.regions):>2} regions  {len(params)} params  {len(got):>3} rows  {ms:8.1f} ms")
+
+    ok = len(statements) == 1
+    failures += not ok
+    print(f"{'ok  ' if ok else 'FAIL'} one SQL text for every query ({len(statements)} distinct)")
+
+    db.close()
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Check with EXPLAIN QUERY PLAN that range, infix and region filters and Browse seeks use their indexes
+
+    python -m benchmarks.check_query_plans
+
+Exits non-zero if any filter falls back to a full table scan, a text search
+skips the trigram index or any Browse page needs a sort.
+"""
+import sys
+
+from orchid_search import OrchidSearchDB
+from orchid_search.db import RANGE_FILTERS, RANGE_INDEXES
+from orchid_search.paging import SORT_INDEXES, seek_steps
+from benchmarks.synthetic import populate
+
+SAMPLE_VALUES = {
+    'temp': (12, 28),
+    'humidity': (50, 80),
+    'light': (1000, 2500),
+    'size': (3, 10),
+    'elevation': (200, 1800),
+}
+
+
+def main():
+    db = OrchidSearchDB(":memory:", nlp_mode="fast")
+    db.connect()
+    db.create_tables()
+    populate(db, 20000)
+
+    cases = []
+    for name in RANGE_FILTERS:
+        low, high = SAMPLE_VALUES[name]
+        index, max_index = RANGE_INDEXES[name], f"{RANGE_INDEXES[name]}_max"
+        # A Browse sort index leading on the min column is an equally good range scan
+        min_indexes = (index,) + tuple(i for c, i in SORT_INDEXES.items() if c == RANGE_FILTERS[name][0])
+        cases += [
+            (f"min_{name}", {f"min_{name}": low}, min_indexes),
+            (f"max_{name}", {f"max_{name}": high}, (max_index,)),
+            # Either index is a range scan; the planner picks the more selective one
+            (f"min_{name}+max_{name}", {f"min_{name}": low, f"max_{name}": high}, min_indexes + (max_index,)),
+        ]
+
+    failures = 0
+    for label, filters, expected_indexes in cases:
+        for builder in (db._semantic_query, db._combined_query):
+            sql, params = builder(limit=50, **filters)
+            plan = " | ".join(db.explain_query_plan(sql, params))
+            ok = any(f"INDEX {index} " in plan + " " for index in expected_indexes)
+            failures += not ok
+            print(f"{'ok  ' if ok else 'FAIL'} {builder.__name__:<16} {label:<28} {plan}")
+
+    # Every keyset step must walk the column's sort index without a temp B-tree
+    for column, index in SORT_INDEXES.items():
+        sample = db._fetchone(f"SELECT {column} AS value, id FROM orchids WHERE {column} IS NOT NULL LIMIT 1")
+        for descending in (False, True):
+            for key in (None, (sample['value'], sample['id']), (None, sample['id'])):
+                for where, params, order_by in seek_steps(column, descending, key):
+                    sql = f"SELECT * FROM orchids WHERE {where} ORDER BY {order_by} LIMIT ?"
+                    plan = " | ".join(db.explain_query_plan(sql, (*params, 25)))
+                    ok = f"INDEX {index} " in plan + " " and "TEMP B-TREE" not in plan
+                    failures += not ok
+                    print(f"{'ok  ' if ok else 'FAIL'} {'browse':<16} {where + ' ' + order_by:<56} {plan}")
+
+    # Infix filters on a facet column seek its index; text searches drive from the trigram index
+    infix_cases = [
+        ("genus", db._semantic_query(limit=50, genus="dendro"), "INDEX idx_genus "),
+        ("genus", db._combined_query(limit=50, genus="dendro"), "INDEX idx_genus "),
+        ("text", db._combined_query("showy", limit=50), "orchids_trigram VIRTUAL TABLE"),
+        ("text+genus", db._combined_query("showy", limit=50, genus="dendro"), "orchids_trigram VIRTUAL TABLE"),
+    ]
+    for label, (sql, params), expected in infix_cases:
+        plan = " | ".join(db.explain_query_plan(sql, params))
+        ok = expected in plan + " "
+        failures += not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {'infix':<16} {label:<28} {plan}")
+
+    # Region filters and regions named in smart search resolve through the
+    # closure table's key and the junction's value index, never a scan
+    region_cases = [
+        ("filter", db._semantic_query(limit=50, native_region="Asia")),
+        ("filter alias", db._combined_query(limit=50, native_region="SE Asia")),
+        ("smart", db._intelligent_query(db.analyze_query("pink orchids from Asia"), 50)),
+        ("smart region only", db._intelligent_query(db.analyze_query("Asia"), 50)),
+    ]
+    for label, (sql, params) in region_cases:
+        plan = " | ".join(db.explain_query_plan(sql, params))
+        ok = ("SEARCH c USING PRIMARY KEY (ancestor_id=?)" in plan
+              and "INDEX idx_orchid_region_value " in plan and "SCAN orchids " not in plan + " ")
+        failures += not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {'region':<16} {label:<28} {plan}")
+
+    db.close()
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""Reproducible benchmark suite over synthetic catalogs, emitted as JSON
+
+    python -m benchmarks.suite --rows 10000 100000 1000000 --out bench.json
+    python -m benchmarks.suite --rows 10000 --out new.json --compare bench.json
+
+For every size it times the CSV load, an FTS rebuild, each search method
+over a fixed query set, Browse pagination and the statistics calls, with
+the query cache off. --compare prints each metric against an earlier run
+and exits non-zero when one got slower by more than --fail-over.
+"""
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+from orchid_search import OrchidSearchDB
+from orchid_search.results import SUMMARY_COLUMNS
+
+from .synthetic import write_csv
+
+SMART_QUERIES = [
+    "pink fragrant orchids from Southeast Asia",
+    "white orchids cool temperature easy",
+    "large tropical flowers warm climate",
+    "phalaenopsis",
+    "purple cloud forest epiphytic",
+]
+FULLTEXT_QUERIES = ["pink", "pink AND fragrant", "white OR yellow", '"moth orchid"', "dendrobium"]
+SEMANTIC_FILTERS = [
+    dict(genus="Dendrobium"),
+    dict(flower_color="pink", min_temp=15),
+    dict(native_region="Brazil", difficulty="Easy"),
+    dict(fragrance="fragrant", min_humidity=60, max_elevation=1000),
+    dict(min_size=5, max_temp=28),
+]
+COMBINED_QUERIES = [
+    dict(text_query="fragrant", genus="Cattleya"),
+    dict(text_query="showy", min_temp=12),
+    dict(text_query="rainforest", native_region="Indonesia"),
+    dict(text_query="orchid", flower_color="white", max_temp=25),
+    dict(text_query="night", difficulty="Easy"),
+]
+BROWSE_PAGES = 50
+
+
+def timings_ms(fn: Callable[[], object], repeat: int) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        'median_ms': round(statistics.median(ordered), 3),
+        'p95_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+        'samples': len(ordered),
+    }
+
+
+def over_queries(queries, run: Callable, repeat: int) -> Dict[str, float]:
+    """Every query timed `repeat` times, summarized together"""
+    samples = []
+    for query in queries:
+        run(query)  # warm the page cache and statement cache
+        samples += timings_ms(lambda: run(query), repeat)
+    return summarize(samples)
+
+
+def browse_walk(db: OrchidSearchDB, sort_col: str, pages: int) -> None:
+    cursor = None
+    for _ in range(pages):
+        page = db.browse_page(sort_col, limit=25, cursor=cursor)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+
+def bench_size(rows: int, repeat: int, workdir: str) -> Dict:
+    csv_path = os.path.join(workdir, f"orchids_{rows}.csv")
+    start = time.perf_counter()
+    write_csv(csv_path, rows)
+    generate_s = time.perf_counter() - start
+
+    db = OrchidSearchDB(os.path.join(workdir, f"orchids_{rows}.db"), cache_size=0, nlp_mode="fast")
+    db.connect()
+    db.create_tables()
+    start = time.perf_counter()
+    db.load_data(csv_path)
+    load_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    db.maintain_fts("rebuild")
+    fts_rebuild_s = time.perf_counter() - start
+
+    metrics = {
+        'intelligent_search_fts': over_queries(
+            SMART_QUERIES, lambda q: db.intelligent_search(q, 50, columns=SUMMARY_COLUMNS), repeat),
+        'intelligent_search_like': over_queries(
+            SMART_QUERIES, lambda q: db.intelligent_search(q, 50, mode="like", columns=SUMMARY_COLUMNS), repeat),
+        'fulltext_search': over_queries(
+            FULLTEXT_QUERIES, lambda q: db.fulltext_search(q, 50, columns=SUMMARY_COLUMNS), repeat),
+        'semantic_search': over_queries(
+            SEMANTIC_FILTERS, lambda f: db.semantic_search(50, SUMMARY_COLUMNS, **f), repeat),
+        'combined_search': over_queries(
+            COMBINED_QUERIES, lambda f: db.combined_search(limit=50, columns=SUMMARY_COLUMNS, **f), repeat),
+        'browse_first_page': over_queries(
+            ["Scientific_Name", "Genus", "Temperature_Min_C"], lambda c: db.browse_page(c, limit=25), repeat),
+        f'browse_walk_{BROWSE_PAGES}_pages': over_queries(
+            ["Scientific_Name", "Native_Regions"], lambda c: browse_walk(db, c, BROWSE_PAGES), max(1, repeat // 2)),
+        'get_statistics': over_queries([None], lambda _: db.get_statistics(), repeat),
+        'get_facets': over_queries([None], lambda _: db.get_facets(), repeat),
+        'get_facets_filtered': over_queries(
+            SEMANTIC_FILTERS[:2], lambda f: db.get_facets(**f), repeat),
+    }
+    db.close()
+    os.remove(csv_path)
+
+    return {
+        'rows': rows,
+        'generate_s': round(generate_s, 3),
+        'load_s': round(load_s, 3),
+        'load_rows_per_s': round(rows / load_s),
+        'fts_rebuild_s': round(fts_rebuild_s, 3),
+        'metrics': metrics,
+    }
+
+
+def environment() -> Dict[str, str]:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = "unknown"
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def flatten(report: Dict) -> Dict[str, float]:
+    """size/metric -> seconds or median milliseconds, for comparing two reports"""
+    flat = {}
+    for size in report['sizes']:
+        rows = size['rows']
+        for key in ('load_s', 'fts_rebuild_s'):
+            flat[f"{rows}/{key}"] = size[key]
+        for name, metric in size['metrics'].items():
+            flat[f"{rows}/{name}"] = metric['median_ms']
+    return flat
+
+
+def compare(report: Dict, baseline: Dict, fail_over: float) -> int:
+    """Print new/old ratios and return how many metrics regressed past fail_over"""
+    new, old = flatten(report), flatten(baseline)
+    print(f"\nagainst {baseline['environment'].get('commit', '?')}:")
+    regressions = 0
+    for key in new:
+        if key not in old or not old[key]:
+            continue
+        ratio = new[key] / old[key]
+        flag = ""
+        if ratio > fail_over:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"  {key:<44} {old[key]:>10.3f} -> {new[key]:>10.3f}  {ratio:>5.2f}x{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--out", help="write the JSON report here instead of stdout")
+    parser.add_argument("--compare", help="an earlier JSON report to compare against")
+    parser.add_argument("--fail-over", type=float, default=1.25,
+                        help="new/old ratio above which a metric counts as a regression")
+    args = parser.parse_args()
+
+    sizes = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for rows in args.rows:
+            print(f"benchmarking {rows} rows", file=sys.stderr)
+            sizes.append(bench_size(rows, args.repeat, workdir))
+    report = {'environment': environment(), 'repeat': args.repeat, 'sizes': sizes}
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"wrote {args.out}", file=sys.stderr)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.fail_over):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""Synthetic orchid rows for benchmarking at sizes beyond the published CSV
+
+Rows fill every column of the 70-column ``orchids`` schema. Values follow
+the shape of the real catalog rather than a uniform spread:
+
+- a few large genera hold most species (Zipf-like genus weights)
+- each genus has a home range, growth habit and temperature band, and
+  the regions, elevation, humidity and care fields follow from those
+- colors and regions are drawn from, or next to, the terms of the
+  default synonym tables, so synonym expansion has something to match
+- quantitative fields are free-text ranges such as "4-7" or "1,500-2,500",
+  parsed into the numeric min/max columns by the loader
+
+Write CSVs for the standard sizes with
+
+    python -m benchmarks.synthetic --rows 10000 100000 1000000 --out data/
+"""
+import argparse
+import csv
+import itertools
+import os
+import random
+import tempfile
+from typing import Dict, Iterator, List, Sequence
+
+from orchid_search import OrchidSearchDB
+
+# genus: (home regions, growth habit, temperature preference, subfamily)
+GENUS_PROFILES = {
+    'Dendrobium': ('asia', 'Epiphytic', 'Intermediate', 'Epidendroideae'),
+    'Bulbophyllum': ('asia', 'Epiphytic', 'Warm', 'Epidendroideae'),
+    'Epidendrum': ('americas', 'Epiphytic', 'Intermediate', 'Epidendroideae'),
+    'Masdevallia': ('andes', 'Epiphytic', 'Cool', 'Epidendroideae'),
+    'Oncidium': ('americas', 'Epiphytic', 'Intermediate', 'Epidendroideae'),
+    'Maxillaria': ('americas', 'Epiphytic', 'Intermediate', 'Epidendroideae'),
+    'Phalaenopsis': ('asia', 'Epiphytic', 'Warm', 'Epidendroideae'),
+    'Cattleya': ('americas', 'Epiphytic', 'Intermediate', 'Epidendroideae'),
+    'Paphiopedilum': ('asia', 'Terrestrial', 'Intermediate', 'Cypripedioideae'),
+    'Cymbidium': ('asia', 'Terrestrial', 'Cool', 'Epidendroideae'),
+    'Vanda': ('asia', 'Epiphytic', 'Warm', 'Epidendroideae'),
+    'Coelogyne': ('asia', 'Epiphytic', 'Cool', 'Epidendroideae'),
+    'Dracula': ('andes', 'Epiphytic', 'Cool', 'Epidendroideae'),
+    'Stanhopea': ('americas', 'Epiphytic', 'Intermediate', 'Epidendroideae'),
+    'Laelia': ('americas', 'Lithophytic', 'Intermediate', 'Epidendroideae'),
+    'Angraecum': ('africa', 'Epiphytic', 'Warm', 'Epidendroideae'),
+    'Lycaste': ('americas', 'Terrestrial', 'Cool', 'Epidendroideae'),
+    'Miltonia': ('americas', 'Epiphytic', 'Intermediate', 'Epidendroideae'),
+    'Zygopetalum': ('americas', 'Terrestrial', 'Intermediate', 'Epidendroideae'),
+    'Aerides': ('asia', 'Epiphytic', 'Warm', 'Epidendroideae'),
+}
+GENERA = list(GENUS_PROFILES)
+GENUS_WEIGHTS = [1 / (rank + 1) ** 0.9 for rank in range(len(GENERA))]
+
+SYLLABLES = ['am', 'ab', 'il', 'is', 'or', 'an', 'schil', 'ler', 'mos',
+             'si', 'tri', 'ae', 'ma', 'ud', 'pur', 'pu', 'ra', 'ta', 'ver', 'na']
+
+# Base colors are common; their synonyms ("Rose", "Ivory", "Mauve") less so
+COLORS = ['Pink', 'White', 'Yellow', 'Purple', 'Red', 'Orange', 'Green',
+          'Cream', 'Magenta', 'Lavender', 'Golden', 'Crimson', 'Coral', 'Violet']
+COLOR_VARIANTS = ['Rose', 'Fuchsia', 'Ivory', 'Lemon', 'Mauve', 'Scarlet', 'Burgundy',
+                  'Peach', 'Apricot', 'Lime', 'Chartreuse', 'Brown', 'Spotted', 'Striped']
+COLOR_POOL = COLORS + COLOR_VARIANTS
+COLOR_WEIGHTS = [6.0] * len(COLORS) + [1.0] * len(COLOR_VARIANTS)
+
+REGIONS = ['Philippines', 'Indonesia', 'Thailand', 'Vietnam', 'Malaysia',
+           'Brazil', 'Colombia', 'Ecuador', 'Peru', 'Mexico', 'Costa Rica',
+           'Panama', 'China', 'Japan', 'India', 'Taiwan', 'Madagascar']
+HOME_RANGES = {
+    'asia': ['Philippines', 'Indonesia', 'Thailand', 'Vietnam', 'Malaysia', 'China', 'India',
+             'Taiwan', 'Japan', 'Borneo', 'Sumatra', 'Myanmar', 'Laos', 'Papua New Guinea', 'Himalayas'],
+    'americas': ['Brazil', 'Colombia', 'Ecuador', 'Peru', 'Mexico', 'Costa Rica', 'Panama',
+                 'Venezuela', 'Guatemala', 'Bolivia', 'Honduras'],
+    'andes': ['Colombia', 'Ecuador', 'Peru', 'Bolivia', 'Venezuela'],
+    'africa': ['Madagascar', 'Kenya', 'Tanzania', 'Comoros', 'Reunion'],
+}
+
+HABITATS = {
+    'Warm': ['Lowland rainforest', 'Mangrove edges', 'Riverine forest'],
+    'Intermediate': ['Montane forest', 'Seasonally dry forest', 'Rocky outcrops'],
+    'Cool': ['Cloud forest', 'Montane forest', 'Grassland'],
+}
+CLIMATES = {'Warm': 'Tropical', 'Intermediate': 'Subtropical', 'Cool': 'Temperate montane'}
+TEMPERATURE_BANDS = {'Warm': (16, 22), 'Intermediate': (12, 18), 'Cool': (6, 13)}
+ELEVATION_BANDS = {'Warm': (0, 900), 'Intermediate': (500, 1800), 'Cool': (1400, 3200)}
+
+FRAGRANCE = ['Fragrant', 'Highly fragrant', 'Slightly fragrant', 'None']
+FRAGRANCE_WEIGHTS = [3, 1, 2, 4]
+FRAGRANCE_NOTES = ['Sweet', 'Spicy', 'Citrus', 'Vanilla', 'Honey', 'Cinnamon', 'Musky']
+SEASONS = ['Spring', 'Summer', 'Autumn', 'Winter', 'Year-round']
+TEMPERATURE = ['Cool', 'Intermediate', 'Warm']
+DIFFICULTY = ['Easy', 'Easy to moderate', 'Moderate', 'Difficult']
+DIFFICULTY_WEIGHTS = {'Warm': [3, 3, 2, 1], 'Intermediate': [2, 3, 3, 1], 'Cool': [1, 2, 3, 3]}
+HABITS = ['Epiphytic', 'Terrestrial', 'Lithophytic']
+SHAPES = ['Oval', 'Lanceolate', 'Rounded', 'Spatulate']
+LIP_SHAPES = ['Pouch', 'Trilobed', 'Fringed', 'Tubular', 'Flat']
+FEATURES = ['Long-lasting blooms', 'Night fragrance', 'Miniature growth',
+            'Showy lip', 'Tolerates low light', 'Compact spikes']
+NOTES = ['Keep evenly moist', 'Bright indirect light', 'Allow to dry between waterings',
+         'Needs a cool winter rest', 'Mount on cork or tree fern', 'Repot after flowering']
+LIGHT_DESCRIPTIONS = ['Low light', 'Low to medium', 'Medium', 'Bright indirect', 'High light']
+CONSERVATION = ['Least Concern', 'Near Threatened', 'Vulnerable', 'Endangered', 'Critically Endangered']
+CONSERVATION_WEIGHTS = [6, 2, 2, 1, 0.3]
+AUTHORS = ['Lindl.', 'Rchb.f.', 'Blume', 'Schltr.', 'Ames', 'Sw.', 'Kraenzl.', 'Hook.f.']
+LEVELS = ['Low', 'Medium', 'High']
+
+
+def _epithet(rng: random.Random) -> str:
+    return ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3)))
+
+
+def _range(rng: random.Random, low: int, high: int) -> str:
+    a = rng.randint(low, high)
+    return f"{a}-{a + rng.randint(1, max(1, (high - low) // 3))}"
+
+
+def _thousands(value: int) -> str:
+    return f"{value:,}"
+
+
+def _pick(rng: random.Random, values: Sequence[str], cum_weights: Sequence[float]) -> str:
+    return rng.choices(values, cum_weights=cum_weights)[0]
+
+
+def _cumulative(weights: Sequence[float]) -> List[float]:
+    return list(itertools.accumulate(weights))
+
+
+_GENUS_CUM = _cumulative(GENUS_WEIGHTS)
+_COLOR_CUM = _cumulative(COLOR_WEIGHTS)
+_FRAGRANCE_CUM = _cumulative(FRAGRANCE_WEIGHTS)
+_CONSERVATION_CUM = _cumulative(CONSERVATION_WEIGHTS)
+_DIFFICULTY_CUM = {band: _cumulative(w) for band, w in DIFFICULTY_WEIGHTS.items()}
+
+
+def _regions(rng: random.Random, home: str) -> List[str]:
+    """One to three regions, nearly always from the genus's home range"""
+    pool = HOME_RANGES[home]
+    regions = rng.sample(pool, min(len(pool), rng.choice((1, 1, 2, 2, 3))))
+    if rng.random() < 0.05:
+        stray = rng.choice(REGIONS)
+        if stray not in regions:
+            regions.append(stray)
+    return regions
+
+
+def generate_rows(n: int, seed: int = 42) -> Iterator[Dict]:
+    """Yield ``n`` synthetic rows keyed by CSV column name, in the published dataset's layout"""
+    rng = random.Random(seed)
+    for i in range(n):
+        genus = _pick(rng, GENERA, _GENUS_CUM)
+        home, typical_habit, band, subfamily = GENUS_PROFILES[genus]
+        habit = typical_habit if rng.random() < 0.85 else rng.choice(HABITS)
+        preference = band if rng.random() < 0.8 else rng.choice(TEMPERATURE)
+        epithet = _epithet(rng)
+        colors = list(dict.fromkeys(_pick(rng, COLOR_POOL, _COLOR_CUM) for _ in range(rng.choice((1, 1, 2, 2, 3)))))
+        t_low, t_high = TEMPERATURE_BANDS[preference]
+        t_min = rng.randint(t_low, t_high)
+        e_low, e_high = ELEVATION_BANDS[preference]
+        e_min = rng.randint(e_low, e_high)
+        h_min = rng.randint(60, 75) if preference == 'Warm' else rng.randint(40, 70)
+        light_min = rng.randint(800, 4000) if habit != 'Terrestrial' else rng.randint(600, 1800)
+        size_min = max(1, int(rng.lognormvariate(1.5, 0.6)))
+        fragrance = _pick(rng, FRAGRANCE, _FRAGRANCE_CUM)
+        conservation = _pick(rng, CONSERVATION, _CONSERVATION_CUM)
+        yield {
+            'Species_Key': 1000000 + i,
+            'Scientific_Name': f"{genus} {epithet}",
+            'Canonical_Name': f"{genus} {epithet}",
+            'Genus': genus,
+            'Species_Epithet': epithet,
+            'Author': rng.choice(AUTHORS),
+            'Taxonomic_Status': 'ACCEPTED' if rng.random() < 0.9 else 'SYNONYM',
+            'Kingdom': 'Plantae',
+            'Family': 'Orchidaceae',
+            'Subfamily': subfamily,
+            'Order': 'Asparagales',
+            'Growth_Habit': habit,
+            'Flower_Size_cm': f"{size_min}-{size_min + rng.randint(1, 4)}",
+            'Flower_Color': ', '.join(colors),
+            'Petal_Shape': rng.choice(SHAPES),
+            'Petal_Count': '3',
+            'Lip_Shape': rng.choice(LIP_SHAPES),
+            'Lip_Color': _pick(rng, COLOR_POOL, _COLOR_CUM),
+            'Column_Structure': rng.choice(['Short', 'Elongated', 'Winged']),
+            'Fragrance': fragrance,
+            'Fragrance_Description': rng.choice(FRAGRANCE_NOTES) if fragrance != 'None' else '',
+            'Blooming_Season': rng.choice(SEASONS),
+            'Bloom_Duration_Weeks': _range(rng, 2, 12),
+            'Flowers_Per_Spike': _range(rng, 1, 20),
+            'Spike_Length_cm': _range(rng, 5, 80),
+            'Light_Requirement_FC': f"{_thousands(light_min)}-{_thousands(light_min + rng.randint(300, 1500))}",
+            'Light_Description': LIGHT_DESCRIPTIONS[min(4, light_min // 900)],
+            'Temperature_Min_C': t_min,
+            'Temperature_Max_C': t_min + rng.randint(6, 14),
+            'Temperature_Preference': preference,
+            'Humidity_Min_Percent': h_min,
+            'Humidity_Max_Percent': min(100, h_min + rng.randint(10, 30)),
+            'Watering_Frequency': rng.choice(['Weekly', 'Twice weekly', 'Keep moist', 'Dry rest in winter']),
+            'Fertilizer_Requirement': rng.choice(['Weak weekly', 'Monthly', 'Balanced biweekly']),
+            'Potting_Media': 'Mounted' if habit == 'Epiphytic' and rng.random() < 0.3 else
+                             rng.choice(['Bark mix', 'Sphagnum moss', 'Terrestrial mix', 'Coconut husk']),
+            'Pseudobulb': 'Present' if genus not in ('Phalaenopsis', 'Paphiopedilum', 'Vanda', 'Angraecum', 'Aerides') else 'Absent',
+            'Pseudobulb_Shape': rng.choice(['Ovoid', 'Cane-like', 'Conical', 'Flattened', '']),
+            'Stem_Type': 'Monopodial' if genus in ('Phalaenopsis', 'Vanda', 'Angraecum', 'Aerides') else 'Sympodial',
+            'Stem_Length_cm': _range(rng, 2, 60),
+            'Leaf_Type': rng.choice(['Fleshy', 'Plicate', 'Terete', 'Strap-shaped']),
+            'Leaf_Length_cm': _range(rng, 3, 40),
+            'Leaf_Color': rng.choice(['Green', 'Dark green', 'Mottled', 'Green with purple underside']),
+            'Leaf_Arrangement': rng.choice(['Alternate', 'Distichous', 'Basal rosette']),
+            'Root_Type': 'Aerial' if habit == 'Epiphytic' else 'Fibrous',
+            'Root_Color': rng.choice(['Silver', 'Green', 'White', 'Brown']),
+            'Pollination_Type': rng.choice(['Insect', 'Bee', 'Moth', 'Fly', 'Bird']),
+            'Pollination_Mechanism': rng.choice(['Deceptive', 'Nectar reward', 'Fragrance reward', 'Trap']),
+            'Seed_Type': 'Dust-like',
+            'Propagation_Method': rng.choice(['Division', 'Keiki', 'Seed (flask)', 'Meristem']),
+            'Native_Habitat': rng.choice(HABITATS[preference]),
+            'Native_Regions': ', '.join(_regions(rng, home)),
+            'Elevation_Min_m': e_min,
+            'Elevation_Max_m': e_min + rng.randint(100, 1500),
+            'Climate_Type': CLIMATES[preference],
+            'Rainfall_Requirement': rng.choice(LEVELS),
+            'Air_Movement': rng.choice(['Moderate', 'Good', 'Strong']),
+            'Mycorrhizal_Association': rng.choice(['Tulasnella', 'Ceratobasidium', 'Sebacina', 'Unknown']),
+            'Conservation_Status': conservation,
+            'Threatened_Level': {'Least Concern': 'Low', 'Near Threatened': 'Medium'}.get(conservation, 'High'),
+            'Horticultural_Difficulty': _pick(rng, DIFFICULTY, _DIFFICULTY_CUM[preference]),
+            'Horticultural_Notes': '. '.join(rng.sample(NOTES, 2)),
+            'Commercial_Importance': rng.choice(LEVELS),
+            'Breeding_Potential': rng.choice(LEVELS),
+            'Disease_Susceptibility': rng.choice(LEVELS),
+            'Pest_Susceptibility': rng.choice(LEVELS),
+            'Special_Features': rng.choice(FEATURES),
+            'Cultural_Significance': rng.choice(['', '', 'National flower', 'Used in perfumery', 'Traditional medicine']),
+            'Common_Names': f"{colors[0]} {genus.lower()} orchid",
+            'Etymology': f"Named for its {rng.choice(['color', 'shape', 'collector', 'locality'])}",
+        }
+
+
+def write_csv(path: str, n: int, seed: int = 42) -> int:
+    """Write ``n`` synthetic rows as a CSV in the published dataset's layout"""
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = None
+        for row in generate_rows(n, seed):
+            if writer is None:
+                writer = csv.DictWriter(f, fieldnames=list(row))
+                writer.writeheader()
+            writer.writerow(row)
+    return n
+
+
+def populate(db: OrchidSearchDB, n: int, seed: int = 42, chunk_size: int = 10000) -> int:
+    """Fill a database with ``n`` synthetic rows through the regular CSV loader"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "synthetic.csv")
+        write_csv(path, n, seed)
+        return db.load_data(path, chunk_size=chunk_size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write synthetic orchid CSVs")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--out", default=".")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    os.makedirs(args.out, exist_ok=True)
+    for rows in args.rows:
+        path = os.path.join(args.out, f"orchids_synthetic_{rows}.csv")
+        write_csv(path, rows, args.seed)
+        print(f"Wrote {rows} rows to {path} ({os.path.getsize(path) / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
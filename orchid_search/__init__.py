@@ -0,0 +1,27 @@
+"""Orchid search engine: SQLite storage, FTS5 search and NLP query handling"""
+from .bitmap import BitmapIndex
+from .cache import QueryCache
+from .db import OrchidSearchDB
+from .gazetteer import Gazetteer
+from .nlp import QueryAnalysis, TextPreprocessor
+from .paging import Page
+from .pool import ConnectionPool
+from .results import ResultSet
+from .scoring import EnvironmentScorer
+from .similarity import SimilarityFeatures
+from .synonyms import SynonymIndex
+
+__all__ = [
+    "BitmapIndex",
+    "ConnectionPool",
+    "EnvironmentScorer",
+    "Gazetteer",
+    "OrchidSearchDB",
+    "Page",
+    "QueryAnalysis",
+    "QueryCache",
+    "ResultSet",
+    "SimilarityFeatures",
+    "SynonymIndex",
+    "TextPreprocessor",
+]
@@ -0,0 +1,107 @@
+import sqlite3
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple
+
+from .pool import ConnectionPool
+
+BATCH_MODES = ('fts', 'fuzzy', 'like', 'fulltext', 'semantic', 'combined')
+BATCH_EXECUTORS = ('thread', 'process')
+
+# (column names, row tuples) of one executed plan
+PlanResult = Tuple[List[str], List[tuple]]
+
+
+@dataclass(frozen=True)
+class SearchPlan:
+    """
+    One planned search: its SQL, parameters and the plan to run if SQLite rejects it
+
+    if_empty is the plan to run instead when this one returns no rows.
+    Plans carry no connection or engine state, so they can be deduplicated,
+    handed to worker threads or pickled to worker processes.
+    """
+    sql: str
+    params: Tuple
+    fallback: Optional["SearchPlan"] = None
+    if_empty: Optional["SearchPlan"] = None
+
+    @property
+    def key(self) -> Tuple[str, Tuple]:
+        return self.sql, self.params
+
+
+def execute_plan(conn: sqlite3.Connection, plan: SearchPlan) -> PlanResult:
+    """Run a plan on conn, falling back on OperationalError (e.g. bad MATCH syntax) or no rows with if_empty"""
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    try:
+        try:
+            cursor.execute(plan.sql, plan.params)
+        except sqlite3.OperationalError:
+            if plan.fallback is None:
+                raise
+            return execute_plan(conn, plan.fallback)
+        names, rows = [d[0] for d in cursor.description], cursor.fetchall()
+    finally:
+        cursor.close()
+    if not rows and plan.if_empty is not None:
+        return execute_plan(conn, plan.if_empty)
+    return names, rows
+
+
+# Read-only connection of a worker process, opened once by the initializer
+_WORKER_POOL: Optional[ConnectionPool] = None
+
+
+def _init_worker(db_path: str):
+    global _WORKER_POOL
+    _WORKER_POOL = ConnectionPool(db_path, size=1, read_only=True)
+
+
+def _worker_execute(plans: Sequence[SearchPlan]) -> List[PlanResult]:
+    with _WORKER_POOL.reader() as conn:
+        return [execute_plan(conn, plan) for plan in plans]
+
+
+def run_plans(plans: Sequence[SearchPlan], run: Callable[[Sequence[SearchPlan]], List[PlanResult]],
+              db_path: str, workers: int = 1, executor: str = "thread",
+              chunk_size: Optional[int] = None) -> Iterator[Tuple[int, PlanResult]]:
+    """
+    Yield (plan position, result) for every plan as chunks of them complete
+
+    run executes a chunk of plans in the calling process, on one checked-out
+    connection; it is what worker threads call. Worker processes open their
+    own read-only connection to db_path instead. With workers <= 1 the
+    chunks run one after another in the calling thread.
+    """
+    if executor not in BATCH_EXECUTORS:
+        raise ValueError(f"Unknown batch executor: {executor}")
+    if not plans:
+        return
+    chunk_size = chunk_size or max(1, min(64, len(plans) // (max(workers, 1) * 4)))
+    chunks = [range(start, min(start + chunk_size, len(plans))) for start in range(0, len(plans), chunk_size)]
+
+    if workers <= 1:
+        for chunk in chunks:
+            yield from zip(chunk, run([plans[i] for i in chunk]))
+        return
+
+    pool: Executor
+    if executor == "process":
+        pool = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(db_path,))
+        task = _worker_execute
+    else:
+        pool = ThreadPoolExecutor(workers)
+        task = run
+    with pool:
+        pending = {pool.submit(task, [plans[i] for i in chunk]): chunk for chunk in chunks}
+        try:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from zip(pending.pop(future), future.result())
+        finally:
+            # An abandoned stream shouldn't keep the pool busy with the rest
+            for future in pending:
+                future.cancel()
@@ -0,0 +1,229 @@
+import sqlite3
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+# Low-cardinality categorical columns answered by the bitmap index
+CATEGORY_COLUMNS = (
+    'Genus', 'Fragrance', 'Horticultural_Difficulty', 'Growth_Habit',
+    'Temperature_Preference', 'Conservation_Status', 'Pseudobulb',
+)
+
+# Set bits per byte, for NumPy versions without np.bitwise_count
+_POPCOUNT8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+# A parsed categories expression: ('in', column, values), ('not', child),
+# or ('and' | 'or', children)
+CategoryExpr = Tuple
+
+
+def parse_categories(expr) -> CategoryExpr:
+    """
+    Validate a categories filter and normalize it into a tree
+
+    A dict {column: value or [values]} matches rows whose column is any of
+    its values, for every column given. ('and', e1, e2, ...), ('or', ...)
+    and ('not', e) combine expressions, so ('and', {'Genus': ['Vanda',
+    'Aerides']}, ('not', {'Fragrance': 'None'})) is a Vanda or Aerides
+    that has some fragrance. Values match whole, with case.
+    """
+    if isinstance(expr, dict):
+        terms = []
+        for column, values in expr.items():
+            if column not in CATEGORY_COLUMNS:
+                raise ValueError(f"Not a category column: {column}")
+            values = (values,) if isinstance(values, str) else tuple(values)
+            terms.append(('in', column, tuple(str(v) for v in values)))
+        return terms[0] if len(terms) == 1 else ('and', tuple(terms))
+    if isinstance(expr, (tuple, list)) and expr and expr[0] in ('and', 'or', 'not'):
+        op, children = expr[0], [parse_categories(child) for child in expr[1:]]
+        if op == 'not':
+            if len(children) != 1:
+                raise ValueError("'not' takes exactly one expression")
+            return ('not', children[0])
+        if not children:
+            raise ValueError(f"'{op}' needs at least one expression")
+        return (op, tuple(children))
+    raise ValueError(f"Not a categories expression: {expr!r}")
+
+
+def categories_sql(tree: CategoryExpr) -> Tuple[str, List]:
+    """A WHERE predicate and its parameters for a parsed categories expression, never NULL"""
+    op = tree[0]
+    if op == 'in':
+        _, column, values = tree
+        if not values:
+            return "0", []
+        # IS NOT NULL keeps the predicate two-valued, so NOT includes NULL rows as the bitmaps do
+        return f"({column} IN ({', '.join('?' * len(values))}) AND {column} IS NOT NULL)", list(values)
+    if op == 'not':
+        sql, params = categories_sql(tree[1])
+        return f"NOT {sql}", params
+    parts = [categories_sql(child) for child in tree[1]]
+    joiner = " AND " if op == 'and' else " OR "
+    return "(" + joiner.join(sql for sql, _ in parts) + ")", [p for _, params in parts for p in params]
+
+
+def _word_counts(words: np.ndarray) -> np.ndarray:
+    """Set bits in each uint64 word"""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words)
+    return _POPCOUNT8[words.view(np.uint8)].reshape(-1, 8).sum(axis=1, dtype=np.uint8)
+
+
+def _popcount(words: np.ndarray) -> int:
+    return int(_word_counts(words).sum(dtype=np.int64))
+
+
+class BitmapIndex:
+    """
+    One bitset per (column, value) of the category columns, for filtering and facet counts in memory
+
+    Bit i stands for the orchid at position i of the id-sorted ids array.
+    A value's bitset is dense, packed into uint64 words, unless it holds
+    fewer than one row in 32; then the sorted int32 positions are smaller
+    and are kept instead. Filters evaluate to dense words with NumPy
+    bitwise operations; only ids come out, to be hydrated by the caller.
+    """
+
+    def __init__(self, ids: np.ndarray, bitsets: Dict[str, Dict[str, np.ndarray]]):
+        self.ids = np.ascontiguousarray(ids, dtype=np.int64)
+        self.bitsets = bitsets
+        self.n = len(self.ids)
+        self.n_words = (self.n + 63) // 64
+        # Clears the bits past the last row after a NOT
+        self._valid = self._dense(np.arange(self.n, dtype=np.int64))
+
+    @classmethod
+    def from_connection(cls, conn: sqlite3.Connection,
+                        columns: Sequence[str] = CATEGORY_COLUMNS) -> "BitmapIndex":
+        """Build every column's bitsets from one scan of orchids"""
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        try:
+            rows = cursor.execute(f"SELECT id, {', '.join(columns)} FROM orchids ORDER BY id").fetchall()
+        finally:
+            cursor.close()
+        n = len(rows)
+        ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=n)
+        index = cls(ids, {})
+        for i, column in enumerate(columns, start=1):
+            codes_of: Dict[str, int] = {}
+            codes = np.fromiter((-1 if r[i] is None else codes_of.setdefault(r[i], len(codes_of)) for r in rows),
+                                dtype=np.int32, count=n)
+            # Positions grouped by value, each group in row order
+            order = np.argsort(codes, kind='stable').astype(np.int32)
+            bounds = np.cumsum(np.bincount(codes + 1, minlength=len(codes_of) + 1))
+            index.bitsets[column] = {
+                str(value): index._compress(order[bounds[code]:bounds[code + 1]])
+                for value, code in codes_of.items()
+            }
+        return index
+
+    def __len__(self) -> int:
+        return self.n
+
+    def _dense(self, positions: np.ndarray) -> np.ndarray:
+        bits = np.zeros(self.n_words * 64, dtype=bool)
+        bits[positions] = True
+        return np.packbits(bits, bitorder='little').view(np.uint64)
+
+    def _compress(self, positions: np.ndarray) -> np.ndarray:
+        """The smaller representation of a value's rows: int32 positions or uint64 words"""
+        if len(positions) * 32 < self.n:
+            return np.ascontiguousarray(positions, dtype=np.int32)
+        return self._dense(positions)
+
+    def _member(self, words: np.ndarray, positions: np.ndarray) -> np.ndarray:
+        """Whether each position's bit is set in words"""
+        positions = positions.astype(np.int64)
+        return (words[positions >> 6] >> (positions & 63).astype(np.uint64)) & np.uint64(1)
+
+    def _count(self, words: np.ndarray, bitset: np.ndarray) -> int:
+        """Rows of a value's bitset that are also set in words"""
+        if bitset.dtype == np.uint64:
+            return _popcount(words & bitset)
+        return int(self._member(words, bitset).sum())
+
+    def evaluate(self, tree: CategoryExpr) -> np.ndarray:
+        """Dense words of the rows a parsed categories expression matches"""
+        op = tree[0]
+        if op == 'in':
+            _, column, values = tree
+            known = self.bitsets.get(column, {})
+            words = np.zeros(self.n_words, dtype=np.uint64)
+            sparse = []
+            for value in values:
+                bitset = known.get(value)
+                if bitset is None:
+                    continue
+                if bitset.dtype == np.uint64:
+                    words |= bitset
+                else:
+                    sparse.append(bitset)
+            if sparse:
+                # One scatter for all of the sparse values
+                words |= self._dense(np.concatenate(sparse))
+            return words
+        if op == 'not':
+            return ~self.evaluate(tree[1]) & self._valid
+        children = [self.evaluate(child) for child in tree[1]]
+        combine = np.bitwise_and if op == 'and' else np.bitwise_or
+        return combine.reduce(children)
+
+    def everything(self) -> np.ndarray:
+        return self._valid.copy()
+
+    def count(self, words: np.ndarray) -> int:
+        return _popcount(words)
+
+    def select(self, words: np.ndarray, limit: int = -1, after_id: int = 0) -> np.ndarray:
+        """Ids of the rows set in words, in id order, at most limit (-1 for all) of them after after_id"""
+        if after_id:
+            start = int(np.searchsorted(self.ids, after_id, side='right'))
+            if start >= self.n:
+                return self.ids[:0]
+            words = words.copy()
+            words[:start >> 6] = 0
+            words[start >> 6] &= ~np.uint64(0) << np.uint64(start & 63)
+        nonzero = np.flatnonzero(words)
+        if limit >= 0:
+            # Unpack only the leading words that hold the first limit rows
+            counts = np.cumsum(_word_counts(words[nonzero]), dtype=np.int64)
+            nonzero = nonzero[:int(np.searchsorted(counts, limit)) + 1]
+        bits = np.unpackbits(words[nonzero].view(np.uint8), bitorder='little').reshape(-1, 64)
+        rows, offsets = np.nonzero(bits)
+        positions = nonzero[rows].astype(np.int64) * 64 + offsets
+        if limit >= 0:
+            positions = positions[:limit]
+        return self.ids[positions]
+
+    def facet_counts(self, words: Optional[np.ndarray] = None,
+                     columns: Optional[Sequence[str]] = None) -> Dict[str, List[Tuple[str, int]]]:
+        """(value, count) pairs per column among the rows set in words, most common first"""
+        if words is None:
+            words = self._valid
+        facets = {}
+        for column in columns or self.bitsets:
+            counts = [(value, self._count(words, bitset)) for value, bitset in self.bitsets[column].items()]
+            facets[column] = sorted(((v, c) for v, c in counts if c), key=lambda vc: (-vc[1], vc[0]))
+        return facets
+
+    def memory(self) -> Dict[str, Union[int, Dict]]:
+        """Bytes held, in total and per column, with each column's dense and sparse value counts"""
+        columns = {}
+        for column, values in self.bitsets.items():
+            dense = sum(1 for b in values.values() if b.dtype == np.uint64)
+            columns[column] = {
+                'values': len(values),
+                'dense': dense,
+                'sparse': len(values) - dense,
+                'bytes': sum(b.nbytes for b in values.values()),
+            }
+        overhead = self.ids.nbytes + self._valid.nbytes
+        return {
+            'rows': self.n,
+            'bytes': overhead + sum(c['bytes'] for c in columns.values()),
+            'ids_bytes': overhead,
+            'columns': columns,
+        }
@@ -0,0 +1,123 @@
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Hashable, Iterator, List, Optional
+
+# SQLite virtual machine instructions between two budget checks, well
+# under a millisecond of work
+PROGRESS_INTERVAL = 1000
+
+# Rows fetched at a time, so an interrupted statement keeps what it returned
+FETCH_BATCH = 256
+
+
+class CancelToken:
+    """
+    Stops the searches it is passed to, from any thread
+
+    cancel() interrupts the statements running for the token at once;
+    statements started later stop at their first budget check.
+    """
+
+    def __init__(self):
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self._running = set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        with self._lock:
+            self._cancelled.set()
+            for conn in self._running:
+                conn.interrupt()
+
+    @contextmanager
+    def watching(self, conn: sqlite3.Connection) -> Iterator[None]:
+        """Let cancel() interrupt conn while a statement for this token runs on it"""
+        with self._lock:
+            self._running.add(conn)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._running.discard(conn)
+
+
+class SearchBudget:
+    """
+    A time budget and cancel token for one search call
+
+    Statements run under it stop once budget_ms has passed since it was
+    created or its token is cancelled. Rows a statement returned before
+    that are kept, and truncated is set.
+    """
+
+    def __init__(self, budget_ms: Optional[float] = None, token: Optional[CancelToken] = None):
+        self.deadline = time.perf_counter() + budget_ms / 1000 if budget_ms is not None else None
+        self.token = token
+        self.truncated = False
+
+    def expired(self) -> bool:
+        if self.token is not None and self.token.cancelled:
+            return True
+        return self.deadline is not None and time.perf_counter() >= self.deadline
+
+    def run(self, cursor: sqlite3.Cursor, sql: str, params) -> List:
+        """Execute a statement and fetch its rows until it finishes or the budget runs out"""
+        rows = []
+        if self.expired():
+            self.truncated = True
+            return rows
+        conn = cursor.connection
+        conn.set_progress_handler(self.expired, PROGRESS_INTERVAL)
+        try:
+            with self.token.watching(conn) if self.token is not None else nullcontext():
+                cursor.execute(sql, params)
+                while True:
+                    batch = cursor.fetchmany(FETCH_BATCH)
+                    if not batch:
+                        break
+                    rows.extend(batch)
+        except sqlite3.OperationalError as e:
+            if "interrupted" not in str(e) or not self.expired():
+                raise
+            self.truncated = True
+        finally:
+            conn.set_progress_handler(None, 0)
+        return rows
+
+
+class SessionQueries:
+    """
+    The running query of each session, so a new one cancels the one it supersedes
+
+    A session is any hashable key, such as a browser session id; its
+    queries share one slot, and starting a query cancels the one before.
+    """
+
+    def __init__(self):
+        self._tokens: Dict[Hashable, CancelToken] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    @contextmanager
+    def query(self, session: Hashable) -> Iterator[CancelToken]:
+        """A cancel token for the session's new query, cancelling its previous one"""
+        token = CancelToken()
+        with self._lock:
+            previous = self._tokens.get(session)
+            self._tokens[session] = token
+        if previous is not None:
+            previous.cancel()
+        try:
+            yield token
+        finally:
+            with self._lock:
+                if self._tokens.get(session) is token:
+                    del self._tokens[session]
@@ -0,0 +1,2290 @@
+import sqlite3
+import csv
+import functools
+import inspect
+import io
+import json
+import re
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from dataclasses import replace
+from pathlib import Path
+from typing import List, Dict, Optional, Callable, Iterator, Sequence, Tuple, Union, BinaryIO, TextIO
+
+from .batch import BATCH_MODES, PlanResult, SearchPlan, execute_plan, run_plans
+from .bitmap import CATEGORY_COLUMNS, BitmapIndex, categories_sql, parse_categories
+from .budget import CancelToken, SearchBudget, SessionQueries
+from .cache import QueryCache
+from .fuzzy import TermVocabulary, words as fuzzy_words
+from .gazetteer import COMMON_WORD_REGIONS, MIN_BARE_REGION_WORD, Gazetteer, RegionMatcher
+from .instrument import Instrumentation, describe_call
+from .nlp import QueryAnalysis, TextPreprocessor
+from .paging import SORT_INDEXES, SORTABLE_COLUMNS, Page, decode_cursor, encode_cursor, seek_steps
+from .pool import ConnectionPool
+from .results import ResultSet, RowList
+from .scoring import EnvironmentScorer
+from .similarity import SimilarityFeatures, build_neighbors
+from .suggest import NameIndex
+from .synonyms import SynonymIndex
+
+# bm25() column weights for intelligent_search, in orchids_fts column order
+FTS_COLUMN_WEIGHTS = {
+    'Scientific_Name': 10.0,
+    'Genus': 8.0,
+    'Flower_Color': 6.0,
+    'Petal_Shape': 2.0,
+    'Lip_Color': 2.0,
+    'Fragrance_Description': 3.0,
+    'Blooming_Season': 2.0,
+    'Temperature_Preference': 2.0,
+    'Native_Habitat': 2.0,
+    'Native_Regions': 4.0,
+    'Special_Features': 1.5,
+    'Common_Names': 7.0,
+    'Horticultural_Notes': 1.0,
+}
+
+FTS_COLUMNS = list(FTS_COLUMN_WEIGHTS)
+
+# Keep the external-content orchids_fts index in sync with orchids
+_FTS_COLS = ', '.join(FTS_COLUMNS)
+_FTS_NEW = ', '.join(f'new.{c}' for c in FTS_COLUMNS)
+_FTS_OLD = ', '.join(f'old.{c}' for c in FTS_COLUMNS)
+FTS_TRIGGERS = {
+    'orchids_fts_ai': f"""
+        CREATE TRIGGER IF NOT EXISTS orchids_fts_ai AFTER INSERT ON orchids BEGIN
+            INSERT INTO orchids_fts (rowid, {_FTS_COLS}) VALUES (new.id, {_FTS_NEW});
+        END
+    """,
+    'orchids_fts_ad': f"""
+        CREATE TRIGGER IF NOT EXISTS orchids_fts_ad AFTER DELETE ON orchids BEGIN
+            INSERT INTO orchids_fts (orchids_fts, rowid, {_FTS_COLS}) VALUES ('delete', old.id, {_FTS_OLD});
+        END
+    """,
+    # Only fires when an indexed column changes, so numeric-only updates skip FTS
+    'orchids_fts_au': f"""
+        CREATE TRIGGER IF NOT EXISTS orchids_fts_au AFTER UPDATE OF id, {_FTS_COLS} ON orchids BEGIN
+            INSERT INTO orchids_fts (orchids_fts, rowid, {_FTS_COLS}) VALUES ('delete', old.id, {_FTS_OLD});
+            INSERT INTO orchids_fts (rowid, {_FTS_COLS}) VALUES (new.id, {_FTS_NEW});
+        END
+    """,
+}
+
+# Second, trigram-tokenized FTS index for infix (substring) matching. It
+# covers every column the LIKE fallbacks scan, so "%term%" over any of them
+# becomes one index lookup
+TRIGRAM_COLUMNS = (
+    'Scientific_Name', 'Genus', 'Common_Names', 'Flower_Color',
+    'Native_Regions', 'Special_Features', 'Fragrance_Description',
+)
+_TRI_COLS = ', '.join(TRIGRAM_COLUMNS)
+_TRI_NEW = ', '.join(f'new.{c}' for c in TRIGRAM_COLUMNS)
+_TRI_OLD = ', '.join(f'old.{c}' for c in TRIGRAM_COLUMNS)
+TRIGRAM_TRIGGERS = {
+    'orchids_trigram_ai': f"""
+        CREATE TRIGGER IF NOT EXISTS orchids_trigram_ai AFTER INSERT ON orchids BEGIN
+            INSERT INTO orchids_trigram (rowid, {_TRI_COLS}) VALUES (new.id, {_TRI_NEW});
+        END
+    """,
+    'orchids_trigram_ad': f"""
+        CREATE TRIGGER IF NOT EXISTS orchids_trigram_ad AFTER DELETE ON orchids BEGIN
+            INSERT INTO orchids_trigram (orchids_trigram, rowid, {_TRI_COLS}) VALUES ('delete', old.id, {_TRI_OLD});
+        END
+    """,
+    'orchids_trigram_au': f"""
+        CREATE TRIGGER IF NOT EXISTS orchids_trigram_au AFTER UPDATE OF id, {_TRI_COLS} ON orchids BEGIN
+            INSERT INTO orchids_trigram (orchids_trigram, rowid, {_TRI_COLS}) VALUES ('delete', old.id, {_TRI_OLD});
+            INSERT INTO orchids_trigram (rowid, {_TRI_COLS}) VALUES (new.id, {_TRI_NEW});
+        END
+    """,
+}
+
+# Facet values an infix filter may expand to before it falls back to LIKE
+INFIX_MAX_VALUES = 500
+
+# The columns fallback_search() looks for its text in
+FALLBACK_COLUMNS = ('Scientific_Name', 'Genus', 'Flower_Color', 'Common_Names', 'Native_Regions', 'Special_Features')
+
+# The columns intelligent_search(mode="like") scans, joined per row into one
+# string so each expanded term costs one LIKE instead of one per column
+LIKE_SEARCH_COLUMNS = (
+    'Scientific_Name', 'Genus', 'Flower_Color', 'Common_Names', 'Native_Regions',
+    'Native_Habitat', 'Special_Features', 'Fragrance', 'Fragrance_Description', 'Petal_Shape',
+    'Lip_Color', 'Temperature_Preference', 'Blooming_Season', 'Horticultural_Notes', 'Growth_Habit',
+)
+_LIKE_HAYSTACK = " || ' | ' || ".join(f"COALESCE({c}, '')" for c in LIKE_SEARCH_COLUMNS)
+
+# A term's score for a row is that of the best column it appears in; a
+# row's relevance_score is the sum of its tokens' best term scores
+LIKE_SCORE_COLUMNS = {
+    'Scientific_Name': 10,
+    'Genus': 8,
+    'Common_Names': 7,
+    'Flower_Color': 6,
+}
+_LIKE_SCORE = "".join(f"WHEN d.{c} LIKE t.pattern THEN {s} " for c, s in LIKE_SCORE_COLUMNS.items())
+
+# The whole LIKE path in one statement with three parameters: the expanded
+# terms as a JSON array of [token, term] pairs, the limit, and a JSON array
+# of the regions the query names (see REGION_IDS_SQL), empty for anywhere.
+# Under a search budget it runs over windows of ids instead, with the
+# window's bounds as ?4 and ?5, so a budget cut still ranks the windows it
+# finished. Windows start small, for early partial results, and double.
+# terms is materialized so the JSON is parsed once, and the docs subquery's
+# LIMIT -1 stops SQLite flattening it, so each row's haystack is built once
+# and scored against every term by the correlated subquery.
+LIKE_INTELLIGENT_SQL = f"""
+    WITH terms(token, pattern) AS MATERIALIZED (
+        SELECT json_extract(value, '$[0]'), '%' || json_extract(value, '$[1]') || '%'
+        FROM json_each(?1)
+    ),
+    docs AS (
+        SELECT id, {', '.join(LIKE_SCORE_COLUMNS)}, {_LIKE_HAYSTACK} AS haystack
+        FROM orchids
+        WHERE (json_array_length(?3) = 0
+               OR id IN (SELECT orchid_id FROM orchid_region WHERE region_id IN ({{region_ids}}))){{window}}
+        LIMIT -1
+    ),
+    scored AS (
+        SELECT d.id, (
+            SELECT SUM(score) FROM (
+                SELECT MAX(CASE {_LIKE_SCORE}ELSE 1 END) AS score
+                FROM terms t
+                WHERE d.haystack LIKE t.pattern
+                GROUP BY t.token
+            )
+        ) AS relevance_score
+        FROM docs d
+        LIMIT -1
+    ),
+    ranked AS (
+        SELECT id, relevance_score
+        FROM scored
+        WHERE relevance_score > 0
+        ORDER BY relevance_score DESC, id
+        LIMIT ?2
+    )
+    SELECT {{select}}, r.relevance_score
+    FROM ranked r
+    JOIN orchids o ON o.id = r.id
+    ORDER BY r.relevance_score DESC, o.id
+"""
+
+LIKE_WINDOW = " AND id > ?4 AND id <= ?5"
+LIKE_WINDOW_IDS = (1000, 64000)
+
+# Row total kept in orchid_counts so count() never scans the table
+COUNT_TRIGGERS = {
+    'orchids_count_ai': """
+        CREATE TRIGGER IF NOT EXISTS orchids_count_ai AFTER INSERT ON orchids BEGIN
+            UPDATE orchid_counts SET value = value + 1 WHERE name = 'orchids';
+        END
+    """,
+    'orchids_count_ad': """
+        CREATE TRIGGER IF NOT EXISTS orchids_count_ad AFTER DELETE ON orchids BEGIN
+            UPDATE orchid_counts SET value = value - 1 WHERE name = 'orchids';
+        END
+    """,
+}
+
+# Delimited multi-valued columns, split into a lookup table of distinct
+# values and a junction table of (orchid_id, value id) pairs:
+# column -> (lookup table, junction table, value id column)
+MULTIVALUED_COLUMNS = {
+    'Native_Regions': ('regions', 'orchid_region', 'region_id'),
+    'Flower_Color': ('colors', 'orchid_color', 'color_id'),
+    'Common_Names': ('common_names', 'orchid_common_name', 'name_id'),
+}
+
+# Characters separating the values of a multi-valued column
+VALUE_SEPARATORS = (',', ';', '/')
+
+def _split_source(expr: str, alias: str = "j") -> str:
+    """A json_each() FROM-clause item yielding the values of a delimited text expression as {alias}.value, untrimmed"""
+    text = expr
+    for separator in VALUE_SEPARATORS[1:]:
+        text = f"replace({text}, '{separator}', '{VALUE_SEPARATORS[0]}')"
+    # json_quote() escapes everything but the separators, which then split the string into an array
+    return f"""json_each('[' || replace(json_quote({text}), '{VALUE_SEPARATORS[0]}', '","') || ']') AS {alias}"""
+
+def _link_values(column: str, row: str) -> str:
+    """Trigger statements adding the values of {row}.{column} to its lookup and junction tables"""
+    lookup, junction, value_id = MULTIVALUED_COLUMNS[column]
+    return f"""
+            INSERT OR IGNORE INTO {lookup} (name)
+            SELECT trim(j.value) FROM {_split_source(f'{row}.{column}')}
+            WHERE {row}.{column} IS NOT NULL AND trim(j.value) != '';
+            INSERT OR IGNORE INTO {junction} (orchid_id, {value_id})
+            SELECT {row}.id, l.id FROM {_split_source(f'{row}.{column}')}
+            JOIN {lookup} l ON l.name = trim(j.value)
+            WHERE {row}.{column} IS NOT NULL;"""
+
+MULTIVALUED_TRIGGERS = {}
+for _column, (_lookup, _junction, _value_id) in MULTIVALUED_COLUMNS.items():
+    MULTIVALUED_TRIGGERS[f'{_junction}_ai'] = f"""
+        CREATE TRIGGER IF NOT EXISTS {_junction}_ai AFTER INSERT ON orchids BEGIN
+            {_link_values(_column, 'new')}
+        END
+    """
+    MULTIVALUED_TRIGGERS[f'{_junction}_ad'] = f"""
+        CREATE TRIGGER IF NOT EXISTS {_junction}_ad AFTER DELETE ON orchids BEGIN
+            DELETE FROM {_junction} WHERE orchid_id = old.id;
+        END
+    """
+    MULTIVALUED_TRIGGERS[f'{_junction}_au'] = f"""
+        CREATE TRIGGER IF NOT EXISTS {_junction}_au AFTER UPDATE OF id, {_column} ON orchids
+        WHEN old.id IS NOT new.id OR old.{_column} IS NOT new.{_column} BEGIN
+            DELETE FROM {_junction} WHERE orchid_id = old.id;
+            {_link_values(_column, 'new')}
+        END
+    """
+
+# Per-value counts kept in orchid_facets for the sidebar stats, filter
+# dropdowns and facet counts, so none of them scan orchids. Multi-valued
+# columns are counted per value, from their junction tables.
+FACET_COLUMNS = ('Genus', 'Flower_Color', 'Native_Regions', 'Fragrance', 'Horticultural_Difficulty')
+_SINGLE_FACETS = tuple(c for c in FACET_COLUMNS if c not in MULTIVALUED_COLUMNS)
+
+def _facet_increment(column: str, row: str, when: str = "") -> str:
+    return f"""
+            INSERT INTO orchid_facets (column_name, value, count)
+            SELECT '{column}', {row}.{column}, 1 WHERE {row}.{column} IS NOT NULL{when}
+            ON CONFLICT (column_name, value) DO UPDATE SET count = count + 1;"""
+
+def _facet_decrement(column: str, row: str, when: str = "") -> str:
+    return f"""
+            UPDATE orchid_facets SET count = count - 1
+            WHERE column_name = '{column}' AND value = {row}.{column}{when};
+            DELETE FROM orchid_facets
+            WHERE column_name = '{column}' AND value = {row}.{column} AND count <= 0;"""
+
+_FACET_CHANGED = {c: f" AND old.{c} IS NOT new.{c}" for c in _SINGLE_FACETS}
+FACET_TRIGGERS = {
+    'orchids_facets_ai': f"""
+        CREATE TRIGGER IF NOT EXISTS orchids_facets_ai AFTER INSERT ON orchids BEGIN
+            {''.join(_facet_increment(c, 'new') for c in _SINGLE_FACETS)}
+        END
+    """,
+    'orchids_facets_ad': f"""
+        CREATE TRIGGER IF NOT EXISTS orchids_facets_ad AFTER DELETE ON orchids BEGIN
+            {''.join(_facet_decrement(c, 'old') for c in _SINGLE_FACETS)}
+        END
+    """,
+    'orchids_facets_au': f"""
+        CREATE TRIGGER IF NOT EXISTS orchids_facets_au AFTER UPDATE OF {', '.join(_SINGLE_FACETS)} ON orchids BEGIN
+            {''.join(_facet_decrement(c, 'old', _FACET_CHANGED[c]) + _facet_increment(c, 'new', _FACET_CHANGED[c])
+                     for c in _SINGLE_FACETS)}
+        END
+    """,
+}
+for _column in FACET_COLUMNS:
+    if _column not in MULTIVALUED_COLUMNS:
+        continue
+    _lookup, _junction, _value_id = MULTIVALUED_COLUMNS[_column]
+    FACET_TRIGGERS[f'{_junction}_facets_ai'] = f"""
+        CREATE TRIGGER IF NOT EXISTS {_junction}_facets_ai AFTER INSERT ON {_junction} BEGIN
+            INSERT INTO orchid_facets (column_name, value, count)
+            SELECT '{_column}', name, 1 FROM {_lookup} WHERE id = new.{_value_id}
+            ON CONFLICT (column_name, value) DO UPDATE SET count = count + 1;
+        END
+    """
+    FACET_TRIGGERS[f'{_junction}_facets_ad'] = f"""
+        CREATE TRIGGER IF NOT EXISTS {_junction}_facets_ad AFTER DELETE ON {_junction} BEGIN
+            UPDATE orchid_facets SET count = count - 1
+            WHERE column_name = '{_column}' AND value = (SELECT name FROM {_lookup} WHERE id = old.{_value_id});
+            DELETE FROM orchid_facets
+            WHERE column_name = '{_column}' AND count <= 0
+              AND value = (SELECT name FROM {_lookup} WHERE id = old.{_value_id});
+        END
+    """
+
+# flower_color/native_region filters of semantic_search and combined_search
+VALUE_FILTERS = {
+    'flower_color': 'Flower_Color',
+    'native_region': 'Native_Regions',
+}
+
+# The region gazetteer lives in the regions lookup: each region's parent_id,
+# other names for it in region_aliases, and every (ancestor, descendant)
+# pair, itself included, in region_closure. A region then selects all the
+# regions under it with one indexed lookup, however deep the tree.
+REGION_TRIGGERS = {
+    'regions_closure_ai': """
+        CREATE TRIGGER IF NOT EXISTS regions_closure_ai AFTER INSERT ON regions BEGIN
+            INSERT OR IGNORE INTO region_closure (ancestor_id, descendant_id, depth)
+            SELECT new.id, new.id, 0
+            UNION ALL
+            SELECT ancestor_id, new.id, depth + 1 FROM region_closure WHERE descendant_id = new.parent_id;
+        END
+    """,
+}
+
+# Ids of the regions a JSON array of names and aliases picks out, and of every
+# region under them; {names} is the array's parameter, bound twice
+REGION_IDS_SQL = """
+    SELECT c.descendant_id FROM region_closure c
+    WHERE c.ancestor_id IN (
+        SELECT r.id FROM json_each({names}) n JOIN regions r ON r.name = n.value
+        UNION
+        SELECT a.region_id FROM json_each({names}) n JOIN region_aliases a ON a.alias = n.value
+    )
+"""
+
+# Row triggers load_data and clear_data drop and recreate around their set-based passes
+_LOAD_TRIGGERS = {name: sql for name, sql in {**MULTIVALUED_TRIGGERS, **FACET_TRIGGERS}.items()
+                  if name.endswith('_ai')}
+_CLEAR_TRIGGERS = {name: sql for name, sql in {**MULTIVALUED_TRIGGERS, **FACET_TRIGGERS}.items()
+                   if name.endswith('_ad')}
+
+FTS_MAINTENANCE_COMMANDS = ('optimize', 'rebuild', 'integrity-check')
+
+# Free-text quantitative columns and the REAL (min, max) columns parsed from them
+NUMERIC_RANGE_COLUMNS = {
+    'Flower_Size_cm': ('Flower_Size_Min_cm', 'Flower_Size_Max_cm'),
+    'Bloom_Duration_Weeks': ('Bloom_Duration_Min_Weeks', 'Bloom_Duration_Max_Weeks'),
+    'Flowers_Per_Spike': ('Flowers_Per_Spike_Min', 'Flowers_Per_Spike_Max'),
+    'Spike_Length_cm': ('Spike_Length_Min_cm', 'Spike_Length_Max_cm'),
+    'Light_Requirement_FC': ('Light_Min_FC', 'Light_Max_FC'),
+    'Stem_Length_cm': ('Stem_Length_Min_cm', 'Stem_Length_Max_cm'),
+    'Leaf_Length_cm': ('Leaf_Length_Min_cm', 'Leaf_Length_Max_cm'),
+}
+
+# min_<name>/max_<name> filters of semantic_search and combined_search,
+# each backed by a composite (min, max) index and an index on max
+RANGE_FILTERS = {
+    'temp': ('Temperature_Min_C', 'Temperature_Max_C'),
+    'humidity': ('Humidity_Min_Percent', 'Humidity_Max_Percent'),
+    'light': ('Light_Min_FC', 'Light_Max_FC'),
+    'size': ('Flower_Size_Min_cm', 'Flower_Size_Max_cm'),
+    'elevation': ('Elevation_Min_m', 'Elevation_Max_m'),
+}
+RANGE_INDEXES = {
+    'temp': 'idx_temp',
+    'humidity': 'idx_humidity',
+    'light': 'idx_light',
+    'size': 'idx_flower_size',
+    'elevation': 'idx_elevation',
+}
+
+_NUMBER_RE = re.compile(r"\d+(?:\.\d+)?")
+_THOUSANDS_RE = re.compile(r"(?<=\d),(?=\d{3}\b)")
+
+def parse_numeric_range(value) -> Tuple[Optional[float], Optional[float]]:
+    """Parse "5-8", "5 to 8 cm", "1,500-2,500" or "10" into (min, max)"""
+    if value is None:
+        return None, None
+    if isinstance(value, (int, float)):
+        return float(value), float(value)
+    numbers = [float(n) for n in _NUMBER_RE.findall(_THOUSANDS_RE.sub("", str(value)))]
+    if not numbers:
+        return None, None
+    return min(numbers), max(numbers)
+
+# PRAGMAs applied for the duration of a bulk CSV load
+BULK_LOAD_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'OFF',
+    'cache_size': -65536,  # 64 MiB
+    'temp_store': 'MEMORY',
+}
+
+def _writes(method):
+    """Run an OrchidSearchDB method while holding the pool's write lock"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.pool.write_lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+def _freeze(value):
+    """Normalize an argument into a hashable cache-key component"""
+    if isinstance(value, str):
+        return " ".join(value.split())
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items() if v is not None and v != ''))
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+def _cached(method):
+    """Serve an OrchidSearchDB search from the query cache, keyed on data_version"""
+    signature = inspect.signature(method)
+    
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.cache is None:
+            return method(self, *args, **kwargs)
+        
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        key = (method.__name__, self.data_version,
+               tuple((name, _freeze(value)) for name, value in bound.arguments.items() if name != 'self'))
+        
+        hit, results = self.cache.get(key)
+        self.instrumentation.count_cache(hit)
+        if not hit:
+            results = method(self, *args, **kwargs)
+            # Results a budget cut short are only good for this call
+            budget = self._budget()
+            if budget is None or not budget.truncated:
+                self.cache.put(key, results)
+        # Hand out a fresh list so callers can't reorder the cached one
+        return list(results) if isinstance(results, list) else results
+    return wrapper
+
+def _budgeted(method):
+    """
+    Let an OrchidSearchDB search take budget_ms and cancel (a CancelToken)
+    
+    Its statements stop once budget_ms have passed or cancel is cancelled.
+    Row dicts then come back as a RowList, and both those and a ResultSet
+    carry truncated; for a (results, facets) pair, the results do.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, budget_ms: Optional[float] = None, cancel: Optional[CancelToken] = None, **kwargs):
+        if budget_ms is None and cancel is None:
+            return method(self, *args, **kwargs)
+        budget = SearchBudget(budget_ms, cancel)
+        outer = self._budget()
+        self._budgets.current = budget
+        try:
+            results = method(self, *args, **kwargs)
+        finally:
+            self._budgets.current = outer
+        if outer is not None and budget.truncated:
+            outer.truncated = True
+        return _mark_truncated(results, budget.truncated)
+    return wrapper
+
+def _mark_truncated(results, truncated: bool):
+    if isinstance(results, tuple):
+        return (_mark_truncated(results[0], truncated),) + results[1:]
+    if isinstance(results, list):
+        results = RowList(results)
+    if truncated and isinstance(results, (RowList, ResultSet)):
+        results.truncated = True
+    return results
+
+def _traced(method):
+    """Record an OrchidSearchDB call, its stages and statements when instrumentation is on"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        instrumentation = self.instrumentation
+        if not instrumentation.enabled:
+            return method(self, *args, **kwargs)
+        with instrumentation.trace(method.__name__, describe_call(method.__name__, args, kwargs)):
+            return method(self, *args, **kwargs)
+    return wrapper
+
+class OrchidSearchDB:
+    """SQLite-based orchid database with Full-Text Search and NLP"""
+    
+    def __init__(self, db_path: str = "orchids.db", pool_size: int = 4,
+                 cache_size: int = 256, cache_ttl: Optional[float] = None,
+                 nlp_mode: str = "nltk", synonyms_path: Optional[str] = None,
+                 read_only: bool = False, instrumentation: Optional[Instrumentation] = None,
+                 bitmap_index: bool = False):
+        self.db_path = db_path
+        self.pool_size = pool_size
+        self.read_only = read_only
+        self.pool = None
+        self.conn = None
+        
+        # Search result cache; entries are keyed on data_version, which every
+        # write that changes the orchids table bumps
+        self.cache = QueryCache(cache_size, cache_ttl) if cache_size > 0 else None
+        self.data_version = 0
+        self.preprocessor = TextPreprocessor(nlp_mode)
+        self._analysis_cache = QueryCache(maxsize=1024)
+        
+        # Vectorized environment scorer, reloaded when data_version changes
+        self._scorer = None
+        self._scorer_version = None
+        self._scorer_lock = threading.Lock()
+        
+        self.synonyms = SynonymIndex.from_file(synonyms_path) if synonyms_path else SynonymIndex()
+        
+        # orchids column names, read once for projections and hydration
+        self._table_columns = None
+        
+        # Route "%term%" filters through orchid_facets and orchids_trigram;
+        # False keeps the plain LIKE scans, for comparison
+        self.infix_index = True
+        
+        # Words of the trigram-indexed columns for did_you_mean(), per data_version
+        self._vocabulary = None
+        self._vocabulary_version = None
+        self._vocabulary_lock = threading.Lock()
+        
+        # Region names and aliases as query phrases for analyze_query(), per data_version
+        self._region_phrases = None
+        self._region_phrases_version = None
+        self._region_phrases_lock = threading.Lock()
+        
+        # Species, genus and common names for suggest(), per data_version
+        self._names = None
+        self._names_version = None
+        self._names_lock = threading.Lock()
+        
+        # Answer categories filters and category facets from in-memory bitsets,
+        # rebuilt when data_version changes; False keeps them in SQL
+        self.bitmap_index = bitmap_index
+        self._bitmaps = None
+        self._bitmaps_version = None
+        self._bitmaps_lock = threading.Lock()
+        
+        # The search budget of the call running on each thread, see _budgeted
+        self._budgets = threading.local()
+        
+        # Running query per UI or API session; a new one cancels the one it supersedes
+        self.sessions = SessionQueries()
+        
+        # Per-stage timings and SQL of search calls; off unless one is passed in
+        self.instrumentation = instrumentation or Instrumentation()
+        
+    def preprocess_text(self, text: str) -> List[str]:
+        """Preprocess text using NLTK"""
+        return self.preprocessor.preprocess(text)
+    
+    def analyze_query(self, query: str) -> QueryAnalysis:
+        """Tokens, synonym expansions and named regions of a query, memoized for search and UI reuse"""
+        # Case stays in the key: a capitalized word may name a region
+        key = " ".join(query.split())
+        hit, analysis = self._analysis_cache.get(key)
+        if hit:
+            return analysis
+        
+        with self.instrumentation.stage("preprocess"):
+            preprocessed = self.preprocess_text(query)
+        with self.instrumentation.stage("expand"):
+            # Region names and aliases like "costa rica" become a single token,
+            # resolved through the gazetteer rather than matched as text
+            capitalized = self.preprocess_text(" ".join(w for w in query.split() if w[:1].isupper()))
+            merged, regions = self._region_matcher().match(preprocessed, capitalized)
+            # As do multi-word synonyms
+            tokens = tuple(self.synonyms.match_phrases(merged))
+            expansions = {}
+            for token in tokens:
+                if token in regions:
+                    continue
+                expanded = self.synonyms.expand(token)
+                if len(expanded) > 1:
+                    expansions[token] = expanded
+        analysis = QueryAnalysis(query, tokens, expansions, regions)
+        self._analysis_cache.put(key, analysis)
+        return analysis
+    
+    def expand_query(self, query: str) -> List[str]:
+        """Expand query with synonyms"""
+        return list(self.synonyms.expand(query))
+        
+    def connect(self):
+        """Open the connection pool: one writer plus pool_size read-only connections"""
+        if self.read_only and not Path(self.db_path).is_file():
+            raise FileNotFoundError(f"No database at {self.db_path}")
+        self.pool = ConnectionPool(self.db_path, size=self.pool_size, read_only=self.read_only)
+        self.conn = self.pool.writer
+        
+    def close(self):
+        """Close database connection"""
+        if self.pool:
+            self.pool.close()
+    
+    def bump_data_version(self):
+        """Invalidate cached search results after the data changed"""
+        self.data_version += 1
+        if self.cache is not None:
+            self.cache.clear()
+        # Analyses hold the regions a query names, which the data can add
+        self._analysis_cache.clear()
+    
+    def _budget(self) -> Optional[SearchBudget]:
+        """The budget of the search running on this thread, None without one"""
+        return getattr(self._budgets, 'current', None)
+    
+    @contextmanager
+    def _unbudgeted(self) -> Iterator[None]:
+        """Run statements whole, whatever the search's budget, for loads kept beyond the call"""
+        outer = self._budget()
+        self._budgets.current = None
+        try:
+            yield
+        finally:
+            self._budgets.current = outer
+    
+    def _execute(self, cursor: sqlite3.Cursor, sql: str, params) -> List:
+        """
+        Execute a statement and fetch all of its rows, recorded by instrumentation when it is on
+        
+        Under a search budget, only the rows returned before it ran out.
+        """
+        budget = self._budget()
+        statement = self.instrumentation.statement(cursor.connection, sql, params)
+        if statement is None:
+            if budget is not None:
+                return budget.run(cursor, sql, params)
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+        with statement:
+            if budget is not None:
+                rows = budget.run(cursor, sql, params)
+            else:
+                cursor.execute(sql, params)
+                rows = cursor.fetchall()
+            statement.rows = len(rows)
+        return rows
+    
+    def _fetchall(self, sql: str, params=()) -> List[Dict]:
+        """Run a read query on its own cursor over a pooled read connection"""
+        with self.pool.reader() as conn:
+            cursor = conn.cursor()
+            try:
+                rows = self._execute(cursor, sql, params)
+            finally:
+                cursor.close()
+        with self.instrumentation.stage("rows"):
+            return [dict(row) for row in rows]
+    
+    def _fetchone(self, sql: str, params=()) -> Optional[Dict]:
+        """Run a read query and return its first row"""
+        rows = self._fetchall(sql, params)
+        return rows[0] if rows else None
+    
+    @property
+    def table_columns(self) -> Tuple[str, ...]:
+        """Column names of the orchids table"""
+        if self._table_columns is None:
+            with self._unbudgeted():
+                self._table_columns = tuple(row['name'] for row in self._fetchall("PRAGMA table_info(orchids)"))
+        return self._table_columns
+    
+    def _projection(self, columns: Optional[Sequence[str]], alias: str = "") -> str:
+        """SELECT list for the requested columns, id always first; * when columns is None"""
+        prefix = f"{alias}." if alias else ""
+        if columns is None:
+            return f"{prefix}*"
+        unknown = [c for c in columns if c not in self.table_columns]
+        if unknown:
+            raise ValueError(f"Unknown orchid columns: {', '.join(unknown)}")
+        return ", ".join(f"{prefix}{c}" for c in ['id'] + [c for c in columns if c != 'id'])
+    
+    def _fetch_results(self, sql: str, params, columns: Optional[Sequence[str]]) -> Union[List[Dict], ResultSet]:
+        """Full row dicts when columns is None, otherwise a projected ResultSet"""
+        if columns is None:
+            return self._fetchall(sql, params)
+        with self.pool.reader() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            try:
+                rows = self._execute(cursor, sql, params)
+                # A statement the budget stopped before it began has no description
+                names = ([d[0] for d in cursor.description] if cursor.description
+                         else ['id'] + [c for c in columns if c != 'id'])
+            finally:
+                cursor.close()
+        with self.instrumentation.stage("rows"):
+            return ResultSet(names, rows, self.table_columns, self._hydrate_rows)
+    
+    def _hydrate_rows(self, ids: List[int], columns: List[str]) -> Dict[int, tuple]:
+        """The given columns of the given orchids, in one query, keyed by id"""
+        with self.pool.reader() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            try:
+                rows = self._execute(
+                    cursor,
+                    f"SELECT id, {', '.join(columns)} FROM orchids WHERE id IN (SELECT value FROM json_each(?))",
+                    (json.dumps(ids),)
+                )
+                return {row[0]: row[1:] for row in rows}
+            finally:
+                cursor.close()
+    
+    def fetch_by_ids(self, ids: List[int]) -> List[Dict]:
+        """Full rows for the given ids in one query, in the order given"""
+        if not ids:
+            return []
+        rows = self._fetchall(
+            "SELECT * FROM orchids WHERE id IN (SELECT value FROM json_each(?))",
+            (json.dumps([int(i) for i in ids]),)
+        )
+        by_id = {row['id']: row for row in rows}
+        return [by_id[i] for i in ids if i in by_id]
+            
+    @_writes
+    def create_tables(self):
+        """Create main table and FTS5 virtual table"""
+        cursor = self.conn.cursor()
+        # Main orchid data table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS orchids (
+                id INTEGER PRIMARY KEY,
+                Species_Key INTEGER,
+                Scientific_Name TEXT,
+                Canonical_Name TEXT,
+                Genus TEXT,
+                Species_Epithet TEXT,
+                Author TEXT,
+                Taxonomic_Status TEXT,
+                Kingdom TEXT,
+                Family TEXT,
+                Subfamily TEXT,
+                Order_Name TEXT,
+                Growth_Habit TEXT,
+                Flower_Size_cm TEXT,
+                Flower_Color TEXT,
+                Petal_Shape TEXT,
+                Petal_Count TEXT,
+                Lip_Shape TEXT,
+                Lip_Color TEXT,
+                Column_Structure TEXT,
+                Fragrance TEXT,
+                Fragrance_Description TEXT,
+                Blooming_Season TEXT,
+                Bloom_Duration_Weeks TEXT,
+                Flowers_Per_Spike TEXT,
+                Spike_Length_cm TEXT,
+                Light_Requirement_FC TEXT,
+                Light_Description TEXT,
+                Temperature_Min_C REAL,
+                Temperature_Max_C REAL,
+                Temperature_Preference TEXT,
+                Humidity_Min_Percent INTEGER,
+                Humidity_Max_Percent INTEGER,
+                Watering_Frequency TEXT,
+                Fertilizer_Requirement TEXT,
+                Potting_Media TEXT,
+                Pseudobulb TEXT,
+                Pseudobulb_Shape TEXT,
+                Stem_Type TEXT,
+                Stem_Length_cm TEXT,
+                Leaf_Type TEXT,
+                Leaf_Length_cm TEXT,
+                Leaf_Color TEXT,
+                Leaf_Arrangement TEXT,
+                Root_Type TEXT,
+                Root_Color TEXT,
+                Pollination_Type TEXT,
+                Pollination_Mechanism TEXT,
+                Seed_Type TEXT,
+                Propagation_Method TEXT,
+                Native_Habitat TEXT,
+                Native_Regions TEXT,
+                Elevation_Min_m INTEGER,
+                Elevation_Max_m INTEGER,
+                Climate_Type TEXT,
+                Rainfall_Requirement TEXT,
+                Air_Movement TEXT,
+                Mycorrhizal_Association TEXT,
+                Conservation_Status TEXT,
+                Threatened_Level TEXT,
+                Horticultural_Difficulty TEXT,
+                Horticultural_Notes TEXT,
+                Commercial_Importance TEXT,
+                Breeding_Potential TEXT,
+                Disease_Susceptibility TEXT,
+                Pest_Susceptibility TEXT,
+                Special_Features TEXT,
+                Cultural_Significance TEXT,
+                Common_Names TEXT,
+                Etymology TEXT,
+                Flower_Size_Min_cm REAL,
+                Flower_Size_Max_cm REAL,
+                Bloom_Duration_Min_Weeks REAL,
+                Bloom_Duration_Max_Weeks REAL,
+                Flowers_Per_Spike_Min REAL,
+                Flowers_Per_Spike_Max REAL,
+                Spike_Length_Min_cm REAL,
+                Spike_Length_Max_cm REAL,
+                Light_Min_FC REAL,
+                Light_Max_FC REAL,
+                Stem_Length_Min_cm REAL,
+                Stem_Length_Max_cm REAL,
+                Leaf_Length_Min_cm REAL,
+                Leaf_Length_Max_cm REAL
+            )
+        """)
+        self._migrate_numeric_columns(cursor)
+        
+        # FTS5 virtual table for full-text search
+        cursor.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS orchids_fts USING fts5(
+                Scientific_Name,
+                Genus,
+                Flower_Color,
+                Petal_Shape,
+                Lip_Color,
+                Fragrance_Description,
+                Blooming_Season,
+                Temperature_Preference,
+                Native_Habitat,
+                Native_Regions,
+                Special_Features,
+                Common_Names,
+                Horticultural_Notes,
+                content=orchids,
+                content_rowid=id
+            )
+        """)
+        
+        # Trigram index for infix matching, built from the table if it is new
+        trigram_exists = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'orchids_trigram'"
+        ).fetchone()
+        cursor.execute(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS orchids_trigram USING fts5(
+                {_TRI_COLS},
+                content=orchids,
+                content_rowid=id,
+                tokenize='trigram'
+            )
+        """)
+        if not trigram_exists:
+            cursor.execute("INSERT INTO orchids_trigram (orchids_trigram) VALUES ('rebuild')")
+        
+        # Terms of the FTS index and their document counts, for did_you_mean()
+        cursor.execute("CREATE VIRTUAL TABLE IF NOT EXISTS orchids_fts_vocab USING fts5vocab(orchids_fts, 'row')")
+        
+        # Create indexes for optimized filtering
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_genus ON orchids(Genus)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_flower_color ON orchids(Flower_Color)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_temp ON orchids(Temperature_Min_C, Temperature_Max_C)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_species_key ON orchids(Species_Key)")
+        
+        # (column, id) indexes for keyset pagination over every sortable column
+        for column, index in SORT_INDEXES.items():
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS {index} ON orchids({column}, id)")
+        
+        # Range-filter indexes: (min, max) for min_* filters, max alone for max_* filters
+        for name, (min_col, max_col) in RANGE_FILTERS.items():
+            index = RANGE_INDEXES[name]
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS {index} ON orchids({min_col}, {max_col})")
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS {index}_max ON orchids({max_col})")
+        
+        # Precomputed k nearest neighbors per orchid, see build_similarity_index()
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS orchid_similar (
+                orchid_id INTEGER NOT NULL,
+                rank INTEGER NOT NULL,
+                neighbor_id INTEGER NOT NULL,
+                score REAL NOT NULL,
+                PRIMARY KEY (orchid_id, rank)
+            ) WITHOUT ROWID
+        """)
+        
+        # Row total, seeded from the table the first time and then kept by triggers
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS orchid_counts (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            ) WITHOUT ROWID
+        """)
+        cursor.execute("INSERT OR IGNORE INTO orchid_counts VALUES ('orchids', (SELECT COUNT(*) FROM orchids))")
+        
+        # Lookup and junction tables of the multi-valued columns, indexed from
+        # both sides and filled from the table the first time
+        junctions_exist = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'orchid_region'"
+        ).fetchone()
+        for lookup, junction, value_id in MULTIVALUED_COLUMNS.values():
+            cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS {lookup} (
+                    id INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL UNIQUE COLLATE NOCASE
+                )
+            """)
+            cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS {junction} (
+                    orchid_id INTEGER NOT NULL,
+                    {value_id} INTEGER NOT NULL,
+                    PRIMARY KEY (orchid_id, {value_id})
+                ) WITHOUT ROWID
+            """)
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{junction}_value ON {junction}({value_id}, orchid_id)")
+        if not junctions_exist:
+            self._add_multivalued_values(cursor)
+        
+        # The region gazetteer: parents on the regions lookup, aliases, and the
+        # closure table, seeded with the default tree when it is new
+        closure_exists = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'region_closure'"
+        ).fetchone()
+        if 'parent_id' not in {row[1] for row in cursor.execute("PRAGMA table_info(regions)")}:
+            cursor.execute("ALTER TABLE regions ADD COLUMN parent_id INTEGER REFERENCES regions(id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_regions_parent ON regions(parent_id)")
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS region_aliases (
+                alias TEXT PRIMARY KEY COLLATE NOCASE,
+                region_id INTEGER NOT NULL
+            ) WITHOUT ROWID
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS region_closure (
+                ancestor_id INTEGER NOT NULL,
+                descendant_id INTEGER NOT NULL,
+                depth INTEGER NOT NULL,
+                PRIMARY KEY (ancestor_id, descendant_id)
+            ) WITHOUT ROWID
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_region_closure_descendant "
+                       "ON region_closure(descendant_id, ancestor_id)")
+        if not closure_exists:
+            self._apply_gazetteer(cursor, Gazetteer.default())
+        
+        # Facet counts, built from the table once when the facet table is new
+        facets_exist = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'orchid_facets'"
+        ).fetchone()
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS orchid_facets (
+                column_name TEXT NOT NULL,
+                value TEXT NOT NULL,
+                count INTEGER NOT NULL,
+                PRIMARY KEY (column_name, value)
+            ) WITHOUT ROWID
+        """)
+        if not facets_exist:
+            self._add_facet_counts(cursor)
+        elif not junctions_exist:
+            # Older databases counted whole delimited strings: recount those
+            # columns per value, under the new triggers created below
+            for trigger in ('orchids_facets_ai', 'orchids_facets_ad', 'orchids_facets_au'):
+                cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+            multivalued = [c for c in FACET_COLUMNS if c in MULTIVALUED_COLUMNS]
+            cursor.execute(f"DELETE FROM orchid_facets WHERE column_name IN ({', '.join('?' * len(multivalued))})",
+                           multivalued)
+            self._add_facet_counts(cursor, columns=multivalued)
+        
+        # Triggers keeping both FTS indexes, the junction tables, the region
+        # closure, the row total and facet counts in sync with every insert,
+        # update and delete
+        for trigger_sql in (*FTS_TRIGGERS.values(), *TRIGRAM_TRIGGERS.values(), *MULTIVALUED_TRIGGERS.values(),
+                            *REGION_TRIGGERS.values(), *COUNT_TRIGGERS.values(), *FACET_TRIGGERS.values()):
+            cursor.execute(trigger_sql)
+        
+        self.conn.commit()
+        self._table_columns = None
+        
+    def _add_facet_counts(self, cursor: sqlite3.Cursor, first_id: int = 1,
+                          columns: Sequence[str] = FACET_COLUMNS):
+        """Add the facet values of rows with id >= first_id to orchid_facets in one grouped pass each"""
+        for column in columns:
+            if column in MULTIVALUED_COLUMNS:
+                lookup, junction, value_id = MULTIVALUED_COLUMNS[column]
+                source = f"""
+                    SELECT '{column}', l.name, COUNT(*) FROM {junction} j
+                    JOIN {lookup} l ON l.id = j.{value_id}
+                    WHERE j.orchid_id >= ?
+                    GROUP BY l.id
+                """
+            else:
+                source = f"""
+                    SELECT '{column}', {column}, COUNT(*) FROM orchids
+                    WHERE id >= ? AND {column} IS NOT NULL
+                    GROUP BY {column}
+                """
+            cursor.execute(f"""
+                INSERT INTO orchid_facets (column_name, value, count)
+                {source}
+                ON CONFLICT (column_name, value) DO UPDATE SET count = count + excluded.count
+            """, (first_id,))
+    
+    def _add_multivalued_values(self, cursor: sqlite3.Cursor, first_id: int = 1):
+        """Split the multi-valued columns of rows with id >= first_id into their lookup and junction tables"""
+        for column, (lookup, junction, value_id) in MULTIVALUED_COLUMNS.items():
+            # Split each row once into a staging table, then resolve the distinct values
+            cursor.execute("DROP TABLE IF EXISTS temp.split_values")
+            cursor.execute(f"""
+                CREATE TEMP TABLE split_values AS
+                SELECT o.id AS orchid_id, trim(j.value) AS name FROM orchids o, {_split_source(f'o.{column}')}
+                WHERE o.id >= ? AND o.{column} IS NOT NULL AND trim(j.value) != ''
+            """, (first_id,))
+            cursor.execute(f"INSERT OR IGNORE INTO {lookup} (name) SELECT DISTINCT name FROM temp.split_values")
+            cursor.execute(f"""
+                INSERT OR IGNORE INTO {junction} (orchid_id, {value_id})
+                SELECT s.orchid_id, l.id FROM temp.split_values s
+                JOIN {lookup} l ON l.name = s.name
+            """)
+            cursor.execute("DROP TABLE temp.split_values")
+    
+    def _apply_gazetteer(self, cursor: sqlite3.Cursor, gazetteer: Gazetteer):
+        """Merge a gazetteer into regions and region_aliases, then rebuild region_closure"""
+        # The merged tree must still be a tree, so check it before writing
+        current = dict(cursor.execute(
+            "SELECT r.name, p.name FROM regions r JOIN regions p ON p.id = r.parent_id"
+        ).fetchall())
+        Gazetteer({**current, **gazetteer.parents})
+        
+        # New parents without an entry become roots; known ones keep their place
+        cursor.executemany("INSERT OR IGNORE INTO regions (name) VALUES (?)",
+                           ((name,) for name in gazetteer.order if name not in gazetteer.parents))
+        cursor.executemany("""
+            INSERT INTO regions (name, parent_id) VALUES (?, (SELECT id FROM regions WHERE name = ?))
+            ON CONFLICT (name) DO UPDATE SET parent_id = excluded.parent_id
+        """, gazetteer.edges())
+        cursor.executemany("""
+            INSERT INTO region_aliases (alias, region_id) SELECT ?, id FROM regions WHERE name = ?
+            ON CONFLICT (alias) DO UPDATE SET region_id = excluded.region_id
+        """, gazetteer.aliases.items())
+        self._rebuild_region_closure(cursor)
+    
+    def _rebuild_region_closure(self, cursor: sqlite3.Cursor):
+        """Recompute every (ancestor, descendant, depth) row of region_closure from the parent links"""
+        cursor.execute("DELETE FROM region_closure")
+        cursor.execute("""
+            WITH RECURSIVE up (ancestor_id, descendant_id, depth) AS (
+                SELECT id, id, 0 FROM regions
+                UNION ALL
+                SELECT r.parent_id, up.descendant_id, up.depth + 1
+                FROM up JOIN regions r ON r.id = up.ancestor_id
+                WHERE r.parent_id IS NOT NULL
+            )
+            INSERT INTO region_closure (ancestor_id, descendant_id, depth)
+            SELECT ancestor_id, descendant_id, depth FROM up
+        """)
+        cursor.execute("ANALYZE region_closure")
+    
+    def _migrate_numeric_columns(self, cursor: sqlite3.Cursor):
+        """Add and backfill the parsed numeric columns on databases created before them"""
+        existing = {row[1] for row in cursor.execute("PRAGMA table_info(orchids)")}
+        missing = [(text_col, cols) for text_col, cols in NUMERIC_RANGE_COLUMNS.items()
+                   if cols[0] not in existing]
+        if not missing:
+            return
+        
+        self.conn.create_function("range_min", 1, lambda v: parse_numeric_range(v)[0], deterministic=True)
+        self.conn.create_function("range_max", 1, lambda v: parse_numeric_range(v)[1], deterministic=True)
+        assignments = []
+        for text_col, (min_col, max_col) in missing:
+            cursor.execute(f"ALTER TABLE orchids ADD COLUMN {min_col} REAL")
+            cursor.execute(f"ALTER TABLE orchids ADD COLUMN {max_col} REAL")
+            assignments += [f"{min_col} = range_min({text_col})", f"{max_col} = range_max({text_col})"]
+        cursor.execute(f"UPDATE orchids SET {', '.join(assignments)}")
+    
+    @contextmanager
+    def _open_source(self, source: Union[str, BinaryIO, TextIO]) -> Iterator[TextIO]:
+        """Open a path, URL or file object as an incrementally decoded text stream"""
+        if hasattr(source, 'read'):
+            if isinstance(source, io.TextIOBase):
+                yield source
+            else:
+                # Don't let the wrapper close a stream the caller owns
+                text = io.TextIOWrapper(source, encoding='utf-8-sig', newline='')
+                try:
+                    yield text
+                finally:
+                    text.detach()
+            return
+        
+        if source.startswith(('http://', 'https://')):
+            raw = urllib.request.urlopen(source)
+        else:
+            raw = open(source, 'rb')
+        with raw, io.TextIOWrapper(raw, encoding='utf-8-sig', newline='') as text:
+            yield text
+    
+    def _iter_csv_chunks(self, stream: TextIO, chunk_size: int) -> Iterator[tuple]:
+        """Yield (db_columns, rows) chunks from a CSV stream"""
+        reader = csv.reader(stream)
+        header = next(reader, None)
+        if not header:
+            return
+        
+        # Map CSV column names to database column names once per file
+        columns = ['Order_Name' if col == 'Order' else col for col in header]  # 'Order' is a SQL keyword
+        width = len(columns)
+        
+        # Parsed (min, max) values are appended after the CSV's own columns
+        derived = [(columns.index(text_col), cols) for text_col, cols in NUMERIC_RANGE_COLUMNS.items()
+                   if text_col in columns]
+        for _, cols in derived:
+            columns.extend(cols)
+        
+        chunk = []
+        for row in reader:
+            if not row:
+                continue
+            if len(row) != width:
+                row = (row + [None] * width)[:width]
+            for position, _ in derived:
+                row.extend(parse_numeric_range(row[position]))
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield columns, chunk
+                chunk = []
+        if chunk:
+            yield columns, chunk
+    
+    def _stream_into(self, table: str, source: Union[str, BinaryIO, TextIO], chunk_size: int,
+                     progress: Optional[Callable[[int, float], None]]) -> tuple:
+        """Insert every CSV row from source into table, returning (csv_columns, row_count)"""
+        start = time.perf_counter()
+        count = 0
+        columns = []
+        insert_sql = None
+        
+        with self._open_source(source) as stream:
+            for columns, chunk in self._iter_csv_chunks(stream, chunk_size):
+                if insert_sql is None:
+                    insert_sql = (f"INSERT INTO {table} ({', '.join(columns)}) "
+                                  f"VALUES ({', '.join('?' for _ in columns)})")
+                self.conn.executemany(insert_sql, chunk)
+                count += len(chunk)
+                if progress:
+                    progress(count, time.perf_counter() - start)
+        return columns, count
+    
+    @_writes
+    def load_data(self, source: Union[str, BinaryIO, TextIO], chunk_size: int = 5000,
+                  progress: Optional[Callable[[int, float], None]] = None) -> int:
+        """
+        Stream CSV rows from a path, URL or file object into the database
+        
+        Rows are inserted with executemany in chunks of chunk_size inside a
+        single transaction. progress(rows_loaded, elapsed_seconds) is called
+        after every chunk.
+        """
+        start = time.perf_counter()
+        
+        previous = self._bulk_load_pragmas()
+        try:
+            with self.conn:
+                self.conn.execute("BEGIN")
+                # Index and count the new rows in one pass at the end instead of per row
+                for trigger in ('orchids_fts_ai', 'orchids_trigram_ai', 'orchids_count_ai', *_LOAD_TRIGGERS):
+                    self.conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+                first_new_id = self.conn.execute(
+                    "SELECT COALESCE(MAX(id), 0) + 1 FROM orchids"
+                ).fetchone()[0]
+                
+                _, count = self._stream_into("orchids", source, chunk_size, progress)
+                
+                self.conn.execute(f"""
+                    INSERT INTO orchids_fts (rowid, {', '.join(FTS_COLUMNS)})
+                    SELECT id, {', '.join(FTS_COLUMNS)}
+                    FROM orchids
+                    WHERE id >= ?
+                """, (first_new_id,))
+                self.conn.execute(f"""
+                    INSERT INTO orchids_trigram (rowid, {_TRI_COLS})
+                    SELECT id, {_TRI_COLS}
+                    FROM orchids
+                    WHERE id >= ?
+                """, (first_new_id,))
+                self.conn.execute("UPDATE orchid_counts SET value = value + ? WHERE name = 'orchids'", (count,))
+                self._add_multivalued_values(self.conn.cursor(), first_new_id)
+                self._add_facet_counts(self.conn.cursor(), first_new_id)
+                self.conn.execute(FTS_TRIGGERS['orchids_fts_ai'])
+                self.conn.execute(TRIGRAM_TRIGGERS['orchids_trigram_ai'])
+                self.conn.execute(COUNT_TRIGGERS['orchids_count_ai'])
+                for trigger_sql in _LOAD_TRIGGERS.values():
+                    self.conn.execute(trigger_sql)
+                # Fresh statistics so the planner picks the range-filter and junction indexes
+                self.conn.execute("ANALYZE orchids")
+                for _, junction, _ in MULTIVALUED_COLUMNS.values():
+                    self.conn.execute(f"ANALYZE {junction}")
+        finally:
+            self._restore_pragmas(previous)
+            self.bump_data_version()
+        
+        elapsed = time.perf_counter() - start
+        rate = count / elapsed if elapsed > 0 else 0.0
+        print(f"Loaded and indexed {count} records in {elapsed:.2f}s ({rate:,.0f} rows/sec)")
+        
+        return count
+    
+    @_writes
+    def sync_data(self, source: Union[str, BinaryIO, TextIO], chunk_size: int = 5000,
+                  delete_missing: bool = False,
+                  progress: Optional[Callable[[int, float], None]] = None) -> Dict[str, int]:
+        """
+        Upsert a refreshed CSV keyed on Species_Key, touching only changed rows
+        
+        New species are inserted, species whose values differ are updated and,
+        with delete_missing, species absent from the CSV are removed. The FTS
+        triggers re-index just those rows. CSV rows without a Species_Key
+        can't be matched and are skipped, as are all but the last row of a
+        key the CSV repeats; the counts of both are returned alongside the
+        changes. Orchids without a key are never deleted as missing.
+        """
+        start = time.perf_counter()
+        
+        previous = self._bulk_load_pragmas()
+        try:
+            with self.conn:
+                self.conn.execute("DROP TABLE IF EXISTS temp.orchids_staging")
+                self.conn.execute("CREATE TEMP TABLE orchids_staging AS SELECT * FROM orchids WHERE 0")
+                columns, _ = self._stream_into("temp.orchids_staging", source, chunk_size, progress)
+                if 'Species_Key' not in columns:
+                    raise ValueError("sync_data needs a Species_Key column to match rows on")
+                self.conn.execute("CREATE INDEX temp.idx_staging_key ON orchids_staging(Species_Key)")
+                
+                # NULL = NULL never holds, so keyless rows would be inserted again
+                # on every sync; a repeated key would update from an arbitrary row
+                missing_key = self.conn.execute(
+                    "DELETE FROM temp.orchids_staging WHERE Species_Key IS NULL OR trim(Species_Key) = ''"
+                ).rowcount
+                duplicate_key = self.conn.execute("""
+                    DELETE FROM temp.orchids_staging
+                    WHERE rowid < (SELECT MAX(d.rowid) FROM temp.orchids_staging d
+                                   WHERE d.Species_Key = orchids_staging.Species_Key)
+                """).rowcount
+                
+                data_cols = [c for c in columns if c != 'Species_Key']
+                changed = " OR ".join(f"s.{c} IS NOT orchids.{c}" for c in data_cols) or "0"
+                updated = self.conn.execute(f"""
+                    UPDATE orchids
+                    SET ({', '.join(data_cols)}) = (
+                        SELECT {', '.join(f's.{c}' for c in data_cols)}
+                        FROM temp.orchids_staging s
+                        WHERE s.Species_Key = orchids.Species_Key
+                    )
+                    WHERE EXISTS (
+                        SELECT 1 FROM temp.orchids_staging s
+                        WHERE s.Species_Key = orchids.Species_Key AND ({changed})
+                    )
+                """).rowcount if data_cols else 0
+                
+                inserted = self.conn.execute(f"""
+                    INSERT INTO orchids ({', '.join(columns)})
+                    SELECT {', '.join(f's.{c}' for c in columns)}
+                    FROM temp.orchids_staging s
+                    WHERE NOT EXISTS (SELECT 1 FROM orchids o WHERE o.Species_Key = s.Species_Key)
+                """).rowcount
+                
+                deleted = 0
+                if delete_missing:
+                    deleted = self.conn.execute("""
+                        DELETE FROM orchids
+                        WHERE Species_Key IS NOT NULL AND trim(Species_Key) != ''
+                          AND NOT EXISTS (
+                            SELECT 1 FROM temp.orchids_staging s
+                            WHERE s.Species_Key = orchids.Species_Key
+                        )
+                    """).rowcount
+                
+                self.conn.execute("DROP TABLE temp.orchids_staging")
+        finally:
+            self._restore_pragmas(previous)
+            self.bump_data_version()
+        
+        elapsed = time.perf_counter() - start
+        print(f"Synced in {elapsed:.2f}s: {inserted} inserted, {updated} updated, {deleted} deleted, "
+              f"{missing_key} rows without a Species_Key and {duplicate_key} repeated keys skipped")
+        return {'inserted': inserted, 'updated': updated, 'deleted': deleted,
+                'missing_key': missing_key, 'duplicate_key': duplicate_key}
+    
+    @_writes
+    def maintain_fts(self, command: str = "optimize"):
+        """Run an FTS5 maintenance command on both FTS indexes: optimize, rebuild or integrity-check"""
+        if command not in FTS_MAINTENANCE_COMMANDS:
+            raise ValueError(f"Unknown FTS maintenance command: {command}")
+        with self.conn:
+            self.conn.execute("INSERT INTO orchids_fts (orchids_fts) VALUES (?)", (command,))
+            self.conn.execute("INSERT INTO orchids_trigram (orchids_trigram) VALUES (?)", (command,))
+    
+    @_writes
+    def clear_data(self):
+        """Delete all orchids and empty the FTS index in one transaction"""
+        with self.conn:
+            self.conn.execute("BEGIN")
+            # Drop the delete trigger so DELETE can truncate instead of
+            # removing index entries one row at a time
+            for trigger in ('orchids_fts_ad', 'orchids_trigram_ad', 'orchids_count_ad', *_CLEAR_TRIGGERS):
+                self.conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+            self.conn.execute("DELETE FROM orchids")
+            self.conn.execute("INSERT INTO orchids_fts (orchids_fts) VALUES ('delete-all')")
+            self.conn.execute("INSERT INTO orchids_trigram (orchids_trigram) VALUES ('delete-all')")
+            self.conn.execute("UPDATE orchid_counts SET value = 0 WHERE name = 'orchids'")
+            self.conn.execute("DELETE FROM orchid_facets")
+            for lookup, junction, _ in MULTIVALUED_COLUMNS.values():
+                self.conn.execute(f"DELETE FROM {junction}")
+                # regions is also the gazetteer, which outlives the data
+                if lookup != 'regions':
+                    self.conn.execute(f"DELETE FROM {lookup}")
+            self.conn.execute(FTS_TRIGGERS['orchids_fts_ad'])
+            self.conn.execute(TRIGRAM_TRIGGERS['orchids_trigram_ad'])
+            self.conn.execute(COUNT_TRIGGERS['orchids_count_ad'])
+            for trigger_sql in _CLEAR_TRIGGERS.values():
+                self.conn.execute(trigger_sql)
+            self.conn.execute("DELETE FROM orchid_similar")
+        self.bump_data_version()
+    
+    def load_data_from_url(self, url: str):
+        """Load CSV data from URL and populate database"""
+        return self.load_data(url)
+    
+    def _bulk_load_pragmas(self) -> Dict[str, object]:
+        """Switch the connection to bulk-load PRAGMAs, returning the previous values"""
+        previous = {
+            name: self.conn.execute(f"PRAGMA {name}").fetchone()[0]
+            for name in BULK_LOAD_PRAGMAS
+        }
+        for name, value in BULK_LOAD_PRAGMAS.items():
+            self.conn.execute(f"PRAGMA {name} = {value}")
+        return previous
+    
+    def _restore_pragmas(self, previous: Dict[str, object]):
+        """Restore PRAGMAs saved by _bulk_load_pragmas"""
+        for name, value in previous.items():
+            if name != 'journal_mode':  # WAL is kept, it is persistent and safe
+                self.conn.execute(f"PRAGMA {name} = {value}")
+    
+    def build_match_expression(self, analysis: QueryAnalysis) -> str:
+        """Turn preprocessed tokens and their synonyms into an FTS5 MATCH expression"""
+        groups = []
+        for token in analysis.text_tokens:
+            terms = []
+            for term in analysis.expanded_terms(token):
+                # Quote every term so FTS5 operators in user input are literal,
+                # and prefix-match it to keep LIKE '%term%' recall on plurals
+                terms.append('"' + term.replace('"', '""') + '"*')
+            groups.append("(" + " OR ".join(terms) + ")")
+        return " OR ".join(groups)
+    
+    def _region_matcher(self) -> RegionMatcher:
+        """Every region name and alias, preprocessed like queries, reloaded when data_version changes"""
+        with self._region_phrases_lock:
+            if self._region_phrases is None or self._region_phrases_version != self.data_version:
+                with self._unbudgeted():
+                    # placed: from the gazetteer (an alias, or a region in its tree)
+                    # rather than a bare Native_Regions value of the data
+                    rows = self._fetchall("""
+                        SELECT name AS phrase, name,
+                               parent_id IS NOT NULL
+                               OR EXISTS (SELECT 1 FROM regions c WHERE c.parent_id = regions.id) AS placed
+                        FROM regions
+                        UNION ALL
+                        SELECT a.alias, r.name, 1 FROM region_aliases a JOIN regions r ON r.id = a.region_id
+                    """)
+                phrases = {}
+                bare_words = set()
+                for row in rows:
+                    phrase = " ".join(self.preprocess_text(row['phrase']))
+                    if not phrase:
+                        continue
+                    phrases.setdefault(phrase, row['name'])
+                    # Single gazetteer words that can't mean anything else name
+                    # their region in lower case too
+                    if (row['placed'] and " " not in phrase and len(phrase) >= MIN_BARE_REGION_WORD
+                            and row['phrase'] not in COMMON_WORD_REGIONS):
+                        bare_words.add(phrase)
+                self._region_phrases = RegionMatcher(phrases, bare_words)
+                self._region_phrases_version = self.data_version
+            return self._region_phrases
+    
+    def _term_vocabulary(self) -> TermVocabulary:
+        """Every word in the FTS index with its document count, reloaded when data_version changes"""
+        with self._vocabulary_lock:
+            if self._vocabulary is None or self._vocabulary_version != self.data_version:
+                with self._unbudgeted():
+                    rows = self._fetchall("SELECT term, doc FROM orchids_fts_vocab")
+                self._vocabulary = TermVocabulary.from_values((row['term'], row['doc']) for row in rows)
+                self._vocabulary_version = self.data_version
+            return self._vocabulary
+    
+    def _name_index(self) -> NameIndex:
+        """Every species, genus and common name, reloaded when data_version changes"""
+        with self._names_lock:
+            if self._names is None or self._names_version != self.data_version:
+                with self.pool.reader() as conn:
+                    self._names = NameIndex.from_connection(conn)
+                self._names_version = self.data_version
+            return self._names
+    
+    @_traced
+    @_cached
+    def suggest(self, prefix: str, k: int = 8) -> List[Tuple[int, str, str]]:
+        """
+        Typeahead: up to k (id, label, kind) names starting with prefix, best first
+        
+        kind is 'species', 'genus' or 'common_name'; id is the species, or
+        the first orchid of a genus or common name. A name matches from its
+        start or from any later word, and ranks by match type, then
+        popularity: a genus by its species, a common name by its orchids.
+        """
+        return self._name_index().suggest(prefix, k)
+    
+    @_traced
+    @_cached
+    def suggest_terms(self, term: str, k: int = 5) -> List[Tuple[str, int, float]]:
+        """Catalog words close to a possibly misspelled term: (word, edit distance, trigram overlap)"""
+        return self._term_vocabulary().suggest(term, k)
+    
+    @_traced
+    def did_you_mean(self, query: str) -> Optional[str]:
+        """The query with words the index doesn't know replaced by their best suggestion, None if all are known"""
+        vocabulary = self._term_vocabulary()
+        stop_words = self.preprocessor.stop_words
+        corrected, changed = query, False
+        for word in dict.fromkeys(fuzzy_words(query)):
+            if word in stop_words or vocabulary.known(word) or vocabulary.known(self.preprocessor.lemmatize(word)):
+                continue
+            suggestions = self.suggest_terms(word, 1)
+            if suggestions:
+                best = suggestions[0][0]
+                corrected = re.sub(rf"\b{re.escape(word)}\b",
+                                   lambda m: best.capitalize() if m.group(0)[0].isupper() else best,
+                                   corrected, flags=re.IGNORECASE)
+                changed = True
+        return corrected if changed else None
+    
+    @_traced
+    @_budgeted
+    @_cached
+    def intelligent_search(self, query: str, limit: int = 50, mode: str = "fts",
+                           columns: Optional[Sequence[str]] = None) -> Union[List[Dict], ResultSet]:
+        """
+        Intelligent semantic search that understands natural language queries
+        Example: "pink fragrant orchids from Southeast Asia"
+        
+        mode="fts" ranks matches on the FTS5 index with weighted bm25(),
+        mode="fuzzy" does the same after correcting misspelled words (see
+        did_you_mean()), mode="like" scans the text columns with LIKE
+        predicates. Regions the query names, such as "Southeast Asia",
+        keep only orchids native to them or to a region under them in the
+        gazetteer; if that leaves nothing, the region words are searched
+        for as text instead. With columns, only those are fetched and a
+        ResultSet is returned.
+        """
+        if not query:
+            return []
+        
+        if mode == "like":
+            return self._like_intelligent_search(query, limit, columns)
+        if mode == "fuzzy":
+            query = self.did_you_mean(query) or query
+        
+        analysis = self.analyze_query(query)
+        if not analysis.tokens:
+            return []
+        
+        select = self._projection(columns, 'o')
+        try:
+            results = self._fetch_results(*self._intelligent_query(analysis, limit, select), columns)
+            if not results and analysis.regions:
+                results = self._fetch_results(
+                    *self._intelligent_query(self._regions_as_text(analysis), limit, select), columns)
+            return results
+        except sqlite3.OperationalError as e:
+            print(f"FTS intelligent search failed: {e}")
+            return self._like_intelligent_search(query, limit, columns)
+    
+    def _intelligent_query(self, analysis: QueryAnalysis, limit: int = 50, select: str = "o.*") -> Tuple[str, List]:
+        """Build the SQL and parameters for the FTS5 path of intelligent_search"""
+        if not analysis.text_tokens:
+            return self._region_query(analysis, limit, select)
+        match_expr = self.build_match_expression(analysis)
+        weights = ", ".join(str(w) for w in FTS_COLUMN_WEIGHTS.values())
+        params = [match_expr, f"bm25({weights})"]
+        
+        # Named regions filter the ranked matches: one probe of the junction
+        # per match and region, so the ranking still stops at the limit
+        region_filter = ""
+        if analysis.regions:
+            region_filter = (f"AND EXISTS (SELECT 1 FROM orchid_region x WHERE x.orchid_id = o.id "
+                             f"AND x.region_id IN ({REGION_IDS_SQL.format(names='?')}))")
+            params += [self._region_names(analysis)] * 2
+        
+        # bm25() is lower-is-better, so flip the sign for relevance_score
+        sql = f"""
+            SELECT {select}, -orchids_fts.rank AS relevance_score
+            FROM orchids_fts
+            JOIN orchids o ON o.id = orchids_fts.rowid
+            WHERE orchids_fts MATCH ? AND orchids_fts.rank MATCH ? {region_filter}
+            ORDER BY orchids_fts.rank
+            LIMIT ?
+        """
+        return sql, params + [limit]
+    
+    def _regions_as_text(self, analysis: QueryAnalysis) -> QueryAnalysis:
+        """The analysis with the regions it names searched for as text, for when they filter out every match"""
+        expansions = dict(analysis.expansions)
+        for token in analysis.regions:
+            expanded = self.synonyms.expand(token)
+            if len(expanded) > 1:
+                expansions[token] = expanded
+        return replace(analysis, expansions=expansions, regions={})
+    
+    def _region_names(self, analysis: QueryAnalysis) -> str:
+        """The regions a query names, as the JSON array REGION_IDS_SQL takes"""
+        return json.dumps(list(dict.fromkeys(analysis.regions.values())))
+    
+    def _region_query(self, analysis: QueryAnalysis, limit: int = 50, select: str = "o.*") -> Tuple[str, List]:
+        """SQL and parameters for a query that only names regions: their orchids, in id order"""
+        names = self._region_names(analysis)
+        sql = f"""
+            SELECT {select}, 0.0 AS relevance_score
+            FROM orchids o
+            WHERE o.id IN (SELECT orchid_id FROM orchid_region WHERE region_id IN ({REGION_IDS_SQL.format(names='?')}))
+            ORDER BY o.id
+            LIMIT ?
+        """
+        return sql, [names, names, limit]
+    
+    def _like_intelligent_search(self, query: str, limit: int = 50,
+                                 columns: Optional[Sequence[str]] = None) -> Union[List[Dict], ResultSet]:
+        """LIKE-scan implementation of intelligent_search"""
+        analysis = self.analyze_query(query)
+        results = self._like_analysis_results(analysis, limit, columns)
+        if not results and analysis.regions:
+            results = self._like_analysis_results(self._regions_as_text(analysis), limit, columns)
+        return results
+    
+    def _like_analysis_results(self, analysis: QueryAnalysis, limit: int,
+                               columns: Optional[Sequence[str]]) -> Union[List[Dict], ResultSet]:
+        windowed = self._budget() is not None
+        query_plan = self._like_intelligent_query(analysis, limit, self._projection(columns, 'o'), windowed)
+        if query_plan is None:
+            return []
+        if windowed and LIKE_WINDOW in query_plan[0]:
+            return self._like_windowed_results(*query_plan, columns)
+        return self._fetch_results(*query_plan, columns)
+    
+    def _like_windowed_results(self, sql: str, params: List,
+                               columns: Optional[Sequence[str]]) -> Union[List[Dict], ResultSet]:
+        """
+        The LIKE path run one id window at a time, merging each window's top rows
+        
+        When the budget runs out, the best rows of the windows that
+        finished are returned, so the lowest ids were searched; with time to
+        spare, the same rows as one statement.
+        """
+        budget = self._budget()
+        limit = params[1]
+        bounds = self._fetchone("SELECT MIN(id) AS low, MAX(id) AS high FROM orchids")
+        names, best = None, []
+        if bounds and bounds['low'] is not None:
+            start, size = bounds['low'] - 1, LIKE_WINDOW_IDS[0]
+            while start < bounds['high']:
+                if budget.expired():
+                    budget.truncated = True
+                    break
+                with self.pool.reader() as conn:
+                    cursor = conn.cursor()
+                    cursor.row_factory = None
+                    try:
+                        rows = self._execute(cursor, sql, params + [start, start + size])
+                        names = names or (cursor.description and [d[0] for d in cursor.description])
+                    finally:
+                        cursor.close()
+                # relevance_score is the last column, id the first
+                best = sorted(best + rows, key=lambda row: (-row[-1], row[0]))
+                if limit >= 0:
+                    best = best[:limit]
+                start, size = start + size, min(size * 2, LIKE_WINDOW_IDS[1])
+        with self.instrumentation.stage("rows"):
+            if columns is None:
+                return [dict(zip(names, row)) for row in best] if names else []
+            return ResultSet(names or ['id'], best, self.table_columns, self._hydrate_rows)
+    
+    def _like_intelligent_query(self, analysis: QueryAnalysis, limit: int = 50, select: str = "o.*",
+                                windowed: bool = False) -> Optional[Tuple[str, List]]:
+        """
+        Build the SQL and parameters for the LIKE path of intelligent_search, None without tokens
+        
+        The SQL text is the same for every query and the parameters are
+        always three, however many tokens, synonyms and regions the query
+        expands to, plus a window's id bounds when windowed. A query naming
+        nothing but regions lists their orchids.
+        """
+        terms = []
+        for token in dict.fromkeys(analysis.text_tokens):
+            terms += [[token, term] for term in dict.fromkeys(analysis.expanded_terms(token))]
+        if not terms:
+            return self._region_query(analysis, limit, select) if analysis.regions else None
+        sql = LIKE_INTELLIGENT_SQL.format(select=select, region_ids=REGION_IDS_SQL.format(names='?3'),
+                                          window=LIKE_WINDOW if windowed else "")
+        return sql, [json.dumps(terms), limit, self._region_names(analysis)]
+        
+    @_traced
+    @_budgeted
+    @_cached
+    def fulltext_search(self, query: str, limit: int = 50,
+                        columns: Optional[Sequence[str]] = None) -> Union[List[Dict], ResultSet]:
+        """Perform full-text search using FTS5 MATCH syntax"""
+        try:
+            query = query.strip()
+            if not query:
+                return []
+            
+            return self._fetch_results(*self._fulltext_query(query, limit, self._projection(columns, 'o')), columns)
+        except sqlite3.OperationalError as e:
+            print(f"FTS search failed: {e}")
+            return self.fallback_search(query, limit, columns)
+    
+    def _fulltext_query(self, query: str, limit: int = 50, select: str = "o.*") -> Tuple[str, List]:
+        """Build the SQL and parameters for fulltext_search"""
+        sql = f"""
+            SELECT {select}
+            FROM orchids o
+            WHERE o.id IN (
+                SELECT rowid FROM orchids_fts 
+                WHERE orchids_fts MATCH ?
+            )
+            LIMIT ?
+        """
+        return sql, [query, limit]
+    
+    def _infix_condition(self, column: str, term: str) -> Tuple[str, List]:
+        """
+        column LIKE '%term%' as a WHERE condition and its parameters
+        
+        For facet columns the pattern is first matched against the distinct
+        values in orchid_facets; the condition becomes an IN list of the
+        values that match, which the planner can answer from the column's
+        B-tree index, and a term no value contains matches nothing at once.
+        """
+        pattern = f"%{term}%"
+        if self.infix_index and column in FACET_COLUMNS:
+            values = [row['value'] for row in self._fetchall(
+                "SELECT value FROM orchid_facets WHERE column_name = ? AND value LIKE ? LIMIT ?",
+                (column, pattern, INFIX_MAX_VALUES + 1)
+            )]
+            if not values:
+                return "0", []
+            if len(values) <= INFIX_MAX_VALUES:
+                return f"{column} IN ({', '.join('?' * len(values))})", values
+        return f"{column} LIKE ?", [pattern]
+    
+    def _trigram_match(self, term: str, columns: Sequence[str] = TRIGRAM_COLUMNS) -> Optional[str]:
+        """Trigram MATCH expression for term as a substring of any of columns, None under 3 characters"""
+        if not self.infix_index or len(term) < 3:
+            return None
+        phrase = '"' + term.replace('"', '""') + '"'
+        if tuple(columns) == TRIGRAM_COLUMNS:
+            return phrase
+        return "{" + " ".join(columns) + "}: " + phrase
+    
+    @_traced
+    @_budgeted
+    def fallback_search(self, query: str, limit: int = 50,
+                        columns: Optional[Sequence[str]] = None) -> Union[List[Dict], ResultSet]:
+        """Fallback search using LIKE when FTS fails"""
+        return self._fetch_results(*self._fallback_query(query, limit, self._projection(columns)), columns)
+    
+    def _fallback_query(self, query: str, limit: int = 50, select: str = "*") -> Tuple[str, List]:
+        """Build the SQL and parameters for fallback_search"""
+        match = self._trigram_match(query, FALLBACK_COLUMNS)
+        if match:
+            # Driven by the trigram index, so LIMIT stops after the first matches
+            sql = f"""
+                SELECT {'orchids.*' if select == '*' else select}
+                FROM (SELECT rowid AS match_id FROM orchids_trigram WHERE orchids_trigram MATCH ?)
+                JOIN orchids ON orchids.id = match_id
+                LIMIT ?
+            """
+            return sql, [match, limit]
+        
+        sql = f"""
+            SELECT {select} FROM orchids 
+            WHERE Scientific_Name LIKE ? 
+               OR Genus LIKE ?
+               OR Flower_Color LIKE ?
+               OR Common_Names LIKE ?
+               OR Native_Regions LIKE ?
+               OR Special_Features LIKE ?
+            LIMIT ?
+        """
+        search_term = f"%{query}%"
+        return sql, [search_term] * 6 + [limit]
+    
+    def _add_value_conditions(self, filters: Dict, conditions: List[str], params: List):
+        """
+        Append flower_color/native_region filter predicates, answered from the junction tables
+        
+        Each filter is one value or a list of them, matched whole but
+        ignoring case: "Pink" matches an orchid listed "White, pink" but
+        not one listed "Hot pink". The lookup's unique index finds the value
+        ids and the junction's (value id, orchid_id) index their orchids.
+        A region also matches every region under it in the gazetteer, and
+        may be given by an alias: "Asia" matches an orchid listed "Borneo".
+        """
+        for name, column in VALUE_FILTERS.items():
+            value = filters.get(name)
+            if not value:
+                continue
+            values = [value] if isinstance(value, str) else list(value)
+            lookup, junction, value_id = MULTIVALUED_COLUMNS[column]
+            if column == 'Native_Regions':
+                names = json.dumps([str(v).strip() for v in values])
+                conditions.append(f"id IN (SELECT orchid_id FROM {junction} WHERE {value_id} IN "
+                                  f"({REGION_IDS_SQL.format(names='?')}))")
+                params.extend([names, names])
+                continue
+            conditions.append(
+                f"id IN (SELECT orchid_id FROM {junction} WHERE {value_id} IN "
+                f"(SELECT id FROM {lookup} WHERE name IN ({', '.join('?' * len(values))})))"
+            )
+            params.extend(str(v).strip() for v in values)
+    
+    def _add_range_conditions(self, filters: Dict, conditions: List[str], params: List):
+        """Append min_*/max_* range filter predicates, e.g. min_temp or max_humidity"""
+        for name, (min_col, max_col) in RANGE_FILTERS.items():
+            if filters.get(f'min_{name}') is not None:
+                conditions.append(f"{min_col} >= ?")
+                params.append(filters[f'min_{name}'])
+            if filters.get(f'max_{name}') is not None:
+                conditions.append(f"{max_col} <= ?")
+                params.append(filters[f'max_{name}'])
+    
+    def _add_category_conditions(self, filters: Dict, conditions: List[str], params: List):
+        """Append the categories filter as one predicate over the category columns"""
+        if filters.get('categories'):
+            condition, condition_params = categories_sql(parse_categories(filters['categories']))
+            conditions.append(condition)
+            params.extend(condition_params)
+    
+    def _bitmap_filter(self, filters: Dict):
+        """The parsed categories filter when the bitmaps can answer filters alone, else None"""
+        if not self.bitmap_index or not filters.get('categories'):
+            return None
+        for name, value in filters.items():
+            # Range bounds filter at 0 too; other filters only when non-empty
+            if name != 'categories' and (value or value is not None and name[:4] in ('min_', 'max_')):
+                return None
+        return parse_categories(filters['categories'])
+    
+    def _bitmap_results(self, tree, limit: int, after_id: int,
+                        columns: Optional[Sequence[str]]) -> Union[List[Dict], ResultSet]:
+        """Rows matching a parsed categories filter, in id order: ids from the bitmaps, rows in one query"""
+        bitmaps = self._category_bitmaps()
+        with self.instrumentation.stage("bitmap"):
+            ids = bitmaps.select(bitmaps.evaluate(tree), limit, after_id)
+        sql = (f"SELECT {self._projection(columns)} FROM orchids "
+               f"WHERE id IN (SELECT value FROM json_each(?)) ORDER BY id")
+        return self._fetch_results(sql, [json.dumps(ids.tolist())], columns)
+    
+    @_traced
+    @_budgeted
+    @_cached
+    def semantic_search(self, limit: int = 50, columns: Optional[Sequence[str]] = None,
+                        **filters) -> Union[List[Dict], ResultSet]:
+        """
+        Search with semantic filters
+        
+        Range filters min_/max_ temp, humidity, light, size and elevation
+        are answered with index range scans; flower_color and native_region
+        (one value or a list) match whole values through the junction tables.
+        categories combines exact values of the category columns with and,
+        or and not (see bitmap.parse_categories); alone, with bitmap_index
+        on, it is answered from the in-memory bitsets.
+        """
+        tree = self._bitmap_filter(filters)
+        if tree is not None:
+            return self._bitmap_results(tree, limit, 0, columns)
+        sql, params = self._semantic_query(limit, self._projection(columns), **filters)
+        return self._fetch_results(sql, params, columns)
+    
+    def _semantic_query(self, limit: int = 50, select: str = "*", **filters) -> Tuple[str, List]:
+        """Build the SQL and parameters for semantic_search"""
+        where_clause, params = self._semantic_conditions(**filters)
+        return f"SELECT {select} FROM orchids WHERE {where_clause} LIMIT ?", params + [limit]
+    
+    def _semantic_conditions(self, **filters) -> Tuple[str, List]:
+        """The WHERE clause and parameters for semantic_search filters"""
+        conditions = []
+        params = []
+        
+        if filters.get('genus'):
+            condition, condition_params = self._infix_condition('Genus', filters['genus'])
+            conditions.append(condition)
+            params.extend(condition_params)
+        
+        self._add_value_conditions(filters, conditions, params)
+        self._add_range_conditions(filters, conditions, params)
+        self._add_category_conditions(filters, conditions, params)
+        
+        # LIKE ignores ASCII case, so "fragrant" also matches "Fragrant"
+        for name, column in (('fragrance', 'Fragrance'), ('difficulty', 'Horticultural_Difficulty')):
+            if filters.get(name):
+                condition, condition_params = self._infix_condition(column, filters[name])
+                conditions.append(condition)
+                params.extend(condition_params)
+            
+        where_clause = " AND ".join(conditions) if conditions else "1=1"
+        return where_clause, params
+    
+    @_traced
+    @_cached
+    def get_facets(self, columns: Optional[List[str]] = None, **filters) -> Dict[str, List[Tuple[str, int]]]:
+        """
+        (value, count) pairs per facet column, most common first
+        
+        Without filters the counts come straight from orchid_facets. With
+        semantic_search filters, the matching rows are read once and grouped
+        for every column in a single statement. Flower_Color and
+        Native_Regions are counted per value, through their junction tables.
+        """
+        columns = list(columns or FACET_COLUMNS)
+        unknown = set(columns) - set(FACET_COLUMNS)
+        if unknown:
+            raise ValueError(f"Not a facet column: {', '.join(sorted(unknown))}")
+        
+        where_clause, params = self._semantic_conditions(**filters)
+        if where_clause == "1=1":
+            rows = self._fetchall(f"""
+                SELECT column_name, value, count FROM orchid_facets
+                WHERE column_name IN ({', '.join('?' * len(columns))})
+                ORDER BY column_name, count DESC, value
+            """, columns)
+        else:
+            grouped = []
+            for c in columns:
+                if c in MULTIVALUED_COLUMNS:
+                    lookup, junction, value_id = MULTIVALUED_COLUMNS[c]
+                    grouped.append(
+                        f"SELECT '{c}' AS column_name, l.name AS value, COUNT(*) AS count FROM matches m "
+                        f"JOIN {junction} j ON j.orchid_id = m.id JOIN {lookup} l ON l.id = j.{value_id} GROUP BY l.id"
+                    )
+                else:
+                    grouped.append(f"SELECT '{c}' AS column_name, {c} AS value, COUNT(*) AS count "
+                                   f"FROM matches WHERE {c} IS NOT NULL GROUP BY {c}")
+            grouped = " UNION ALL ".join(grouped)
+            rows = self._fetchall(f"""
+                WITH matches AS MATERIALIZED (
+                    SELECT {', '.join(['id'] + [c for c in columns if c not in MULTIVALUED_COLUMNS])}
+                    FROM orchids WHERE {where_clause}
+                )
+                SELECT * FROM ({grouped})
+                ORDER BY column_name, count DESC, value
+            """, params)
+        
+        facets = {column: [] for column in columns}
+        for row in rows:
+            facets[row['column_name']].append((row['value'], row['count']))
+        return facets
+    
+    @_traced
+    @_budgeted
+    def semantic_search_with_facets(self, limit: int = 50, columns: Optional[Sequence[str]] = None,
+                                    **filters) -> Tuple[Union[List[Dict], ResultSet], Dict[str, List[Tuple[str, int]]]]:
+        """semantic_search results plus live facet counts over every matching orchid"""
+        return self.semantic_search(limit, columns, **filters), self.get_facets(**filters)
+    
+    @_traced
+    @_budgeted
+    @_cached
+    def semantic_page(self, limit: int = 25, after_id: int = 0, columns: Optional[Sequence[str]] = None,
+                      **filters) -> Union[List[Dict], ResultSet]:
+        """One page of semantic_search matches in id order; pass the last id seen as after_id for the next"""
+        tree = self._bitmap_filter(filters)
+        if tree is not None:
+            return self._bitmap_results(tree, limit, after_id, columns)
+        where_clause, params = self._semantic_conditions(**filters)
+        sql = f"SELECT {self._projection(columns)} FROM orchids WHERE id > ? AND {where_clause} ORDER BY id LIMIT ?"
+        return self._fetch_results(sql, [after_id] + params + [limit], columns)
+    
+    @_traced
+    @_budgeted
+    @_cached
+    def combined_search(self, text_query: str = None, limit: int = 50,
+                        columns: Optional[Sequence[str]] = None, **filters) -> Union[List[Dict], ResultSet]:
+        """Combine full-text search with semantic filters"""
+        sql, params = self._combined_query(text_query, limit, self._projection(columns), **filters)
+        return self._fetch_results(sql, params, columns)
+    
+    def _combined_query(self, text_query: str = None, limit: int = 50, select: str = "*",
+                        **filters) -> Tuple[str, List]:
+        """Build the SQL and parameters for combined_search"""
+        conditions = []
+        params = []
+        
+        source = "orchids"
+        match = self._trigram_match(text_query) if text_query else None
+        if match:
+            # Driven by the trigram index, which covers all seven text columns
+            source = ("(SELECT rowid AS match_id FROM orchids_trigram WHERE orchids_trigram MATCH ?) "
+                      "JOIN orchids ON orchids.id = match_id")
+            params.append(match)
+            if select == "*":
+                select = "orchids.*"
+        elif text_query:
+            text_conditions = []
+            search_term = f"%{text_query}%"
+            text_conditions.append("(Scientific_Name LIKE ? OR Genus LIKE ? OR Flower_Color LIKE ? OR Common_Names LIKE ? OR Native_Regions LIKE ? OR Special_Features LIKE ? OR Fragrance_Description LIKE ?)")
+            params.extend([search_term] * 7)
+            if text_conditions:
+                conditions.append(" OR ".join(text_conditions))
+        
+        if filters.get('genus'):
+            condition, condition_params = self._infix_condition('Genus', filters['genus'])
+            conditions.append(condition)
+            params.extend(condition_params)
+        
+        self._add_value_conditions(filters, conditions, params)
+        
+        if 'fragrance' in filters and filters['fragrance']:
+            conditions.append("(Fragrance LIKE ? OR Fragrance_Description LIKE ?)")
+            params.extend([f"%{filters['fragrance']}%", f"%{filters['fragrance']}%"])
+        
+        self._add_range_conditions(filters, conditions, params)
+        self._add_category_conditions(filters, conditions, params)
+        
+        if filters.get('difficulty'):
+            condition, condition_params = self._infix_condition('Horticultural_Difficulty', filters['difficulty'])
+            conditions.append(condition)
+            params.extend(condition_params)
+        
+        base_query = f"SELECT {select} FROM {source} WHERE 1=1"
+        if conditions:
+            base_query += " AND (" + " AND ".join(conditions) + ")"
+        
+        base_query += f" LIMIT ?"
+        params.append(limit)
+        
+        return base_query, params
+    
+    def _plan_search(self, mode: str, query, limit: int,
+                     columns: Optional[Sequence[str]]) -> Optional[SearchPlan]:
+        """The SearchPlan a batch_search query runs, None when it can't match anything"""
+        if mode in ('semantic', 'combined'):
+            filters = dict(query or {})
+            if mode == 'semantic':
+                sql, params = self._semantic_query(limit, self._projection(columns), **filters)
+            else:
+                text_query = filters.pop('text_query', None)
+                sql, params = self._combined_query(text_query, limit, self._projection(columns), **filters)
+            return SearchPlan(sql, tuple(params))
+        
+        if mode == 'fulltext':
+            query = (query or "").strip()
+            if not query:
+                return None
+            sql, params = self._fallback_query(query, limit, self._projection(columns))
+            fallback = SearchPlan(sql, tuple(params))
+            sql, params = self._fulltext_query(query, limit, self._projection(columns, 'o'))
+            return SearchPlan(sql, tuple(params), fallback)
+        
+        if not query:
+            return None
+        if mode == 'fuzzy':
+            query = self.did_you_mean(query) or query
+        analysis = self.analyze_query(query)
+        if not analysis.tokens:
+            return None
+        return self._analysis_plan(analysis, mode, limit, columns)
+    
+    def _analysis_plan(self, analysis: QueryAnalysis, mode: str, limit: int,
+                       columns: Optional[Sequence[str]]) -> SearchPlan:
+        """Plan of intelligent_search for an analysis, searching its regions as text if they leave nothing"""
+        text_plan = text_like_plan = None
+        if analysis.regions:
+            text_plan = self._analysis_plan(self._regions_as_text(analysis), mode, limit, columns)
+            text_like_plan = text_plan if mode == 'like' else text_plan.fallback
+        sql, params = self._like_intelligent_query(analysis, limit, self._projection(columns, 'o'))
+        like_plan = SearchPlan(sql, tuple(params), if_empty=text_like_plan)
+        if mode == 'like':
+            return like_plan
+        sql, params = self._intelligent_query(analysis, limit, self._projection(columns, 'o'))
+        return SearchPlan(sql, tuple(params), like_plan, text_plan)
+    
+    def _run_plans(self, plans: Sequence[SearchPlan]) -> List[PlanResult]:
+        """Execute plans one after another on a single pooled read connection"""
+        with self.pool.reader() as conn:
+            return [execute_plan(conn, plan) for plan in plans]
+    
+    def _plan_results(self, names: List[str], rows: List[tuple],
+                      columns: Optional[Sequence[str]]) -> Union[List[Dict], ResultSet]:
+        """Row dicts, or a projected ResultSet with columns, from an executed plan"""
+        if columns is None:
+            return [dict(zip(names, row)) for row in rows]
+        return ResultSet(names, rows, self.table_columns, self._hydrate_rows)
+    
+    def iter_batch_search(self, queries: Sequence, mode: str = "fts", limit: int = 50,
+                          columns: Optional[Sequence[str]] = None, workers: int = 1,
+                          executor: str = "thread") -> Iterator[Tuple[int, Union[List[Dict], ResultSet]]]:
+        """
+        Run many searches, yielding (query position, results) as each completes
+        
+        Queries are strings for the intelligent_search modes fts, fuzzy and
+        like and for fulltext; semantic takes dicts of semantic_search
+        filters and combined the same with an optional text_query key.
+        Identical normalized queries, and queries that compile to the same
+        SQL, are preprocessed, planned and executed once. The plans run on
+        `workers` threads sharing the read pool, or with executor="process"
+        on worker processes with a read-only connection each. Results
+        bypass the query cache.
+        """
+        if mode not in BATCH_MODES:
+            raise ValueError(f"Unknown batch search mode: {mode}")
+        if executor == "process" and self.pool.in_memory:
+            raise ValueError("Worker processes need a database file, not an in-memory database")
+        if executor == "thread":
+            workers = min(workers, max(self.pool.size, 1))
+        
+        # One preprocessing and planning pass over the distinct queries
+        lowercase = mode in ('fts', 'fuzzy', 'like')
+        planned: Dict = {}
+        plan_index: Dict[Tuple, int] = {}
+        plans: List[SearchPlan] = []
+        waiting: List[List[int]] = []
+        for position, query in enumerate(queries):
+            normalized = _freeze(query.lower() if lowercase and isinstance(query, str) else query)
+            if normalized not in planned:
+                plan = self._plan_search(mode, query, limit, columns)
+                if plan is not None and plan.key not in plan_index:
+                    plan_index[plan.key] = len(plans)
+                    plans.append(plan)
+                    waiting.append([])
+                planned[normalized] = plan_index[plan.key] if plan is not None else None
+            if planned[normalized] is None:
+                yield position, []
+            else:
+                waiting[planned[normalized]].append(position)
+        
+        for index, (names, rows) in run_plans(plans, self._run_plans, self.db_path, workers, executor):
+            results = self._plan_results(names, rows, columns)
+            for position in waiting[index]:
+                # Duplicates get their own list so callers can't reorder each other's
+                yield position, list(results) if isinstance(results, list) else results
+    
+    @_traced
+    def batch_search(self, queries: Sequence, mode: str = "fts", limit: int = 50,
+                     columns: Optional[Sequence[str]] = None, workers: int = 1,
+                     executor: str = "thread") -> List[Union[List[Dict], ResultSet]]:
+        """Results of many searches in input order; see iter_batch_search() for the arguments"""
+        queries = list(queries)
+        results: List = [None] * len(queries)
+        for position, result in self.iter_batch_search(queries, mode, limit, columns, workers, executor):
+            results[position] = result
+        return results
+    
+    def _environment_scorer(self) -> EnvironmentScorer:
+        """The scorer for the current data_version, loading its arrays on first use"""
+        with self._scorer_lock:
+            if self._scorer is None or self._scorer_version != self.data_version:
+                with self.pool.reader() as conn:
+                    self._scorer = EnvironmentScorer.from_connection(conn)
+                self._scorer_version = self.data_version
+            return self._scorer
+    
+    def _category_bitmaps(self) -> BitmapIndex:
+        """The category bitsets for the current data_version, building them on first use"""
+        with self._bitmaps_lock:
+            if self._bitmaps is None or self._bitmaps_version != self.data_version:
+                with self.pool.reader() as conn:
+                    self._bitmaps = BitmapIndex.from_connection(conn)
+                self._bitmaps_version = self.data_version
+            return self._bitmaps
+    
+    @_traced
+    @_cached
+    def category_facets(self, categories=None,
+                        columns: Optional[Sequence[str]] = None) -> Dict[str, List[Tuple[str, int]]]:
+        """
+        (value, count) pairs per category column among orchids matching categories, most common first
+        
+        With bitmap_index on, the counts are popcounts of each value's
+        bitset against the filter's; otherwise one GROUP BY per column.
+        """
+        columns = list(columns or CATEGORY_COLUMNS)
+        unknown = set(columns) - set(CATEGORY_COLUMNS)
+        if unknown:
+            raise ValueError(f"Not a category column: {', '.join(sorted(unknown))}")
+        tree = parse_categories(categories) if categories else None
+        
+        if self.bitmap_index:
+            bitmaps = self._category_bitmaps()
+            with self.instrumentation.stage("bitmap"):
+                words = bitmaps.evaluate(tree) if tree is not None else None
+                return bitmaps.facet_counts(words, columns)
+        
+        where_clause, params = categories_sql(tree) if tree is not None else ("1", [])
+        grouped = " UNION ALL ".join(
+            f"SELECT '{c}' AS column_name, {c} AS value, COUNT(*) AS count "
+            f"FROM matches WHERE {c} IS NOT NULL GROUP BY {c}"
+            for c in columns
+        )
+        rows = self._fetchall(f"""
+            WITH matches AS MATERIALIZED (SELECT {', '.join(columns)} FROM orchids WHERE {where_clause})
+            SELECT * FROM ({grouped})
+            ORDER BY column_name, count DESC, value
+        """, params)
+        facets = {column: [] for column in columns}
+        for row in rows:
+            facets[row['column_name']].append((row['value'], row['count']))
+        return facets
+    
+    def bitmap_memory(self) -> Dict:
+        """Rows, bytes and per-column dense/sparse value counts of the category bitsets, building them if needed"""
+        return self._category_bitmaps().memory()
+    
+    @_traced
+    @_cached
+    def recommend_for_environment(self, user_temp: float, humidity: float, light_fc: float,
+                                  skill: str = "beginner", k: int = 10) -> List[Dict]:
+        """
+        Top-k orchids for a grower's temperature, humidity, light and skill
+        
+        Every species is scored in one vectorized pass; each result carries
+        its 0-100 match_score.
+        """
+        ids, scores = self._environment_scorer().recommend(user_temp, humidity, light_fc, skill, k)
+        results = self.fetch_by_ids(ids.tolist())
+        score_by_id = dict(zip(ids.tolist(), scores.tolist()))
+        for row in results:
+            row['match_score'] = round(score_by_id[row['id']], 1)
+        return results
+    
+    @_writes
+    def build_similarity_index(self, k: int = 10, workers: int = 1) -> int:
+        """
+        Precompute the k most similar orchids of every species into orchid_similar
+        
+        An offline step: rows loaded or changed afterwards keep their old
+        neighbors until the index is rebuilt. workers > 1 scores blocks of
+        the catalog in that many processes.
+        """
+        start = time.perf_counter()
+        features = SimilarityFeatures.from_connection(self.conn)
+        neighbors = build_neighbors(features, k=k, workers=workers)
+        with self.conn:
+            self.conn.execute("DELETE FROM orchid_similar")
+            self.conn.executemany("INSERT INTO orchid_similar VALUES (?, ?, ?, ?)", neighbors)
+        self.bump_data_version()
+        
+        elapsed = time.perf_counter() - start
+        print(f"Built similarity index for {len(features)} orchids (k={k}) in {elapsed:.2f}s")
+        return len(neighbors)
+    
+    @_traced
+    @_cached
+    def similar_orchids(self, orchid_id: int, k: int = 5) -> List[Dict]:
+        """The k most similar species from the precomputed index, each with its 0-1 similarity"""
+        return self._fetchall("""
+            SELECT o.*, s.score AS similarity
+            FROM orchid_similar s
+            JOIN orchids o ON o.id = s.neighbor_id
+            WHERE s.orchid_id = ?
+            ORDER BY s.rank
+            LIMIT ?
+        """, (orchid_id, k))
+    
+    @_traced
+    def get_statistics(self) -> Dict:
+        """Get database statistics"""
+        distinct = {
+            row['column_name']: row['count']
+            for row in self._fetchall("SELECT column_name, COUNT(*) AS count FROM orchid_facets GROUP BY column_name")
+        }
+        
+        stats = {}
+        
+        stats['total'] = self.count()
+        stats['genera'] = distinct.get('Genus', 0)
+        stats['colors'] = distinct.get('Flower_Color', 0)
+        stats['regions'] = distinct.get('Native_Regions', 0)
+        
+        return stats
+    
+    @_traced
+    @_cached
+    def resolve_regions(self, names: Union[str, Sequence[str]]) -> List[str]:
+        """Every region the names or aliases pick out, with all the regions under them, sorted"""
+        names = [names] if isinstance(names, str) else list(names)
+        names_json = json.dumps([str(n).strip() for n in names])
+        rows = self._fetchall(
+            f"SELECT name FROM regions WHERE id IN ({REGION_IDS_SQL.format(names='?')}) ORDER BY name",
+            (names_json, names_json)
+        )
+        return [row['name'] for row in rows]
+    
+    @_writes
+    def load_gazetteer(self, source: Union[str, Gazetteer]) -> int:
+        """
+        Merge a region gazetteer from a JSON file or a Gazetteer, returning its size
+        
+        Regions already known move under their new parent, new ones are
+        added and region_closure is rebuilt, all in one transaction. See
+        Gazetteer.from_file() for the file format.
+        """
+        gazetteer = source if isinstance(source, Gazetteer) else Gazetteer.from_file(source)
+        with self.conn:
+            self.conn.execute("BEGIN")
+            self._apply_gazetteer(self.conn.cursor(), gazetteer)
+        self.bump_data_version()
+        return len(gazetteer)
+    
+    def get_unique_values(self, column: str) -> List[str]:
+        """Get unique values for a column, from the facet or lookup table where there is one"""
+        if column in FACET_COLUMNS:
+            rows = self._fetchall("SELECT value FROM orchid_facets WHERE column_name = ? ORDER BY value", (column,))
+            return [row['value'] for row in rows]
+        if column in MULTIVALUED_COLUMNS:
+            lookup, junction, value_id = MULTIVALUED_COLUMNS[column]
+            rows = self._fetchall(f"""
+                SELECT name AS value FROM {lookup}
+                WHERE EXISTS (SELECT 1 FROM {junction} WHERE {value_id} = {lookup}.id)
+                ORDER BY name
+            """)
+            return [row['value'] for row in rows]
+        rows = self._fetchall(f"SELECT DISTINCT {column} AS value FROM orchids WHERE {column} IS NOT NULL ORDER BY {column}")
+        return [row['value'] for row in rows]
+    
+    def explain_query_plan(self, sql: str, params=()) -> List[str]:
+        """The EXPLAIN QUERY PLAN detail lines for a query"""
+        return [row['detail'] for row in self._fetchall(f"EXPLAIN QUERY PLAN {sql}", params)]
+    
+    def count(self) -> int:
+        """Number of orchids in the database, from the trigger-maintained total"""
+        row = self._fetchone("SELECT value FROM orchid_counts WHERE name = 'orchids'")
+        return row['value'] if row else 0
+    
+    def get_page(self, sort_col: str, order: str = "ASC", limit: int = 25, offset: int = 0) -> List[Dict]:
+        """One page of orchids by LIMIT/OFFSET; browse_page() keeps deep pages cheap"""
+        if sort_col not in SORTABLE_COLUMNS:
+            raise ValueError(f"Cannot sort by {sort_col}")
+        order = "DESC" if order.upper() == "DESC" else "ASC"
+        return self._fetchall(f"SELECT * FROM orchids ORDER BY {sort_col} {order} LIMIT ? OFFSET ?",
+                              (limit, offset))
+    
+    def _seek(self, sort_col: str, descending: bool, key: Optional[Tuple], limit: int) -> List[Dict]:
+        """Up to limit rows after key in (sort_col, id) order, each step an index seek"""
+        rows = []
+        for where, params, order_by in seek_steps(sort_col, descending, key):
+            rows += self._fetchall(f"SELECT * FROM orchids WHERE {where} ORDER BY {order_by} LIMIT ?",
+                                   (*params, limit - len(rows)))
+            if len(rows) >= limit:
+                break
+        return rows
+    
+    @_traced
+    def browse_page(self, sort_col: str = "Scientific_Name", order: str = "ASC", limit: int = 25,
+                    cursor: Optional[str] = None) -> Page:
+        """
+        One Browse page by keyset pagination over (sort_col, id)
+        
+        Pass a page's next_cursor or prev_cursor to move between pages; any
+        page costs one or two index seeks, however deep it is.
+        """
+        if sort_col not in SORTABLE_COLUMNS:
+            raise ValueError(f"Cannot sort by {sort_col}")
+        order = "DESC" if order.upper() == "DESC" else "ASC"
+        descending = order == "DESC"
+        
+        direction, key = "next", None
+        if cursor:
+            payload = decode_cursor(cursor)
+            if (payload['c'], payload['o']) != (sort_col, order):
+                raise ValueError("Cursor was issued for a different sort order")
+            direction, key = payload['d'], tuple(payload['k'])
+        
+        if direction == "prev":
+            rows = self._seek(sort_col, not descending, key, limit + 1)
+            if len(rows) <= limit:
+                # Ran into the start: show a full first page instead of a short one
+                return self.browse_page(sort_col, order, limit)
+            rows = rows[:limit][::-1]
+            return Page(rows,
+                        next_cursor=encode_cursor(sort_col, order, "next", rows[-1]),
+                        prev_cursor=encode_cursor(sort_col, order, "prev", rows[0]))
+        
+        rows = self._seek(sort_col, descending, key, limit + 1)
+        has_next = len(rows) > limit
+        rows = rows[:limit]
+        return Page(rows,
+                    next_cursor=encode_cursor(sort_col, order, "next", rows[-1]) if has_next else None,
+                    prev_cursor=encode_cursor(sort_col, order, "prev", rows[0]) if key and rows else None)
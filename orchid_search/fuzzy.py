@@ -0,0 +1,95 @@
+import bisect
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+_WORD_RE = re.compile(r"[^\W\d_]{3,}")
+
+
+def words(text: str) -> List[str]:
+    """Lowercased words of three or more letters"""
+    return _WORD_RE.findall(text.lower())
+
+
+def trigrams(word: str) -> Set[str]:
+    """Character trigrams of a word padded with spaces, so starts and ends count too"""
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a: str, b: str, limit: Optional[int] = None) -> int:
+    """Levenshtein distance, giving up with limit + 1 once it must exceed limit"""
+    if abs(len(a) - len(b)) > (limit if limit is not None else len(a) + len(b)):
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if limit is not None and min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class TermVocabulary:
+    """
+    Known words with an in-memory trigram index for "did you mean" suggestions
+
+    Candidates are the words sharing the most trigrams with the term
+    (Dice overlap); the best are re-ranked by edit distance, then overlap,
+    then how often the word occurs in the catalog.
+    """
+
+    def __init__(self, counts: Dict[str, int]):
+        self.counts = counts
+        self._sorted = sorted(counts)
+        self._index: Dict[str, List[str]] = defaultdict(list)
+        for word in counts:
+            for gram in trigrams(word):
+                self._index[gram].append(word)
+
+    @classmethod
+    def from_values(cls, values: Iterable[Tuple[str, int]]) -> "TermVocabulary":
+        """Build from (text, occurrences) pairs, e.g. distinct column values and their counts"""
+        counts: Dict[str, int] = defaultdict(int)
+        for text, count in values:
+            if text:
+                for word in words(text):
+                    counts[word] += count
+        return cls(dict(counts))
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def __contains__(self, word: str) -> bool:
+        return word.lower() in self.counts
+
+    def known(self, word: str) -> bool:
+        """Whether the word, or a longer word it is a prefix of, is in the vocabulary"""
+        word = word.lower()
+        if word in self.counts:
+            return True
+        i = bisect.bisect_left(self._sorted, word)
+        return i < len(self._sorted) and self._sorted[i].startswith(word)
+
+    def suggest(self, term: str, k: int = 5, candidates: int = 50) -> List[Tuple[str, int, float]]:
+        """Up to k (word, edit distance, trigram overlap) for a term, best first"""
+        term = term.lower()
+        grams = trigrams(term)
+        shared: Dict[str, int] = defaultdict(int)
+        for gram in grams:
+            for word in self._index.get(gram, ()):
+                shared[word] += 1
+        overlap = {word: 2 * n / (len(grams) + len(trigrams(word))) for word, n in shared.items()}
+        best = sorted(overlap, key=overlap.get, reverse=True)[:candidates]
+
+        # Typos worth correcting: about one edit per four letters
+        limit = max(1, len(term) // 4)
+        ranked = []
+        for word in best:
+            distance = edit_distance(term, word, limit)
+            if distance <= limit:
+                ranked.append((word, distance, overlap[word]))
+        ranked.sort(key=lambda r: (r[1], -r[2], -self.counts[r[0]]))
+        return ranked[:k]
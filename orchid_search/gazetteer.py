@@ -0,0 +1,200 @@
+import json
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Default region tree: name -> sub-regions. Each place has one parent, so
+# an island split between countries sits under the one most orchids cite.
+DEFAULT_REGION_TREE = {
+    'Asia': {
+        'Southeast Asia': {
+            'Philippines': {'Luzon': {}, 'Mindanao': {}, 'Palawan': {}},
+            'Indonesia': {'Sumatra': {}, 'Java': {}, 'Sulawesi': {}, 'Kalimantan': {}, 'Moluccas': {}},
+            'Malaysia': {'Borneo': {'Sabah': {}, 'Sarawak': {}}, 'Peninsular Malaysia': {}},
+            'Thailand': {}, 'Vietnam': {}, 'Myanmar': {}, 'Laos': {}, 'Cambodia': {}, 'Brunei': {},
+        },
+        'East Asia': {'China': {'Yunnan': {}, 'Hainan': {}}, 'Japan': {'Okinawa': {}}, 'Taiwan': {}, 'Korea': {}},
+        'South Asia': {
+            'India': {'Sikkim': {}, 'Assam': {}, 'Western Ghats': {}},
+            'Himalayas': {}, 'Nepal': {}, 'Bhutan': {}, 'Sri Lanka': {}, 'Bangladesh': {},
+        },
+    },
+    'Oceania': {
+        'Papua New Guinea': {'New Guinea': {}}, 'Australia': {'Queensland': {}},
+        'New Caledonia': {}, 'Fiji': {}, 'Solomon Islands': {}, 'Vanuatu': {},
+    },
+    'Americas': {
+        'North America': {'United States': {'Florida': {}, 'Hawaii': {}}, 'Canada': {}},
+        'Central America': {
+            'Mexico': {'Chiapas': {}, 'Oaxaca': {}}, 'Guatemala': {}, 'Belize': {}, 'Honduras': {},
+            'El Salvador': {}, 'Nicaragua': {}, 'Costa Rica': {}, 'Panama': {},
+        },
+        'Caribbean': {'Cuba': {}, 'Jamaica': {}, 'Hispaniola': {}, 'Puerto Rico': {}, 'Trinidad': {}},
+        'South America': {
+            'Andes': {'Colombia': {}, 'Ecuador': {}, 'Peru': {}, 'Bolivia': {}, 'Venezuela': {}},
+            'Brazil': {'Atlantic Forest': {}, 'Amazonia': {}},
+            'Guianas': {'Guyana': {}, 'Suriname': {}, 'French Guiana': {}},
+            'Argentina': {}, 'Paraguay': {}, 'Chile': {},
+        },
+    },
+    'Africa': {
+        'East Africa': {'Kenya': {}, 'Tanzania': {}, 'Uganda': {}, 'Ethiopia': {}},
+        'Indian Ocean Islands': {'Madagascar': {}, 'Comoros': {}, 'Reunion': {}, 'Mauritius': {}, 'Seychelles': {}},
+        'West Africa': {'Ghana': {}, 'Nigeria': {}, 'Cameroon': {}},
+        'Southern Africa': {'South Africa': {}, 'Zimbabwe': {}},
+    },
+    'Europe': {'Mediterranean': {}, 'Alps': {}},
+}
+
+# Other names for regions: alias -> region name. Words that mean other
+# things in a query, like "us", "America" for the United States or
+# "Amazon" for the river, are left out.
+DEFAULT_REGION_ALIASES = {
+    'SE Asia': 'Southeast Asia',
+    'South East Asia': 'Southeast Asia',
+    'Indochina': 'Southeast Asia',
+    'Himalaya': 'Himalayas',
+    'New World': 'Americas',
+    'Latin America': 'Americas',
+    'Mesoamerica': 'Central America',
+    'West Indies': 'Caribbean',
+    'USA': 'United States',
+    'PNG': 'Papua New Guinea',
+    'Melanesia': 'Oceania',
+}
+
+# Single-word region names that are also ordinary words, so they only name
+# a region when capitalized in a query: "china" orchids may be porcelain
+# white, "mediterranean" a climate.
+COMMON_WORD_REGIONS = frozenset({'China', 'Chile', 'Java', 'Panama', 'Reunion', 'Mediterranean'})
+
+# Shortest single word that names a region in lower case; shorter ones,
+# like "usa", must be written as names
+MIN_BARE_REGION_WORD = 4
+
+
+class Gazetteer:
+    """
+    A region tree, as each region's parent, plus aliases for region names
+
+    Regions are ordered parents first, so they can be written to the
+    database in one pass. A parent without an entry of its own is left
+    where it is when the gazetteer is merged into a database, or made a
+    root if it is new. The tree is checked for cycles on construction.
+    """
+
+    def __init__(self, parents: Dict[str, Optional[str]], aliases: Optional[Dict[str, str]] = None):
+        self.parents = dict(parents)
+        self.aliases = dict(aliases or {})
+        self.order = self._parents_first()
+        unknown = sorted(set(self.aliases.values()) - set(self.order))
+        if unknown:
+            raise ValueError(f"Aliases for regions not in the gazetteer: {', '.join(unknown)}")
+
+    @classmethod
+    def from_tree(cls, tree: Dict[str, dict], aliases: Optional[Dict[str, str]] = None) -> "Gazetteer":
+        """A gazetteer from nested {name: {child: {...}}} dicts"""
+        parents = {}
+        stack = [(None, tree)]
+        while stack:
+            parent, children = stack.pop()
+            for name, grandchildren in children.items():
+                if name in parents:
+                    raise ValueError(f"Region {name!r} appears twice in the tree")
+                parents[name] = parent
+                stack.append((name, grandchildren))
+        return cls(parents, aliases)
+
+    @classmethod
+    def from_file(cls, path: str) -> "Gazetteer":
+        """
+        A gazetteer from a JSON file
+
+        Either {"tree": {name: {child: {...}}}} or {"regions": [{"name": ...,
+        "parent": ..., "aliases": [...]}]}, with an optional "aliases"
+        object of alias -> region name in both cases.
+        """
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        aliases = dict(data.get('aliases', {}))
+        if 'tree' in data:
+            return cls.from_tree(data['tree'], aliases)
+        parents = {}
+        for region in data.get('regions', []):
+            parents[region['name']] = region.get('parent')
+            aliases.update({alias: region['name'] for alias in region.get('aliases', [])})
+        return cls(parents, aliases)
+
+    @classmethod
+    def default(cls) -> "Gazetteer":
+        return cls.from_tree(DEFAULT_REGION_TREE, DEFAULT_REGION_ALIASES)
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def _parents_first(self) -> List[str]:
+        order = []
+        placed = set()
+        for name in self.parents:
+            path = []
+            node = name
+            while node is not None and node not in placed:
+                if node in path:
+                    raise ValueError(f"Region {node!r} is its own ancestor")
+                path.append(node)
+                node = self.parents.get(node)
+            for node in reversed(path):
+                order.append(node)
+                placed.add(node)
+        return order
+
+    def edges(self) -> Iterable[Tuple[str, Optional[str]]]:
+        """(region, parent) pairs of the regions with an entry, parents first"""
+        return ((name, self.parents[name]) for name in self.order if name in self.parents)
+
+
+class RegionMatcher:
+    """
+    Finds region names among query tokens, longest phrase first
+
+    Built from {phrase: region name}, where a phrase is a name or alias
+    preprocessed the same way as queries, so "philippines" in a query
+    meets "Philippines" however the lemmatizer treats it. Phrases of
+    several words always match. A single word only matches if it is in
+    bare_words, the names safe to take as regions in any case, or was
+    capitalized in the query, so "easy orchids for us" names no region
+    but "orchids of Java" does.
+    """
+
+    def __init__(self, phrases: Dict[str, str], bare_words: Iterable[str] = ()):
+        self.phrases = phrases
+        self.bare_words = frozenset(bare_words)
+        self._max_phrase = max((len(p.split()) for p in phrases), default=1)
+
+    def __len__(self) -> int:
+        return len(self.phrases)
+
+    def match(self, tokens: Sequence[str],
+              capitalized: Iterable[str] = ()) -> Tuple[List[str], Dict[str, str]]:
+        """
+        Tokens with region phrases merged into one token each, and token -> region name for those
+
+        capitalized holds the tokens that were capitalized in the query.
+        """
+        capitalized = frozenset(capitalized)
+        merged = []
+        regions = {}
+        i = 0
+        while i < len(tokens):
+            for length in range(min(self._max_phrase, len(tokens) - i), 0, -1):
+                phrase = " ".join(tokens[i:i + length])
+                if phrase not in self.phrases:
+                    continue
+                if length == 1 and phrase not in self.bare_words and phrase not in capitalized:
+                    continue
+                merged.append(phrase)
+                regions[phrase] = self.phrases[phrase]
+                i += length
+                break
+            else:
+                merged.append(tokens[i])
+                i += 1
+        return merged, regions
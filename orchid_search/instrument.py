@@ -0,0 +1,268 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from logging.handlers import RotatingFileHandler
+from typing import Any, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Returned by stage() while nothing is being traced, so disabled hooks cost one call
+_NULL_STAGE = nullcontext()
+
+# Longest argument repr kept in a call description
+_MAX_ARG_CHARS = 80
+
+
+@dataclass
+class StatementTrace:
+    """One SQL statement run inside a trace"""
+    sql: str
+    param_count: int
+    ms: float
+    rows: int
+    plan: Optional[List[str]] = None
+
+
+@dataclass
+class QueryTrace:
+    """
+    Timings of one traced call, e.g. a search method or a whole tab render
+
+    stages holds exclusive milliseconds per stage: while a nested stage
+    runs, the enclosing one's clock is paused, so the stages add up to
+    total_ms. Time outside any stage goes to the trace's remainder stage.
+    """
+    name: str
+    started: float
+    remainder: str = "other"
+    total_ms: float = 0.0
+    stages: Dict[str, float] = field(default_factory=dict)
+    calls: List[str] = field(default_factory=list)
+    statements: List[StatementTrace] = field(default_factory=list)
+    cache_hits: int = 0
+    cache_misses: int = 0
+
+    def __post_init__(self):
+        self._stack: List[list] = []
+
+    @property
+    def sql_ms(self) -> float:
+        return sum(s.ms for s in self.statements)
+
+    @property
+    def param_count(self) -> int:
+        return sum(s.param_count for s in self.statements)
+
+    def _push(self, stage: str):
+        now = time.perf_counter()
+        if self._stack:
+            top = self._stack[-1]
+            self.stages[top[0]] = self.stages.get(top[0], 0.0) + (now - top[1]) * 1000
+        self._stack.append([stage, now])
+
+    def _pop(self) -> float:
+        now = time.perf_counter()
+        stage, start = self._stack.pop()
+        elapsed = (now - start) * 1000
+        self.stages[stage] = self.stages.get(stage, 0.0) + elapsed
+        if self._stack:
+            self._stack[-1][1] = now
+        return elapsed
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'started': self.started,
+            'total_ms': round(self.total_ms, 3),
+            'stages': {name: round(ms, 3) for name, ms in self.stages.items()},
+            'calls': self.calls,
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+            'statements': [
+                {'sql': s.sql, 'param_count': s.param_count, 'ms': round(s.ms, 3), 'rows': s.rows, 'plan': s.plan}
+                for s in self.statements
+            ],
+        }
+
+
+class _Stage:
+    __slots__ = ('trace', 'name')
+
+    def __init__(self, trace: QueryTrace, name: str):
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self):
+        self.trace._push(self.name)
+
+    def __exit__(self, *exc):
+        self.trace._pop()
+
+
+class _Statement:
+    """Times one statement as the "sql" stage and records it, with its plan if asked for"""
+    __slots__ = ('instrumentation', 'trace', 'conn', 'sql', 'params', 'rows')
+
+    def __init__(self, instrumentation: "Instrumentation", trace: QueryTrace,
+                 conn: sqlite3.Connection, sql: str, params):
+        self.instrumentation = instrumentation
+        self.trace = trace
+        self.conn = conn
+        self.sql = sql
+        self.params = params
+        self.rows = 0
+
+    def __enter__(self) -> "_Statement":
+        self.trace._push("sql")
+        return self
+
+    def __exit__(self, *exc):
+        ms = self.trace._pop()
+        plan = None
+        if self.instrumentation.explain and not self.sql.lstrip().upper().startswith(("EXPLAIN", "PRAGMA")):
+            self.trace._push("explain")
+            try:
+                plan = [row[3] for row in self.conn.execute(f"EXPLAIN QUERY PLAN {self.sql}", self.params)]
+            except sqlite3.Error:
+                pass
+            finally:
+                self.trace._pop()
+        self.trace.statements.append(
+            StatementTrace(" ".join(self.sql.split()), len(self.params), ms, self.rows, plan)
+        )
+
+
+class Instrumentation:
+    """
+    Hook-based tracing of OrchidSearchDB calls and the UI around them
+
+    A trace is opened by the outermost traced call on a thread; calls,
+    stages and SQL statements inside it are attributed to it. Finished
+    traces are kept in a ring of the last `history`, and those taking
+    slow_ms or longer are written as JSON lines to a rotating slow-query
+    log (or to this module's logger when no path is given). explain=True
+    also records each statement's EXPLAIN QUERY PLAN. While disabled,
+    every hook returns after one attribute check.
+    """
+
+    def __init__(self, enabled: bool = False, history: int = 50, slow_ms: Optional[float] = None,
+                 slow_log_path: Optional[str] = None, explain: bool = False,
+                 max_log_bytes: int = 1 << 20, log_backups: int = 3):
+        self.enabled = enabled
+        self.slow_ms = slow_ms
+        self.explain = explain
+        self._history = deque(maxlen=history)
+        self._history_lock = threading.Lock()
+        self._local = threading.local()
+        self._slow_handler = None
+        if slow_log_path:
+            self._slow_handler = RotatingFileHandler(slow_log_path, maxBytes=max_log_bytes,
+                                                     backupCount=log_backups, encoding="utf-8", delay=True)
+            self._slow_handler.setFormatter(logging.Formatter("%(message)s"))
+
+    @property
+    def current(self) -> Optional[QueryTrace]:
+        """The trace open on this thread, if any"""
+        return getattr(self._local, 'trace', None) if self.enabled else None
+
+    def trace(self, name: str, call: Optional[str] = None, remainder: str = "other"):
+        """Context manager tracing a block; nested inside another trace it only records call"""
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Trace(self, name, call, remainder)
+
+    def stage(self, name: str):
+        """Context manager timing a block as a stage of the current trace"""
+        trace = self.current
+        return _NULL_STAGE if trace is None else _Stage(trace, name)
+
+    def statement(self, conn: sqlite3.Connection, sql: str, params) -> Optional[_Statement]:
+        """Context manager recording one SQL statement, None while nothing is traced"""
+        trace = self.current
+        return None if trace is None else _Statement(self, trace, conn, sql, params)
+
+    def count_cache(self, hit: bool):
+        """Count a query cache lookup against the current trace"""
+        trace = self.current
+        if trace is not None:
+            if hit:
+                trace.cache_hits += 1
+            else:
+                trace.cache_misses += 1
+
+    def recent(self, n: Optional[int] = None) -> List[QueryTrace]:
+        """The last n finished traces, newest first"""
+        with self._history_lock:
+            traces = list(self._history)
+        traces.reverse()
+        return traces[:n] if n is not None else traces
+
+    def clear(self):
+        with self._history_lock:
+            self._history.clear()
+
+    def _finish(self, trace: QueryTrace):
+        # Tab renders that ran no query aren't worth keeping
+        if not trace.calls and not trace.statements:
+            return
+        with self._history_lock:
+            self._history.append(trace)
+        if self.slow_ms is not None and trace.total_ms >= self.slow_ms:
+            line = json.dumps(trace.to_dict(), default=str)
+            if self._slow_handler is not None:
+                self._slow_handler.handle(logging.makeLogRecord(
+                    {'msg': line, 'levelno': logging.WARNING, 'levelname': 'WARNING'}
+                ))
+            else:
+                logger.warning("Slow query: %s", line)
+
+    def close(self):
+        if self._slow_handler is not None:
+            self._slow_handler.close()
+
+
+class _Trace:
+    __slots__ = ('instrumentation', 'name', 'call', 'remainder', 'trace', 'outer', 'start')
+
+    def __init__(self, instrumentation: Instrumentation, name: str, call: Optional[str], remainder: str):
+        self.instrumentation = instrumentation
+        self.name = name
+        self.call = call
+        self.remainder = remainder
+        self.trace = None
+
+    def __enter__(self) -> QueryTrace:
+        local = self.instrumentation._local
+        self.outer = getattr(local, 'trace', None)
+        if self.outer is not None:
+            if self.call:
+                self.outer.calls.append(self.call)
+            return self.outer
+        self.trace = QueryTrace(self.name, time.time(), self.remainder)
+        if self.call:
+            self.trace.calls.append(self.call)
+        local.trace = self.trace
+        self.start = time.perf_counter()
+        self.trace._push(self.remainder)
+        return self.trace
+
+    def __exit__(self, *exc):
+        if self.trace is None:
+            return
+        self.trace._pop()
+        self.trace.total_ms = (time.perf_counter() - self.start) * 1000
+        self.instrumentation._local.trace = None
+        self.instrumentation._finish(self.trace)
+
+
+def describe_call(name: str, args: Sequence, kwargs: Dict[str, Any]) -> str:
+    """name(arg, key=value) with long reprs shortened and empty keyword arguments left out"""
+    parts = [repr(a) for a in args]
+    parts += [f"{k}={v!r}" for k, v in kwargs.items() if v is not None and v != '']
+    parts = [p if len(p) <= _MAX_ARG_CHARS else p[:_MAX_ARG_CHARS - 3] + "..." for p in parts]
+    return f"{name}({', '.join(parts)})"
@@ -0,0 +1,111 @@
+import re
+import threading
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+# Words, hyphenated words and clitics ("'s") as separate tokens, mirroring how
+# word_tokenize splits our queries; punctuation becomes single-char tokens
+_FAST_TOKEN_RE = re.compile(r"\w+(?:-\w+)*|'\w+|[^\w\s]")
+
+TOKENIZER_MODES = ('nltk', 'fast')
+
+# NLTK data by download name and where nltk.data.find looks for it. Stopword
+# removal and lemmatizing need stopwords and WordNet in every mode; only
+# mode="nltk" tokenizes with the punkt models.
+NLTK_RESOURCES = {
+    'stopwords': 'corpora/stopwords',
+    'wordnet': 'corpora/wordnet',
+    'punkt': 'tokenizers/punkt',
+    'punkt_tab': 'tokenizers/punkt_tab',
+}
+TOKENIZER_RESOURCES = ('punkt', 'punkt_tab')
+
+
+def ensure_nltk_data(mode: str = "nltk"):
+    """Download the NLTK data a tokenizer mode needs that isn't installed yet"""
+    import nltk
+    for name, path in NLTK_RESOURCES.items():
+        if mode == "fast" and name in TOKENIZER_RESOURCES:
+            continue
+        try:
+            nltk.data.find(path)
+        except LookupError:
+            nltk.download(name, quiet=True)
+
+
+@dataclass(frozen=True)
+class QueryAnalysis:
+    """Preprocessed tokens of a query, the synonyms each token expands to and the regions it names"""
+    query: str
+    tokens: Tuple[str, ...]
+    expansions: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
+    regions: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def text_tokens(self) -> Tuple[str, ...]:
+        """Tokens searched for as text: all but those naming a region"""
+        return tuple(token for token in self.tokens if token not in self.regions)
+
+    def expanded_terms(self, token: str) -> Tuple[str, ...]:
+        """Search terms for one token, the token itself if it has no synonyms"""
+        return self.expansions.get(token, (token,))
+
+
+class TextPreprocessor:
+    """
+    Tokenize, drop stopwords and lemmatize query text
+
+    mode="nltk" tokenizes with NLTK's word_tokenize, mode="fast" with a
+    single regex that gives the same tokens on our query distribution.
+    Lemmas are memoized per token in a bounded LRU, and the NLTK resources
+    are only loaded on first use.
+    """
+
+    def __init__(self, mode: str = "nltk", lemma_cache_size: int = 4096):
+        if mode not in TOKENIZER_MODES:
+            raise ValueError(f"Unknown tokenizer mode: {mode}")
+        self.mode = mode
+        self._stop_words = None
+        self._lemmatizer = None
+        self._load_lock = threading.Lock()
+        self.lemmatize = lru_cache(maxsize=lemma_cache_size)(self._lemmatize)
+
+    @property
+    def stop_words(self) -> frozenset:
+        if self._stop_words is None:
+            with self._load_lock:
+                if self._stop_words is None:
+                    from nltk.corpus import stopwords
+                    self._stop_words = frozenset(stopwords.words('english'))
+        return self._stop_words
+
+    def _lemmatize(self, token: str) -> str:
+        if self._lemmatizer is None:
+            with self._load_lock:
+                if self._lemmatizer is None:
+                    from nltk.stem import WordNetLemmatizer
+                    self._lemmatizer = WordNetLemmatizer()
+        return self._lemmatizer.lemmatize(token)
+
+    def warm_up(self):
+        """Load stopwords, tokenizer and WordNet now instead of on the first query"""
+        self.preprocess("warming up orchids")
+
+    def tokenize(self, text: str) -> List[str]:
+        """Split lowercased text into tokens"""
+        if self.mode == "fast":
+            return _FAST_TOKEN_RE.findall(text.lower())
+        from nltk.tokenize import word_tokenize
+        return word_tokenize(text.lower())
+
+    def preprocess(self, text: str) -> List[str]:
+        """Tokenize, remove stopwords and lemmatize"""
+        if not text:
+            return []
+        stop_words = self.stop_words
+        return [
+            self.lemmatize(token)
+            for token in self.tokenize(text)
+            if token.isalnum() and token not in stop_words
+        ]
@@ -0,0 +1,75 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+# Sortable Browse columns and the index each keyset seek runs on. Genus and
+# Flower_Color reuse their filter indexes: a single-column index already ends
+# in the rowid, so it is ordered by (column, id).
+SORT_INDEXES = {
+    'Scientific_Name': 'idx_sort_scientific_name',
+    'Genus': 'idx_genus',
+    'Flower_Color': 'idx_flower_color',
+    'Temperature_Min_C': 'idx_sort_temp_min',
+    'Native_Regions': 'idx_sort_native_regions',
+}
+SORTABLE_COLUMNS = tuple(SORT_INDEXES)
+
+
+@dataclass(frozen=True)
+class Page:
+    """One Browse page and the opaque cursors of its neighbours, None at either end"""
+    rows: List[Dict] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+
+def encode_cursor(sort_col: str, order: str, direction: str, row: Dict) -> str:
+    """Opaque cursor pointing just after (next) or just before (prev) a row"""
+    payload = {'c': sort_col, 'o': order, 'd': direction, 'k': [row[sort_col], row['id']]}
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """The payload of a cursor made by encode_cursor"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        value, row_id = payload['k']
+        if (payload['c'] not in SORTABLE_COLUMNS or payload['o'] not in ('ASC', 'DESC')
+                or payload['d'] not in ('next', 'prev')
+                or not isinstance(value, (str, int, float, type(None))) or not isinstance(row_id, int)):
+            raise ValueError
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise ValueError("Invalid pagination cursor") from None
+    return payload
+
+
+def seek_steps(sort_col: str, descending: bool,
+               key: Optional[Tuple[Any, int]] = None) -> List[Tuple[str, tuple, str]]:
+    """
+    (where, params, order_by) queries that together list the rows after key
+
+    SQLite sorts NULLs first ascending and last descending, so the order is
+    made of a NULL run ordered by id and a non-NULL run ordered by
+    (sort_col, id). Each step is an equality-plus-id or a plain range seek
+    on the sort index; a single (sort_col, id) > (?, ?) row-value
+    comparison would only seek on sort_col and scan every duplicate.
+    """
+    op, direction = ('<', 'DESC') if descending else ('>', 'ASC')
+    by_id = f"id {direction}"
+    by_value = f"{sort_col} {direction}, id {direction}"
+    null_run = [(f"{sort_col} IS NULL", (), by_id)]
+    value_run = [(f"{sort_col} IS NOT NULL", (), by_value)]
+    runs = value_run + null_run if descending else null_run + value_run
+
+    if key is None:
+        return runs
+    value, row_id = key
+    if value is None:
+        return [(f"{sort_col} IS NULL AND id {op} ?", (row_id,), by_id)] + ([] if descending else value_run)
+    steps = [
+        (f"{sort_col} = ? AND id {op} ?", (value, row_id), by_id),
+        (f"{sort_col} {op} ?", (value,), by_value),
+    ]
+    return steps + (null_run if descending else [])
@@ -0,0 +1,86 @@
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List
+
+
+class ConnectionPool:
+    """
+    One writer connection plus up to `size` read-only connections
+
+    File databases run in WAL mode so readers never block on the writer or
+    on each other. Every reader is checked out by exactly one thread at a
+    time; in-memory databases have a single connection, so reads share the
+    writer under the write lock. With read_only=True the "writer" is a
+    read-only connection too and the journal mode is left as it is, for
+    prebuilt snapshots that may live on read-only storage.
+    """
+
+    def __init__(self, db_path: str, size: int = 4, timeout: float = 30.0, read_only: bool = False):
+        self.db_path = db_path
+        self.size = size
+        self.timeout = timeout
+        self.read_only = read_only
+        self.write_lock = threading.RLock()
+        self.in_memory = db_path == ":memory:" or db_path.startswith("file::memory:")
+        if read_only and self.in_memory:
+            raise ValueError("An in-memory database can't be opened read-only")
+
+        if read_only:
+            self.writer = self._open_reader()
+        else:
+            self.writer = sqlite3.connect(db_path, timeout=timeout, check_same_thread=False)
+            self.writer.row_factory = sqlite3.Row
+        if not self.in_memory and not read_only:
+            self.writer.execute("PRAGMA journal_mode = WAL")
+            self.writer.execute("PRAGMA synchronous = NORMAL")
+
+        self._idle = queue.LifoQueue()
+        self._readers: List[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+
+    def _open_reader(self) -> sqlite3.Connection:
+        """Open a read-only connection to the database file"""
+        uri = Path(self.db_path).absolute().as_uri() + "?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, timeout=self.timeout, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        """Check out a read-only connection for the duration of one query"""
+        if self.in_memory or self.size <= 0:
+            with self.write_lock:
+                yield self.writer
+            return
+
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = None
+            with self._readers_lock:
+                if len(self._readers) < self.size:
+                    conn = self._open_reader()
+                    self._readers.append(conn)
+            if conn is None:
+                conn = self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    @contextmanager
+    def writing(self) -> Iterator[sqlite3.Connection]:
+        """Hold the write lock and yield the writer connection"""
+        with self.write_lock:
+            yield self.writer
+
+    def close(self):
+        """Close the writer and every reader"""
+        with self._readers_lock:
+            for conn in self._readers:
+                conn.close()
+            self._readers.clear()
+        self.writer.close()
@@ -0,0 +1,149 @@
+import sqlite3
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+# What the result tables and expander headers show; everything else is
+# hydrated on demand when an expander reads it
+SUMMARY_COLUMNS = (
+    'id', 'Scientific_Name', 'Common_Names', 'Genus', 'Flower_Color', 'Fragrance',
+    'Native_Regions', 'Temperature_Min_C', 'Temperature_Max_C', 'Horticultural_Difficulty',
+)
+
+# Rows hydrated per batched query, about one screen of expanders
+HYDRATE_BATCH = 50
+
+_MISSING = object()
+
+# (ids, columns) -> {id: values in column order}
+Hydrator = Callable[[List[int], List[str]], Dict[int, tuple]]
+
+
+class ResultRow:
+    """Read-only, dict-like view of one row of a ResultSet"""
+    __slots__ = ('_results', '_index')
+
+    def __init__(self, results: "ResultSet", index: int):
+        self._results = results
+        self._index = index
+
+    def __getitem__(self, column: str) -> Any:
+        return self._results.value(self._index, column)
+
+    def get(self, column: str, default: Any = None) -> Any:
+        try:
+            return self[column]
+        except KeyError:
+            return default
+
+    def __contains__(self, column: str) -> bool:
+        return column in self._results.available_columns
+
+    def keys(self) -> Tuple[str, ...]:
+        return self._results.available_columns
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {column: self[column] for column in self.keys()}
+
+    def __repr__(self) -> str:
+        return f"ResultRow({self._results.columns_data['id'][self._index]})"
+
+
+class RowList(list):
+    """Full row dicts of a search given a time budget or cancel token, and whether it was cut short"""
+    truncated = False
+
+
+class ResultSet(Sequence):
+    """
+    Search results stored column by column
+
+    Only the projected columns are fetched. Any other orchid column is
+    hydrated the first time a row asks for it: the rows of that row's
+    HYDRATE_BATCH window are completed in one query by id. Rows are
+    lightweight ResultRow views, and to_dataframe() hands the column lists
+    straight to pandas. truncated is set when a search budget or cancel
+    token stopped the search before it finished.
+    """
+
+    truncated = False
+
+    def __init__(self, columns: Sequence[str], rows: List[tuple],
+                 all_columns: Sequence[str] = (), hydrate: Optional[Hydrator] = None):
+        self.columns = tuple(columns)
+        if 'id' not in self.columns:
+            raise ValueError("A ResultSet needs the id column to hydrate rows")
+        values = list(zip(*rows)) if rows else [()] * len(self.columns)
+        self.columns_data: Dict[str, list] = {c: list(v) for c, v in zip(self.columns, values)}
+        self._extra_columns = [c for c in all_columns if c not in self.columns_data]
+        self._hydrate = hydrate
+        self._hydrated_batches = set()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_cursor(cls, cursor: sqlite3.Cursor, all_columns: Sequence[str] = (),
+                    hydrate: Optional[Hydrator] = None) -> "ResultSet":
+        """Build a ResultSet from an executed cursor whose row_factory is None"""
+        columns = [d[0] for d in cursor.description]
+        return cls(columns, cursor.fetchall(), all_columns, hydrate)
+
+    def __len__(self) -> int:
+        return len(self.columns_data['id'])
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[ResultRow, List[ResultRow]]:
+        if isinstance(index, slice):
+            return [ResultRow(self, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("ResultSet index out of range")
+        return ResultRow(self, index)
+
+    @property
+    def available_columns(self) -> Tuple[str, ...]:
+        return self.columns + tuple(self._extra_columns)
+
+    @property
+    def ids(self) -> List[int]:
+        return self.columns_data['id']
+
+    def value(self, index: int, column: str) -> Any:
+        """One cell, hydrating the row's batch if the column wasn't fetched yet"""
+        values = self.columns_data.get(column)
+        if values is None or values[index] is _MISSING:
+            if column not in self._extra_columns or self._hydrate is None:
+                raise KeyError(column)
+            self._hydrate_batch(index // HYDRATE_BATCH)
+            values = self.columns_data[column]
+        return values[index]
+
+    def _hydrate_batch(self, batch: int):
+        with self._lock:
+            if batch in self._hydrated_batches:
+                return
+            start = batch * HYDRATE_BATCH
+            ids = self.ids[start:start + HYDRATE_BATCH]
+            fetched = self._hydrate(ids, self._extra_columns)
+            for position, column in enumerate(self._extra_columns):
+                values = self.columns_data.setdefault(column, [_MISSING] * len(self))
+                for offset, row_id in enumerate(ids):
+                    row = fetched.get(row_id)
+                    values[start + offset] = row[position] if row is not None else None
+            self._hydrated_batches.add(batch)
+
+    def iter_dicts(self) -> Iterator[Dict[str, Any]]:
+        """Plain dicts of the projected columns, built one at a time"""
+        for values in zip(*(self.columns_data[c] for c in self.columns)):
+            yield dict(zip(self.columns, values))
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Plain dicts of the projected columns"""
+        return list(self.iter_dicts())
+
+    def to_dataframe(self, columns: Optional[Sequence[str]] = None):
+        """A pandas DataFrame of the projected (or given, already fetched) columns"""
+        import pandas as pd
+        columns = list(columns or self.columns)
+        return pd.DataFrame({c: self.columns_data[c] for c in columns}, columns=columns)
@@ -0,0 +1,124 @@
+import sqlite3
+from typing import Dict, Tuple, Union
+
+import numpy as np
+
+# Horticultural_Difficulty -> level on the dataset doc's Easy=1 .. Difficult=3 scale
+DIFFICULTY_LEVELS = {
+    'easy': 1.0,
+    'easy to moderate': 1.5,
+    'moderate': 2.0,
+    'moderate to difficult': 2.5,
+    'difficult': 3.0,
+    'very difficult': 3.5,
+}
+SKILL_LEVELS = {'beginner': 1.0, 'intermediate': 2.0, 'expert': 3.5}
+
+# Environmental match = temp 0.4 + humidity 0.3 + light 0.3; the total blends
+# environment (35%) and care compatibility (20%) from the weighted scoring
+# model, rescaled to 0-100 since rating and diversity data don't exist here
+TEMP_WEIGHT, HUMIDITY_WEIGHT, LIGHT_WEIGHT = 0.4, 0.3, 0.3
+ENVIRONMENT_WEIGHT, CARE_WEIGHT = 0.35, 0.20
+
+# Distance outside an orchid's range at which a factor's match drops to zero
+TEMP_TOLERANCE_C = 10.0
+HUMIDITY_TOLERANCE_PCT = 30.0
+LIGHT_TOLERANCE_FC = 2000.0
+
+# Score given to a factor the orchid has no data for
+UNKNOWN_MATCH = 0.5
+
+
+def _float_or_nan(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _range_match(value: float, low: np.ndarray, high: np.ndarray, tolerance: float) -> np.ndarray:
+    """1 inside [low, high], falling linearly to 0 at `tolerance` outside it"""
+    distance = np.maximum(low - value, 0.0) + np.maximum(value - high, 0.0)
+    match = np.clip(1.0 - distance / tolerance, 0.0, 1.0)
+    return np.where(np.isnan(distance), UNKNOWN_MATCH, match)
+
+
+class EnvironmentScorer:
+    """
+    Environmental compatibility scores for the whole catalog in one vectorized pass
+
+    The numeric columns are held in contiguous NumPy arrays (NaN for NULL),
+    loaded once from SQLite; scoring a user's conditions is a handful of
+    array operations followed by an argpartition for the top k.
+    """
+
+    COLUMNS = ('Temperature_Min_C', 'Temperature_Max_C', 'Humidity_Min_Percent',
+               'Humidity_Max_Percent', 'Light_Min_FC', 'Light_Max_FC')
+
+    def __init__(self, ids: np.ndarray, columns: Dict[str, np.ndarray], difficulty: np.ndarray):
+        self.ids = np.ascontiguousarray(ids, dtype=np.int64)
+        self.temp_min = np.ascontiguousarray(columns['Temperature_Min_C'], dtype=np.float64)
+        self.temp_max = np.ascontiguousarray(columns['Temperature_Max_C'], dtype=np.float64)
+        self.humidity_min = np.ascontiguousarray(columns['Humidity_Min_Percent'], dtype=np.float64)
+        self.humidity_max = np.ascontiguousarray(columns['Humidity_Max_Percent'], dtype=np.float64)
+        self.light_min = np.ascontiguousarray(columns['Light_Min_FC'], dtype=np.float64)
+        self.light_max = np.ascontiguousarray(columns['Light_Max_FC'], dtype=np.float64)
+        self.difficulty = np.ascontiguousarray(difficulty, dtype=np.float64)
+
+    @classmethod
+    def from_connection(cls, conn: sqlite3.Connection) -> "EnvironmentScorer":
+        """Load the scoring columns for every orchid"""
+        rows = conn.execute(
+            f"SELECT id, {', '.join(cls.COLUMNS)}, Horticultural_Difficulty FROM orchids ORDER BY id"
+        ).fetchall()
+        n = len(rows)
+        ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=n)
+        columns = {
+            name: np.fromiter((_float_or_nan(r[i + 1]) for r in rows), dtype=np.float64, count=n)
+            for i, name in enumerate(cls.COLUMNS)
+        }
+        difficulty = np.fromiter(
+            (DIFFICULTY_LEVELS.get((r[-1] or '').strip().lower(), np.nan) for r in rows),
+            dtype=np.float64, count=n,
+        )
+        return cls(ids, columns, difficulty)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(a.nbytes for a in (self.ids, self.temp_min, self.temp_max, self.humidity_min,
+                                      self.humidity_max, self.light_min, self.light_max, self.difficulty))
+
+    def score(self, user_temp: float, humidity: float, light_fc: float,
+              skill: Union[str, float] = 'beginner') -> np.ndarray:
+        """Match score 0-100 of every orchid for the user's conditions"""
+        skill_level = SKILL_LEVELS[skill.lower()] if isinstance(skill, str) else float(skill)
+
+        environment = (
+            TEMP_WEIGHT * _range_match(user_temp, self.temp_min, self.temp_max, TEMP_TOLERANCE_C)
+            + HUMIDITY_WEIGHT * _range_match(humidity, self.humidity_min, self.humidity_max,
+                                             HUMIDITY_TOLERANCE_PCT)
+            + LIGHT_WEIGHT * _range_match(light_fc, self.light_min, self.light_max, LIGHT_TOLERANCE_FC)
+        )
+        # Full marks at or below the user's skill, half a point lost per level above it
+        care = np.clip(1.0 - 0.5 * np.maximum(self.difficulty - skill_level, 0.0), 0.0, 1.0)
+        care = np.where(np.isnan(self.difficulty), UNKNOWN_MATCH, care)
+
+        return 100.0 * (ENVIRONMENT_WEIGHT * environment + CARE_WEIGHT * care) / (
+            ENVIRONMENT_WEIGHT + CARE_WEIGHT)
+
+    def top_k(self, scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(ids, scores) of the k best orchids, best first"""
+        k = min(k, len(scores))
+        if k <= 0:
+            return self.ids[:0], scores[:0]
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best], kind='stable')]
+        return self.ids[best], scores[best]
+
+    def recommend(self, user_temp: float, humidity: float, light_fc: float,
+                  skill: Union[str, float] = 'beginner', k: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+        """Score the catalog and return the top-k (ids, scores)"""
+        return self.top_k(self.score(user_temp, humidity, light_fc, skill), k)
@@ -0,0 +1,210 @@
+import argparse
+import asyncio
+import functools
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, nullcontext
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Union
+
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from .db import OrchidSearchDB
+from .nlp import ensure_nltk_data
+from .results import SUMMARY_COLUMNS, ResultSet
+from .snapshot import open_snapshot, snapshot_info
+
+SEARCH_MODES = ('fts', 'fuzzy', 'like', 'fulltext')
+MAX_LIMIT = 5000
+
+# Rows serialized per NDJSON chunk
+NDJSON_BATCH = 200
+
+
+class EngineExecutor:
+    """
+    Bounded thread pool for the blocking SQLite calls of the engine
+
+    One worker per pooled reader connection; more would only queue inside
+    the connection pool. At most max_pending calls may be running or
+    waiting, beyond that requests are turned away with 503 instead of
+    piling up latency.
+    """
+
+    def __init__(self, workers: int, max_pending: int = 64):
+        self.max_pending = max_pending
+        self._pending = 0
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="orchid-engine")
+
+    async def run(self, fn, *args, **kwargs):
+        if self._pending >= self.max_pending:
+            raise HTTPException(503, "Search service is busy", headers={"Retry-After": "1"})
+        self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, functools.partial(fn, *args, **kwargs)
+            )
+        except ValueError as e:
+            raise HTTPException(400, str(e)) from None
+        finally:
+            self._pending -= 1
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Comma-separated column names; "*" asks for full rows"""
+    if fields is None:
+        return list(SUMMARY_COLUMNS)
+    if fields.strip() == "*":
+        return None
+    return [f.strip() for f in fields.split(",") if f.strip()]
+
+
+def _iter_rows(results: Union[List[Dict], ResultSet]) -> Iterator[Dict[str, Any]]:
+    return results.iter_dicts() if isinstance(results, ResultSet) else iter(results)
+
+
+async def _ndjson(meta: Dict[str, Any], results: Union[List[Dict], ResultSet]) -> AsyncIterator[bytes]:
+    # The first line describes the response, then one line per row
+    yield (json.dumps(meta) + "\n").encode()
+    batch = []
+    for row in _iter_rows(results):
+        batch.append(json.dumps(row))
+        if len(batch) >= NDJSON_BATCH:
+            yield ("\n".join(batch) + "\n").encode()
+            batch = []
+            await asyncio.sleep(0)
+    if batch:
+        yield ("\n".join(batch) + "\n").encode()
+
+
+def _respond(meta: Dict[str, Any], results: Union[List[Dict], ResultSet], format: str):
+    """JSON object with a results list, or an NDJSON stream of meta then rows"""
+    if format == "ndjson":
+        return StreamingResponse(_ndjson(meta, results), media_type="application/x-ndjson")
+    return {**meta, "results": list(_iter_rows(results))}
+
+
+def create_app(db: OrchidSearchDB, workers: Optional[int] = None, max_pending: int = 64) -> FastAPI:
+    """
+    JSON API over an open OrchidSearchDB
+
+    The endpoints follow the API design table in orchids_dataset_5k.md.
+    The caller owns db and closes it; the app only owns its thread pool.
+    """
+    engine = EngineExecutor(workers or max(db.pool_size, 1), max_pending)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        yield
+        engine.shutdown()
+
+    app = FastAPI(title="Orchid search", lifespan=lifespan)
+    app.state.db = db
+    app.state.engine = engine
+
+    @app.get("/health")
+    async def health():
+        return {"rows": await engine.run(db.count), "read_only": db.read_only}
+
+    @app.get("/search")
+    async def search(q: str = Query(..., min_length=1),
+                     mode: str = Query("fts", pattern=f"^({'|'.join(SEARCH_MODES)})$"),
+                     limit: int = Query(50, ge=1, le=MAX_LIMIT),
+                     fields: Optional[str] = None,
+                     format: str = Query("json", pattern="^(json|ndjson)$"),
+                     budget_ms: Optional[float] = Query(None, gt=0),
+                     session: Optional[str] = None):
+        columns = _parse_fields(fields)
+        # A session's new search cancels the one it supersedes, e.g. as the user types
+        with db.sessions.query(session) if session else nullcontext() as cancel:
+            if mode == "fulltext":
+                results = await engine.run(db.fulltext_search, q, limit, columns=columns,
+                                           budget_ms=budget_ms, cancel=cancel)
+            else:
+                results = await engine.run(db.intelligent_search, q, limit, mode=mode, columns=columns,
+                                           budget_ms=budget_ms, cancel=cancel)
+        meta = {"query": q, "mode": mode, "count": len(results)}
+        if budget_ms is not None or session:
+            meta["truncated"] = results.truncated
+        return _respond(meta, results, format)
+
+    @app.get("/suggest")
+    async def suggest(q: str = Query(..., min_length=1), limit: int = Query(8, ge=1, le=50)):
+        results = await engine.run(db.suggest, q, limit)
+        return {"query": q, "suggestions": [{"id": i, "label": label, "kind": kind} for i, label, kind in results]}
+
+    @app.get("/recommend/similar/{orchid_id}")
+    async def recommend_similar(orchid_id: int, limit: int = Query(5, ge=1, le=50)):
+        results = await engine.run(db.similar_orchids, orchid_id, k=limit)
+        if not results and not await engine.run(db.fetch_by_ids, [orchid_id]):
+            raise HTTPException(404, f"No orchid with id {orchid_id}")
+        return {"orchid_id": orchid_id, "results": results}
+
+    @app.get("/recommend/beginners")
+    async def recommend_beginners(temperature_c: float = 22.0,
+                                  humidity: float = Query(60.0, ge=0, le=100),
+                                  light_fc: float = Query(1500.0, ge=0),
+                                  limit: int = Query(10, ge=1, le=100)):
+        results = await engine.run(db.recommend_for_environment, temperature_c, humidity, light_fc,
+                                   skill="beginner", k=limit)
+        return {"results": results}
+
+    @app.get("/recommend/by-color/{color}")
+    async def recommend_by_color(color: str,
+                                 limit: int = Query(20, ge=1, le=MAX_LIMIT),
+                                 after: int = Query(0, ge=0),
+                                 fields: Optional[str] = None,
+                                 format: str = Query("json", pattern="^(json|ndjson)$")):
+        results = await engine.run(db.semantic_page, limit, after, _parse_fields(fields), flower_color=color)
+        ids = results.ids if isinstance(results, ResultSet) else [row['id'] for row in results]
+        next_after = ids[-1] if len(ids) == limit else None
+        return _respond({"color": color, "count": len(results), "next_after": next_after}, results, format)
+
+    return app
+
+
+def open_database(path: str, pool_size: int = 4, nlp_mode: str = "nltk") -> OrchidSearchDB:
+    """
+    A snapshot read-only, any other database file read-write
+
+    The NLTK data nlp_mode needs is downloaded if missing and loaded, so
+    the first search request doesn't wait for it.
+    """
+    ensure_nltk_data(nlp_mode)
+    if os.path.isfile(path) and snapshot_info(path):
+        db = open_snapshot(path, pool_size=pool_size, nlp_mode=nlp_mode)
+    else:
+        db = OrchidSearchDB(path, pool_size=pool_size, nlp_mode=nlp_mode)
+        db.connect()
+        db.create_tables()
+    db.preprocessor.warm_up()
+    return db
+
+
+def main():
+    """Serve the API: python -m orchid_search.service --db orchids.db"""
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Orchid search and recommendation API")
+    parser.add_argument("--db", default="orchids.db")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--pool-size", type=int, default=4)
+    parser.add_argument("--max-pending", type=int, default=64)
+    parser.add_argument("--nlp-mode", default="nltk")
+    args = parser.parse_args()
+
+    db = open_database(args.db, args.pool_size, args.nlp_mode)
+    try:
+        uvicorn.run(create_app(db, max_pending=args.max_pending), host=args.host, port=args.port,
+                    log_level="warning")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
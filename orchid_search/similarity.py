@@ -0,0 +1,329 @@
+import argparse
+import os
+import re
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .scoring import DIFFICULTY_LEVELS
+from .synonyms import COLOR_SYNONYMS
+
+# Content-based similarity weights from the dataset doc's similarity matrix
+FEATURE_WEIGHTS = {
+    'genus': 0.25,
+    'color': 0.20,
+    'habit': 0.15,
+    'difficulty': 0.15,
+    'size': 0.10,
+    'season': 0.10,
+    'fragrance': 0.05,
+}
+
+# Scores are summed as uint8 in units of 1/SCORE_SCALE, so a perfect match is
+# SCORE_SCALE and a whole block of pairs costs one byte per pair
+SCORE_SCALE = 200
+_UNITS = {name: int(round(weight * SCORE_SCALE)) for name, weight in FEATURE_WEIGHTS.items()}
+
+# Flower size similarity 1 - |a - b| / max_size, quantized to this many steps
+SIZE_STEPS = _UNITS['size']
+
+# Color families one step apart on the color wheel count as "similar" (0.7)
+SIMILAR_COLOR = 0.7
+RELATED_COLOR_FAMILIES = [
+    ('pink', 'purple'), ('pink', 'red'), ('red', 'orange'),
+    ('orange', 'yellow'), ('purple', 'blue'), ('yellow', 'green'),
+]
+
+SEASONS = ('spring', 'summer', 'autumn', 'winter')
+_SEASON_WORDS = {
+    'spring': 0b0001, 'summer': 0b0010, 'autumn': 0b0100, 'fall': 0b0100, 'winter': 0b1000,
+    'march': 0b0001, 'april': 0b0001, 'may': 0b0001,
+    'june': 0b0010, 'july': 0b0010, 'august': 0b0010,
+    'september': 0b0100, 'october': 0b0100, 'november': 0b0100,
+    'december': 0b1000, 'january': 0b1000, 'february': 0b1000,
+}
+_YEAR_ROUND_RE = re.compile(r"year[\s-]*round|all\s+year|continuous|any\s+time")
+_WORD_RE = re.compile(r"[a-z]+")
+
+# Cells of the (block rows x catalog) score matrix computed at once
+BLOCK_CELLS = 1 << 22
+
+# Margins below a row's best score tried in turn when looking for its k-th best
+THRESHOLD_MARGINS = (8, 32, 96)
+
+COLUMNS = ('id', 'Genus', 'Flower_Color', 'Growth_Habit', 'Horticultural_Difficulty',
+           'Flower_Size_Min_cm', 'Flower_Size_Max_cm', 'Blooming_Season', 'Fragrance')
+
+
+def season_mask(value: Optional[str]) -> int:
+    """Multi-hot spring/summer/autumn/winter bits, all four for year-round bloomers"""
+    text = (value or '').lower()
+    if _YEAR_ROUND_RE.search(text):
+        return 0b1111
+    mask = 0
+    for word in _WORD_RE.findall(text):
+        mask |= _SEASON_WORDS.get(word, 0)
+    return mask
+
+
+def _normalize(value: Optional[str]) -> str:
+    return " ".join((value or '').lower().split())
+
+
+def _factorize(values: Sequence) -> Tuple[np.ndarray, list]:
+    """Integer codes for values and the distinct values in code order"""
+    codes: Dict = {}
+    out = np.fromiter((codes.setdefault(v, len(codes)) for v in values), dtype=np.int32, count=len(values))
+    return out, list(codes)
+
+
+def _pair_table(codes: Sequence[int], table: np.ndarray) -> np.ndarray:
+    """table[codes[i], codes[j]] for every pair of profiles"""
+    codes = np.asarray(codes, dtype=np.intp)
+    return table[np.ix_(codes, codes)]
+
+
+def _color_table(color_values: List[str]) -> np.ndarray:
+    """Similarity units between distinct Flower_Color values"""
+    family_of = {}
+    for family, terms in COLOR_SYNONYMS.items():
+        for term in terms:
+            family_of.setdefault(term, family)
+    families = list(COLOR_SYNONYMS)
+    family_index = {family: i for i, family in enumerate(families)}
+
+    words = [set(_WORD_RE.findall(value)) - {'and', 'with'} for value in color_values]
+    vocabulary = {word: i for i, word in enumerate(sorted(set().union(*words)))} if words else {}
+    has_word = np.zeros((len(words), max(len(vocabulary), 1)), dtype=np.float32)
+    has_family = np.zeros((len(words), len(families)), dtype=np.float32)
+    for i, value_words in enumerate(words):
+        for word in value_words:
+            has_word[i, vocabulary[word]] = 1
+            if word in family_of:
+                has_family[i, family_index[family_of[word]]] = 1
+
+    related = np.eye(len(families), dtype=np.float32)
+    for a, b in RELATED_COLOR_FAMILIES:
+        related[family_index[a], family_index[b]] = related[family_index[b], family_index[a]] = 1
+
+    exact = (has_word @ has_word.T) > 0
+    similar = (has_family @ related @ has_family.T) > 0
+    units = _UNITS['color']
+    return np.where(exact, units, np.where(similar, int(round(SIMILAR_COLOR * units)), 0)).astype(np.uint8)
+
+
+class SimilarityFeatures:
+    """
+    Integer-coded similarity features for the whole catalog
+
+    Genus is compared by code equality. The other six features are folded
+    into two small profile codes, color+size and habit+difficulty+season+
+    fragrance, whose pairwise scores are precomputed lookup tables. Scoring
+    a block of rows against the catalog is then two table gathers, one
+    equality test and a top-k partition, all on uint8.
+    """
+
+    def __init__(self, ids: np.ndarray, genus: np.ndarray, look: np.ndarray, care: np.ndarray,
+                 look_table: np.ndarray, care_table: np.ndarray):
+        self.ids = np.ascontiguousarray(ids, dtype=np.int64)
+        self.genus = np.ascontiguousarray(genus, dtype=np.int32)
+        self.look = np.ascontiguousarray(look, dtype=np.int32)
+        self.care = np.ascontiguousarray(care, dtype=np.int32)
+        self.look_table = np.ascontiguousarray(look_table, dtype=np.uint8)
+        self.care_table = np.ascontiguousarray(care_table, dtype=np.uint8)
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence]) -> "SimilarityFeatures":
+        """Encode rows of COLUMNS"""
+        n = len(rows)
+        ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=n)
+
+        # Unknown genera get unique negative codes so they never match each other
+        genus_names = [_normalize(r[1]) for r in rows]
+        genus, _ = _factorize(genus_names)
+        unknown = np.array([not g for g in genus_names], dtype=bool)
+        genus[unknown] = -1 - np.flatnonzero(unknown)
+
+        # Color + flower size
+        color_codes, color_values = _factorize([_normalize(r[2]) for r in rows])
+        color_table = _color_table(color_values)
+        size_min = np.array([np.nan if r[5] is None else r[5] for r in rows], dtype=np.float64)
+        size_max = np.array([np.nan if r[6] is None else r[6] for r in rows], dtype=np.float64)
+        sizes = np.where(np.isnan(size_min), size_max,
+                         np.where(np.isnan(size_max), size_min, (size_min + size_max) / 2))
+        max_size = np.nanmax(sizes) if np.isfinite(sizes).any() else 0.0
+        size_bins = np.full(n, SIZE_STEPS + 1, dtype=np.int32)  # the extra bin is "unknown"
+        if max_size > 0:
+            known = np.isfinite(sizes)
+            size_bins[known] = np.rint(sizes[known] / max_size * SIZE_STEPS).astype(np.int32)
+        steps = np.arange(SIZE_STEPS + 2)
+        size_table = np.clip(SIZE_STEPS - np.abs(steps[:, None] - steps[None, :]), 0, None)
+        size_table[SIZE_STEPS + 1, :] = size_table[:, SIZE_STEPS + 1] = 0
+
+        look, look_profiles = _factorize(list(zip(color_codes.tolist(), size_bins.tolist())))
+        look_color, look_size = zip(*look_profiles) if look_profiles else ((), ())
+        look_table = _pair_table(look_color, color_table) + _pair_table(look_size, size_table)
+
+        # Growth habit + difficulty + blooming season + fragrance
+        habit, habit_values = _factorize([_normalize(r[3]) for r in rows])
+        levels = [DIFFICULTY_LEVELS.get(_normalize(r[4])) for r in rows]
+        seasons = [season_mask(r[7]) for r in rows]
+        fragrance, fragrance_values = _factorize([_normalize(r[8]) for r in rows])
+        care, care_profiles = _factorize(list(zip(habit.tolist(), levels, seasons, fragrance.tolist())))
+        if care_profiles:
+            p_habit, p_level, p_season, p_fragrance = (np.array(col, dtype=object) for col in zip(*care_profiles))
+        else:
+            p_habit = p_level = p_season = p_fragrance = np.array([], dtype=object)
+
+        habit_known = np.array([bool(habit_values[h]) for h in p_habit], dtype=bool)
+        same_habit = (p_habit[:, None] == p_habit[None, :]) & habit_known[:, None]
+
+        level = np.array([np.nan if v is None else v for v in p_level], dtype=np.float64)
+        level_sim = np.clip(1.0 - 0.5 * np.abs(level[:, None] - level[None, :]), 0.0, 1.0)
+        level_sim = np.nan_to_num(level_sim, nan=0.0)
+
+        season = p_season.astype(np.int64)
+        overlap = (season[:, None] & season[None, :]) != 0
+        season_sim = np.where(season[:, None] == season[None, :], 1.0, np.where(overlap, 0.5, 0.0))
+        season_sim[season == 0, :] = 0.0
+
+        fragrance_known = np.array([bool(fragrance_values[f]) for f in p_fragrance], dtype=bool)
+        same_fragrance = (p_fragrance[:, None] == p_fragrance[None, :]) & fragrance_known[:, None]
+
+        care_table = np.rint(
+            _UNITS['habit'] * same_habit
+            + _UNITS['difficulty'] * level_sim
+            + _UNITS['season'] * season_sim
+            + _UNITS['fragrance'] * same_fragrance
+        )
+        return cls(ids, genus, look, care, look_table, care_table)
+
+    @classmethod
+    def from_connection(cls, conn: sqlite3.Connection) -> "SimilarityFeatures":
+        """Load and encode the similarity columns of every orchid"""
+        return cls.from_rows(conn.execute(f"SELECT {', '.join(COLUMNS)} FROM orchids ORDER BY id").fetchall())
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(a.nbytes for a in (self.ids, self.genus, self.look, self.care,
+                                      self.look_table, self.care_table))
+
+    def score_block(self, start: int, stop: int) -> np.ndarray:
+        """uint8 similarity of rows start:stop against every orchid, 0 on the diagonal"""
+        scores = np.take(self.look_table[self.look[start:stop]], self.look, axis=1)
+        scores += np.take(self.care_table[self.care[start:stop]], self.care, axis=1)
+        scores += (self.genus[start:stop, None] == self.genus[None, :]).view(np.uint8) * np.uint8(_UNITS['genus'])
+        scores[np.arange(stop - start), np.arange(start, stop)] = 0
+        return scores
+
+    def top_k_block(self, start: int, stop: int, k: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        (row, rank, neighbor, score) arrays of the k most similar orchids for rows start:stop
+
+        Instead of a per-row argpartition, each row's cut-off is found by
+        counting pairs within a small margin of its best score, widening
+        the margin only for rows that don't reach k; just the pairs above
+        the cut-off are sorted. Ties go to the lower row, 0 scores are dropped.
+        """
+        scores = self.score_block(start, stop)
+        best = scores.max(axis=1).astype(np.int16)
+        threshold = np.ones(len(scores), dtype=np.uint8)
+        pending = np.arange(len(scores))
+        for margin in THRESHOLD_MARGINS:
+            level = np.maximum(best[pending] - margin, 1).astype(np.uint8)
+            candidates = scores if len(pending) == len(scores) else scores[pending]
+            found = np.count_nonzero(candidates >= level[:, None], axis=1) >= k
+            threshold[pending[found]] = level[found]
+            pending = pending[~found]
+            if not len(pending):
+                break
+
+        # flatnonzero + divmod is several times faster than a 2-D nonzero
+        row, col = np.divmod(np.flatnonzero(scores >= threshold[:, None]), scores.shape[1])
+        value = scores[row, col]
+        order = np.lexsort((col, -value.astype(np.int16), row))
+        row, col, value = row[order], col[order], value[order]
+        rank = _rank_within(row)
+        keep = rank <= k
+        return row[keep] + start, rank[keep], col[keep], value[keep]
+
+
+def _rank_within(groups: np.ndarray) -> np.ndarray:
+    """1-based position of every element within its run of equal group values"""
+    if not len(groups):
+        return np.empty(0, dtype=np.int64)
+    first = np.r_[True, groups[1:] != groups[:-1]]
+    starts = np.maximum.accumulate(np.where(first, np.arange(len(groups)), 0))
+    return np.arange(len(groups)) - starts + 1
+
+
+# Features shared with worker processes, set once per worker by the initializer
+_WORKER_FEATURES: Optional[SimilarityFeatures] = None
+
+
+def _init_worker(features: SimilarityFeatures):
+    global _WORKER_FEATURES
+    _WORKER_FEATURES = features
+
+
+def _worker_top_k(args: Tuple[int, int, int]):
+    start, stop, k = args
+    return _WORKER_FEATURES.top_k_block(start, stop, k)
+
+
+def build_neighbors(features: SimilarityFeatures, k: int = 10, workers: int = 1,
+                    block_rows: Optional[int] = None) -> List[Tuple[int, int, int, float]]:
+    """
+    (orchid_id, rank, neighbor_id, score) rows of the k nearest neighbors of every orchid
+
+    Rows are scored in blocks of block_rows against the whole catalog, so
+    memory stays at one block's score matrix per process; workers > 1
+    spreads the blocks over a process pool.
+    """
+    n = len(features)
+    if n < 2:
+        return []
+    block_rows = block_rows or max(1, BLOCK_CELLS // n)
+    tasks = [(start, min(start + block_rows, n), k) for start in range(0, n, block_rows)]
+
+    if workers > 1:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(features,)) as pool:
+            blocks = list(pool.map(_worker_top_k, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+    else:
+        blocks = [features.top_k_block(*task) for task in tasks]
+
+    neighbors = []
+    ids = features.ids
+    for rows, ranks, cols, scores in blocks:
+        neighbors.extend(zip(ids[rows].tolist(), ranks.tolist(), ids[cols].tolist(),
+                             (scores / SCORE_SCALE).round(3).tolist()))
+    return neighbors
+
+
+def main():
+    """Offline build of the similar-orchids table: python -m orchid_search.similarity"""
+    from .db import OrchidSearchDB
+
+    parser = argparse.ArgumentParser(description="Precompute the similar-orchids neighbor table")
+    parser.add_argument("--db", default="orchids.db")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    db = OrchidSearchDB(args.db)
+    db.connect()
+    db.create_tables()
+    start = time.perf_counter()
+    count = db.build_similarity_index(k=args.k, workers=args.workers)
+    print(f"Stored {count} neighbor pairs in {time.perf_counter() - start:.1f}s")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
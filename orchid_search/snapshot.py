@@ -0,0 +1,118 @@
+import argparse
+import hashlib
+import os
+import sqlite3
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict
+
+from .db import OrchidSearchDB
+
+# Stored in PRAGMA user_version; bump it whenever the schema, the FTS
+# configuration or the precomputed tables change so stale snapshots are refused
+SNAPSHOT_FORMAT = 4
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def build_snapshot(csv_path: str, out_path: str, k: int = 10, workers: int = 1) -> Dict[str, str]:
+    """
+    Build a ready-to-serve database from a local CSV, without network access
+
+    Loads and indexes the rows, precomputes the similar-orchids table,
+    optimizes the FTS index and writes a single self-contained file
+    (rollback journal, not WAL) so it can be opened read-only anywhere.
+    The file is built next to out_path and moved into place at the end,
+    so a running reader never sees a half-built snapshot.
+    """
+    tmp_path = out_path + ".building"
+    for path in (tmp_path, tmp_path + "-wal", tmp_path + "-shm"):
+        if os.path.exists(path):
+            os.remove(path)
+
+    db = OrchidSearchDB(tmp_path, pool_size=0, cache_size=0)
+    db.connect()
+    try:
+        db.create_tables()
+        count = db.load_data(csv_path)
+        db.build_similarity_index(k=k, workers=workers)
+        db.maintain_fts("optimize")
+
+        meta = {
+            'format': str(SNAPSHOT_FORMAT),
+            'built_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'source': os.path.basename(csv_path),
+            'source_sha256': _sha256(csv_path),
+            'rows': str(count),
+            'similar_k': str(k),
+            'sqlite_version': sqlite3.sqlite_version,
+        }
+        with db.conn:
+            db.conn.execute("CREATE TABLE snapshot_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID")
+            db.conn.executemany("INSERT INTO snapshot_meta VALUES (?, ?)", meta.items())
+        db.conn.execute("ANALYZE")
+        db.conn.execute(f"PRAGMA user_version = {SNAPSHOT_FORMAT}")
+        db.conn.execute("PRAGMA journal_mode = DELETE")
+        db.conn.execute("VACUUM")
+    finally:
+        db.close()
+
+    os.replace(tmp_path, out_path)
+    return meta
+
+
+def snapshot_info(path: str) -> Dict[str, str]:
+    """The metadata a snapshot was built with, empty if the file isn't a snapshot"""
+    conn = sqlite3.connect(Path(path).absolute().as_uri() + "?mode=ro", uri=True)
+    try:
+        has_meta = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'snapshot_meta'"
+        ).fetchone()
+        if not has_meta:
+            return {}
+        meta = dict(conn.execute("SELECT key, value FROM snapshot_meta"))
+        meta['user_version'] = str(conn.execute("PRAGMA user_version").fetchone()[0])
+        return meta
+    finally:
+        conn.close()
+
+
+def open_snapshot(path: str, **kwargs) -> OrchidSearchDB:
+    """Open a snapshot read-only, refusing files built for another format"""
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"No snapshot at {path}")
+    meta = snapshot_info(path)
+    if meta.get('user_version') != str(SNAPSHOT_FORMAT):
+        found = meta.get('user_version', 'none')
+        raise ValueError(f"{path} is not a format {SNAPSHOT_FORMAT} snapshot (found {found}); "
+                         f"rebuild it with python -m orchid_search.snapshot")
+    db = OrchidSearchDB(path, read_only=True, **kwargs)
+    db.connect()
+    return db
+
+
+def main():
+    """Offline snapshot build: python -m orchid_search.snapshot orchids.csv --out orchids.db"""
+    parser = argparse.ArgumentParser(description="Build a read-only orchids.db snapshot from a local CSV")
+    parser.add_argument("csv")
+    parser.add_argument("--out", default="orchids.db")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    meta = build_snapshot(args.csv, args.out, k=args.k, workers=args.workers)
+    size_mb = os.path.getsize(args.out) / 1e6
+    print(f"Built {args.out}: {meta['rows']} rows, format {meta['format']}, {size_mb:.1f} MB "
+          f"in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+import bisect
+import re
+import sqlite3
+from typing import Iterable, List, Tuple
+
+import numpy as np
+
+# Kinds of name suggest() returns, and the order they rank in on equal popularity
+NAME_KINDS = ('genus', 'common_name', 'species')
+
+# Largest k answered from the precomputed lists; larger k rank the whole prefix range
+PRECOMPUTED_K = 20
+
+# Prefixes matching more keys than this get their top names precomputed
+SCAN_LIMIT = 2048
+
+_WORD_START_RE = re.compile(r"(?<=[\s\-(])\w")
+
+# (id, label, kind, popularity) of every distinct suggestible name, with
+# the first orchid that has it. A species is as popular as it has common
+# names; a genus or common name counts its orchids.
+NAMES_SQL = """
+    SELECT MIN(o.id), o.Scientific_Name, 'species',
+           SUM((SELECT COUNT(*) FROM orchid_common_name j WHERE j.orchid_id = o.id))
+    FROM orchids o WHERE o.Scientific_Name IS NOT NULL
+    GROUP BY o.Scientific_Name
+    UNION ALL
+    SELECT (SELECT MIN(id) FROM orchids WHERE Genus = f.value), f.value, 'genus', f.count
+    FROM orchid_facets f WHERE f.column_name = 'Genus'
+    UNION ALL
+    SELECT MIN(j.orchid_id), l.name, 'common_name', COUNT(*)
+    FROM common_names l JOIN orchid_common_name j ON j.name_id = l.id
+    GROUP BY l.id
+"""
+
+
+def normalize(text: str) -> str:
+    """Lowercased, with runs of whitespace as one space"""
+    return " ".join(text.lower().split())
+
+
+class NameIndex:
+    """
+    Prefix suggestions over species, genus and common names
+
+    Every name is keyed by its whole label and by the rest of the label
+    from each later word start, so "nob" finds "Dendrobium nobile" and
+    "moth" finds "Pink moth orchid". Keys are sorted, so a prefix is one
+    bisected range. Names rank by match type (the whole label, then its
+    start, then a later word), then popularity, then kind, length and
+    label. Ranges too large to rank per call have their best names
+    precomputed; the rest are ranked with one argpartition.
+    """
+
+    def __init__(self, names: Iterable[Tuple[int, str, str, int]]):
+        # Best name first: most popular, then by kind, shortest, alphabetical
+        kind_order = {kind: i for i, kind in enumerate(NAME_KINDS)}
+        names = sorted(((i, label, kind, popularity) for i, label, kind, popularity in names if label),
+                       key=lambda n: (-n[3], kind_order[n[2]], len(n[1]), n[1]))
+        self.ids = np.array([n[0] for n in names], dtype=np.int64)
+        self.labels = [n[1] for n in names]
+        self.kinds = [n[2] for n in names]
+
+        entries = []
+        for rank, label in enumerate(self.labels):
+            key = normalize(label)
+            entries.append((key, rank))
+            # Later words rank after every label start
+            entries.extend((key[m.start():], len(names) + rank) for m in _WORD_START_RE.finditer(key))
+        entries.sort()
+        self.keys = [key for key, _ in entries]
+        self._scores = np.array([score for _, score in entries], dtype=np.int64)
+        self._top = self._precompute()
+
+    @classmethod
+    def from_connection(cls, conn: sqlite3.Connection) -> "NameIndex":
+        """Index every species, genus and common name in the database"""
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        try:
+            return cls(cursor.execute(NAMES_SQL).fetchall())
+        finally:
+            cursor.close()
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def _range(self, prefix: str, lo: int = 0, hi: int = None) -> Tuple[int, int]:
+        hi = len(self.keys) if hi is None else hi
+        lo = bisect.bisect_left(self.keys, prefix, lo, hi)
+        return lo, bisect.bisect_left(self.keys, prefix + "\U0010ffff", lo, hi)
+
+    def _best(self, lo: int, hi: int, k: int) -> np.ndarray:
+        """Ranks of the best k distinct names among keys[lo:hi], best first"""
+        scores = self._scores[lo:hi]
+        # A name has a key per word, so a few more than k keys usually cover k names
+        take = 4 * k
+        while True:
+            best = scores if take >= len(scores) else scores[np.argpartition(scores, take - 1)[:take]]
+            ranks = np.sort(best) % len(self.labels)
+            _, first = np.unique(ranks, return_index=True)
+            if len(first) >= k or take >= len(scores):
+                return ranks[np.sort(first)][:k]
+            take *= 4
+
+    def _precompute(self) -> dict:
+        """Best names of every prefix matching more than SCAN_LIMIT keys, walking down from single letters"""
+        top = {}
+        stack = [("", 0, len(self.keys))]
+        while stack:
+            prefix, lo, hi = stack.pop()
+            i = lo
+            while i < hi:
+                if len(self.keys[i]) == len(prefix):
+                    i += 1
+                    continue
+                child = self.keys[i][:len(prefix) + 1]
+                _, child_hi = self._range(child, i, hi)
+                if child_hi - i > SCAN_LIMIT:
+                    top[child] = self._best(i, child_hi, PRECOMPUTED_K)
+                    stack.append((child, i, child_hi))
+                i = child_hi
+        return top
+
+    def suggest(self, prefix: str, k: int = 8) -> List[Tuple[int, str, str]]:
+        """Up to k (id, label, kind) for names starting with prefix or with a word that does, best first"""
+        prefix = normalize(prefix)
+        if not prefix or k <= 0:
+            return []
+        lo, hi = self._range(prefix)
+        if lo == hi:
+            return []
+        ranks = self._top.get(prefix) if k <= PRECOMPUTED_K else None
+        if ranks is None:
+            ranks = self._best(lo, hi, k)
+        # Labels equal to the prefix come first
+        exact = [int(s) for s in self._scores[lo:bisect.bisect_right(self.keys, prefix, lo, hi)]
+                 if s < len(self.labels)]
+        ranked = list(dict.fromkeys(exact + ranks.tolist()))[:k]
+        return [(int(self.ids[r]), self.labels[r], self.kinds[r]) for r in ranked]
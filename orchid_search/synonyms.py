@@ -0,0 +1,93 @@
+import json
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Color synonyms for better matching
+COLOR_SYNONYMS = {
+    'pink': ['pink', 'rose', 'magenta', 'fuchsia'],
+    'white': ['white', 'cream', 'ivory', 'pale'],
+    'yellow': ['yellow', 'gold', 'golden', 'lemon'],
+    'purple': ['purple', 'violet', 'lavender', 'mauve'],
+    'red': ['red', 'crimson', 'scarlet', 'burgundy'],
+    'orange': ['orange', 'coral', 'peach', 'apricot'],
+    'blue': ['blue', 'azure', 'indigo'],
+    'green': ['green', 'lime', 'chartreuse'],
+}
+
+
+class SynonymIndex:
+    """
+    Precompiled inverted synonym map: term -> synonym groups -> expansions
+
+    Every term of every group (canonical name included) maps to the merged,
+    de-duplicated expansion tuple of all groups it belongs to, so expanding a
+    token is a single dict lookup with a stable order. Multi-word terms such
+    as "hot pink" are matched as phrases over the token stream.
+    """
+
+    def __init__(self, tables: Optional[Dict[str, Dict[str, Sequence[str]]]] = None):
+        if tables is None:
+            tables = {'color': COLOR_SYNONYMS}
+        self._groups: Dict[Tuple[str, str], List[str]] = {}
+        self._expansions: Dict[str, Tuple[str, ...]] = {}
+        self._max_phrase = 1
+        for kind, groups in tables.items():
+            for canonical, terms in groups.items():
+                self.add_group(kind, canonical, terms, rebuild=False)
+        self._rebuild()
+
+    @classmethod
+    def from_file(cls, path: str, include_defaults: bool = True) -> "SynonymIndex":
+        """Build an index from a JSON file of {kind: {canonical: [terms]}} tables"""
+        index = cls() if include_defaults else cls({})
+        index.load_file(path)
+        return index
+
+    def load_file(self, path: str):
+        """Merge extra synonym tables from a JSON file"""
+        with open(path, encoding='utf-8') as f:
+            tables = json.load(f)
+        for kind, groups in tables.items():
+            for canonical, terms in groups.items():
+                self.add_group(kind, canonical, terms, rebuild=False)
+        self._rebuild()
+
+    def add_group(self, kind: str, canonical: str, terms: Iterable[str], rebuild: bool = True):
+        """Add terms to a synonym group, creating the group if needed"""
+        group = self._groups.setdefault((kind, canonical.lower()), [canonical.lower()])
+        for term in terms:
+            term = " ".join(term.lower().split())
+            if term and term not in group:
+                group.append(term)
+        if rebuild:
+            self._rebuild()
+
+    def _rebuild(self):
+        """Recompute the term -> expansions map"""
+        merged: Dict[str, List[str]] = {}
+        for terms in self._groups.values():
+            for term in terms:
+                target = merged.setdefault(term, [term])
+                target.extend(t for t in terms if t not in target)
+        self._expansions = {term: tuple(terms) for term, terms in merged.items()}
+        self._max_phrase = max((len(t.split()) for t in self._expansions), default=1)
+
+    def expand(self, term: str) -> Tuple[str, ...]:
+        """The term followed by all of its synonyms, or just the term"""
+        term = " ".join(term.lower().split())
+        return self._expansions.get(term, (term,))
+
+    def match_phrases(self, tokens: Sequence[str]) -> List[str]:
+        """Merge runs of tokens that form a known multi-word term, longest match first"""
+        merged = []
+        i = 0
+        while i < len(tokens):
+            for length in range(min(self._max_phrase, len(tokens) - i), 1, -1):
+                phrase = " ".join(tokens[i:i + length])
+                if phrase in self._expansions:
+                    merged.append(phrase)
+                    i += length
+                    break
+            else:
+                merged.append(tokens[i])
+                i += 1
+        return merged
@@ -1,14 +1,12 @@
 import streamlit as st
-import sqlite3
-import csv
-import urllib.request
-import pandas as pd
-from typing import List, Dict
 import os
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-from nltk.stem import WordNetLemmatizer
+import uuid
+from orchid_search import OrchidSearchDB
+from orchid_search.bitmap import CATEGORY_COLUMNS
+from orchid_search.instrument import Instrumentation
+from orchid_search.nlp import ensure_nltk_data
+from orchid_search.results import SUMMARY_COLUMNS
+from orchid_search.snapshot import open_snapshot
 
 # Page configuration
 st.set_page_config(
@@ -18,27 +16,29 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Download required NLTK data
+NLP_MODE = os.environ.get("ORCHIDS_NLP_MODE", "nltk")
+
+# Performance panel and slow-query log; with ORCHIDS_INSTRUMENT unset the hooks are no-ops
+INSTRUMENT = os.environ.get("ORCHIDS_INSTRUMENT") == "1"
+SLOW_QUERY_MS = os.environ.get("ORCHIDS_SLOW_MS")
+
+# Time budget per search in ms, 0 for none; a search that runs out shows what it found so far
+SEARCH_BUDGET_MS = float(os.environ.get("ORCHIDS_SEARCH_BUDGET_MS", 3000)) or None
+
+# Category filters of the Advanced Filter tab beyond its Genus and Fragrance boxes
+CATEGORY_FILTER_COLUMNS = [c for c in CATEGORY_COLUMNS if c not in ('Genus', 'Fragrance')]
+
+# Download required NLTK data, once per process and only before the first smart search
 @st.cache_resource
 def download_nltk_data():
-    try:
-        nltk.data.find('tokenizers/punkt')
-    except LookupError:
-        nltk.download('punkt', quiet=True)
-    try:
-        nltk.data.find('corpora/stopwords')
-    except LookupError:
-        nltk.download('stopwords', quiet=True)
-    try:
-        nltk.data.find('corpora/wordnet')
-    except LookupError:
-        nltk.download('wordnet', quiet=True)
-    try:
-        nltk.data.find('tokenizers/punkt_tab')
-    except LookupError:
-        nltk.download('punkt_tab', quiet=True)
+    ensure_nltk_data(NLP_MODE)
 
-download_nltk_data()
+def to_dataframe(rows):
+    """Rows as a DataFrame; pandas is only imported once a table is rendered"""
+    if hasattr(rows, 'to_dataframe'):
+        return rows.to_dataframe()
+    import pandas as pd
+    return pd.DataFrame(rows)
 
 # Custom CSS
 st.markdown("""
@@ -67,476 +67,7 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-class OrchidSearchDB:
-    """SQLite-based orchid database with Full-Text Search and NLP"""
-    
-    def __init__(self, db_path: str = "orchids.db"):
-        self.db_path = db_path
-        self.conn = None
-        self.cursor = None
-        self.lemmatizer = WordNetLemmatizer()
-        self.stop_words = set(stopwords.words('english'))
-        
-        # Color synonyms for better matching
-        self.color_synonyms = {
-            'pink': ['pink', 'rose', 'magenta', 'fuchsia'],
-            'white': ['white', 'cream', 'ivory', 'pale'],
-            'yellow': ['yellow', 'gold', 'golden', 'lemon'],
-            'purple': ['purple', 'violet', 'lavender', 'mauve'],
-            'red': ['red', 'crimson', 'scarlet', 'burgundy'],
-            'orange': ['orange', 'coral', 'peach', 'apricot'],
-            'blue': ['blue', 'azure', 'indigo'],
-            'green': ['green', 'lime', 'chartreuse']
-        }
-        
-        # Region synonyms
-        self.region_synonyms = {
-            'southeast asia': ['southeast asia', 'se asia', 'philippines', 'indonesia', 'thailand', 'vietnam', 'malaysia'],
-            'south america': ['south america', 'brazil', 'colombia', 'ecuador', 'peru'],
-            'central america': ['central america', 'mexico', 'costa rica', 'panama'],
-            'asia': ['asia', 'china', 'japan', 'india', 'taiwan']
-        }
-        
-    def preprocess_text(self, text: str) -> List[str]:
-        """Preprocess text using NLTK"""
-        if not text:
-            return []
-        
-        # Tokenize
-        tokens = word_tokenize(text.lower())
-        
-        # Remove stopwords and lemmatize
-        processed = [
-            self.lemmatizer.lemmatize(token) 
-            for token in tokens 
-            if token.isalnum() and token not in self.stop_words
-        ]
-        
-        return processed
-    
-    def expand_query(self, query: str) -> List[str]:
-        """Expand query with synonyms"""
-        query_lower = query.lower().strip()
-        expanded = [query_lower]
-        
-        # Check color synonyms
-        for color, synonyms in self.color_synonyms.items():
-            if query_lower in synonyms:
-                expanded.extend(synonyms)
-                break
-        
-        # Check region synonyms
-        for region, synonyms in self.region_synonyms.items():
-            if query_lower in region or query_lower in synonyms:
-                expanded.extend(synonyms)
-                break
-        
-        return list(set(expanded))
-        
-    def connect(self):
-        """Establish database connection"""
-        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
-        self.conn.row_factory = sqlite3.Row
-        self.cursor = self.conn.cursor()
-        
-    def close(self):
-        """Close database connection"""
-        if self.conn:
-            self.conn.close()
-            
-    def create_tables(self):
-        """Create main table and FTS5 virtual table"""
-        # Main orchid data table
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS orchids (
-                id INTEGER PRIMARY KEY,
-                Species_Key INTEGER,
-                Scientific_Name TEXT,
-                Canonical_Name TEXT,
-                Genus TEXT,
-                Species_Epithet TEXT,
-                Author TEXT,
-                Taxonomic_Status TEXT,
-                Kingdom TEXT,
-                Family TEXT,
-                Subfamily TEXT,
-                Order_Name TEXT,
-                Growth_Habit TEXT,
-                Flower_Size_cm TEXT,
-                Flower_Color TEXT,
-                Petal_Shape TEXT,
-                Petal_Count TEXT,
-                Lip_Shape TEXT,
-                Lip_Color TEXT,
-                Column_Structure TEXT,
-                Fragrance TEXT,
-                Fragrance_Description TEXT,
-                Blooming_Season TEXT,
-                Bloom_Duration_Weeks TEXT,
-                Flowers_Per_Spike TEXT,
-                Spike_Length_cm TEXT,
-                Light_Requirement_FC TEXT,
-                Light_Description TEXT,
-                Temperature_Min_C REAL,
-                Temperature_Max_C REAL,
-                Temperature_Preference TEXT,
-                Humidity_Min_Percent INTEGER,
-                Humidity_Max_Percent INTEGER,
-                Watering_Frequency TEXT,
-                Fertilizer_Requirement TEXT,
-                Potting_Media TEXT,
-                Pseudobulb TEXT,
-                Pseudobulb_Shape TEXT,
-                Stem_Type TEXT,
-                Stem_Length_cm TEXT,
-                Leaf_Type TEXT,
-                Leaf_Length_cm TEXT,
-                Leaf_Color TEXT,
-                Leaf_Arrangement TEXT,
-                Root_Type TEXT,
-                Root_Color TEXT,
-                Pollination_Type TEXT,
-                Pollination_Mechanism TEXT,
-                Seed_Type TEXT,
-                Propagation_Method TEXT,
-                Native_Habitat TEXT,
-                Native_Regions TEXT,
-                Elevation_Min_m INTEGER,
-                Elevation_Max_m INTEGER,
-                Climate_Type TEXT,
-                Rainfall_Requirement TEXT,
-                Air_Movement TEXT,
-                Mycorrhizal_Association TEXT,
-                Conservation_Status TEXT,
-                Threatened_Level TEXT,
-                Horticultural_Difficulty TEXT,
-                Horticultural_Notes TEXT,
-                Commercial_Importance TEXT,
-                Breeding_Potential TEXT,
-                Disease_Susceptibility TEXT,
-                Pest_Susceptibility TEXT,
-                Special_Features TEXT,
-                Cultural_Significance TEXT,
-                Common_Names TEXT,
-                Etymology TEXT
-            )
-        """)
-        
-        # FTS5 virtual table for full-text search
-        self.cursor.execute("""
-            CREATE VIRTUAL TABLE IF NOT EXISTS orchids_fts USING fts5(
-                Scientific_Name,
-                Genus,
-                Flower_Color,
-                Petal_Shape,
-                Lip_Color,
-                Fragrance_Description,
-                Blooming_Season,
-                Temperature_Preference,
-                Native_Habitat,
-                Native_Regions,
-                Special_Features,
-                Common_Names,
-                Horticultural_Notes,
-                content=orchids,
-                content_rowid=id
-            )
-        """)
-        
-        # Create indexes for optimized filtering
-        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_genus ON orchids(Genus)")
-        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_flower_color ON orchids(Flower_Color)")
-        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_temp ON orchids(Temperature_Min_C, Temperature_Max_C)")
-        
-        self.conn.commit()
-        
-    def load_data_from_url(self, url: str):
-        """Load CSV data from URL and populate database"""
-        with urllib.request.urlopen(url) as response:
-            lines = [line.decode('utf-8') for line in response.readlines()]
-        
-        reader = csv.DictReader(lines)
-        
-        # Get the actual column names from CSV
-        csv_columns = reader.fieldnames
-        
-        count = 0
-        for row in reader:
-            # Build dynamic INSERT query based on CSV columns
-            columns = []
-            values = []
-            
-            for col in csv_columns:
-                # Map CSV column names to database column names
-                db_col = col
-                if col == 'Order':
-                    db_col = 'Order_Name'  # 'Order' is a SQL keyword
-                
-                columns.append(db_col)
-                values.append(row[col])
-            
-            placeholders = ', '.join(['?' for _ in columns])
-            columns_str = ', '.join(columns)
-            
-            self.cursor.execute(f"""
-                INSERT INTO orchids ({columns_str})
-                VALUES ({placeholders})
-            """, values)
-            count += 1
-            
-        self.conn.commit()
-        
-        # Populate FTS table manually
-        print("Building FTS index...")
-        self.cursor.execute("""
-            INSERT INTO orchids_fts (rowid, Scientific_Name, Genus, Flower_Color, 
-                                     Petal_Shape, Lip_Color, Fragrance_Description,
-                                     Blooming_Season, Temperature_Preference, 
-                                     Native_Habitat, Native_Regions, Special_Features,
-                                     Common_Names, Horticultural_Notes)
-            SELECT id, Scientific_Name, Genus, Flower_Color, 
-                   Petal_Shape, Lip_Color, Fragrance_Description,
-                   Blooming_Season, Temperature_Preference, 
-                   Native_Habitat, Native_Regions, Special_Features,
-                   Common_Names, Horticultural_Notes
-            FROM orchids
-        """)
-        self.conn.commit()
-        print(f"FTS index built for {count} records")
-        
-        return count
-    
-    def intelligent_search(self, query: str, limit: int = 50) -> List[Dict]:
-        """
-        Intelligent semantic search that understands natural language queries
-        Example: "pink fragrant orchids from Southeast Asia"
-        """
-        if not query:
-            return []
-        
-        # Preprocess and extract keywords
-        tokens = self.preprocess_text(query)
-        
-        # Build comprehensive search conditions
-        conditions = []
-        params = []
-        
-        # Search across all text fields
-        for token in tokens:
-            # Expand token with synonyms
-            expanded_terms = self.expand_query(token)
-            
-            token_conditions = []
-            for term in expanded_terms:
-                search_term = f"%{term}%"
-                token_conditions.append("""
-                    (Scientific_Name LIKE ? OR 
-                     Genus LIKE ? OR 
-                     Flower_Color LIKE ? OR 
-                     Common_Names LIKE ? OR 
-                     Native_Regions LIKE ? OR 
-                     Native_Habitat LIKE ? OR
-                     Special_Features LIKE ? OR 
-                     Fragrance LIKE ? OR
-                     Fragrance_Description LIKE ? OR
-                     Petal_Shape LIKE ? OR
-                     Lip_Color LIKE ? OR
-                     Temperature_Preference LIKE ? OR
-                     Blooming_Season LIKE ? OR
-                     Horticultural_Notes LIKE ? OR
-                     Growth_Habit LIKE ?)
-                """)
-                params.extend([search_term] * 15)
-            
-            if token_conditions:
-                conditions.append("(" + " OR ".join(token_conditions) + ")")
-        
-        if not conditions:
-            return []
-        
-        # Combine all conditions
-        where_clause = " OR ".join(conditions)
-        
-        sql = f"""
-            SELECT *, 
-                   (CASE 
-                        WHEN Scientific_Name LIKE ? THEN 10
-                        WHEN Genus LIKE ? THEN 8
-                        WHEN Common_Names LIKE ? THEN 7
-                        WHEN Flower_Color LIKE ? THEN 6
-                        ELSE 1
-                    END) as relevance_score
-            FROM orchids 
-            WHERE {where_clause}
-            ORDER BY relevance_score DESC
-            LIMIT ?
-        """
-        
-        # Add params for relevance scoring
-        first_term = f"%{tokens[0]}%" if tokens else "%"
-        score_params = [first_term] * 4
-        
-        self.cursor.execute(sql, params + score_params + [limit])
-        return [dict(row) for row in self.cursor.fetchall()]
-        
-    def fulltext_search(self, query: str, limit: int = 50) -> List[Dict]:
-        """Perform full-text search using FTS5 MATCH syntax"""
-        try:
-            query = query.strip()
-            if not query:
-                return []
-            
-            sql = """
-                SELECT o.*
-                FROM orchids o
-                WHERE o.id IN (
-                    SELECT rowid FROM orchids_fts 
-                    WHERE orchids_fts MATCH ?
-                )
-                LIMIT ?
-            """
-            self.cursor.execute(sql, (query, limit))
-            return [dict(row) for row in self.cursor.fetchall()]
-        except Exception as e:
-            print(f"FTS search failed: {e}")
-            return self.fallback_search(query, limit)
-    
-    def fallback_search(self, query: str, limit: int = 50) -> List[Dict]:
-        """Fallback search using LIKE when FTS fails"""
-        sql = """
-            SELECT * FROM orchids 
-            WHERE Scientific_Name LIKE ? 
-               OR Genus LIKE ?
-               OR Flower_Color LIKE ?
-               OR Common_Names LIKE ?
-               OR Native_Regions LIKE ?
-               OR Special_Features LIKE ?
-            LIMIT ?
-        """
-        search_term = f"%{query}%"
-        self.cursor.execute(sql, (search_term, search_term, search_term, 
-                                  search_term, search_term, search_term, limit))
-        return [dict(row) for row in self.cursor.fetchall()]
-    
-    def semantic_search(self, limit: int = 50, **filters) -> List[Dict]:
-        """Search with semantic filters"""
-        conditions = []
-        params = []
-        
-        if 'genus' in filters and filters['genus']:
-            conditions.append("Genus LIKE ?")
-            params.append(f"%{filters['genus']}%")
-            
-        if 'flower_color' in filters and filters['flower_color']:
-            conditions.append("Flower_Color LIKE ?")
-            params.append(f"%{filters['flower_color']}%")
-            
-        if 'min_temp' in filters and filters['min_temp'] is not None:
-            conditions.append("Temperature_Min_C >= ?")
-            params.append(filters['min_temp'])
-            
-        if 'max_temp' in filters and filters['max_temp'] is not None:
-            conditions.append("Temperature_Max_C <= ?")
-            params.append(filters['max_temp'])
-            
-        if 'native_region' in filters and filters['native_region']:
-            conditions.append("Native_Regions LIKE ?")
-            params.append(f"%{filters['native_region']}%")
-            
-        if 'fragrance' in filters and filters['fragrance']:
-            if filters['fragrance'].lower() == 'fragrant':
-                conditions.append("(Fragrance LIKE ? OR Fragrance LIKE ?)")
-                params.extend(['%fragrant%', '%Fragrant%'])
-            else:
-                conditions.append("Fragrance LIKE ?")
-                params.append(f"%{filters['fragrance']}%")
-        
-        if 'difficulty' in filters and filters['difficulty']:
-            conditions.append("Horticultural_Difficulty LIKE ?")
-            params.append(f"%{filters['difficulty']}%")
-            
-        where_clause = " AND ".join(conditions) if conditions else "1=1"
-        
-        sql = f"SELECT * FROM orchids WHERE {where_clause} LIMIT ?"
-        params.append(limit)
-        
-        self.cursor.execute(sql, params)
-        return [dict(row) for row in self.cursor.fetchall()]
-    
-    def combined_search(self, text_query: str = None, limit: int = 50, **filters) -> List[Dict]:
-        """Combine full-text search with semantic filters"""
-        conditions = []
-        params = []
-        
-        base_query = "SELECT * FROM orchids WHERE 1=1"
-        
-        if text_query:
-            text_conditions = []
-            search_term = f"%{text_query}%"
-            text_conditions.append("(Scientific_Name LIKE ? OR Genus LIKE ? OR Flower_Color LIKE ? OR Common_Names LIKE ? OR Native_Regions LIKE ? OR Special_Features LIKE ? OR Fragrance_Description LIKE ?)")
-            params.extend([search_term] * 7)
-            if text_conditions:
-                conditions.append(" OR ".join(text_conditions))
-        
-        if 'genus' in filters and filters['genus']:
-            conditions.append("Genus LIKE ?")
-            params.append(f"%{filters['genus']}%")
-            
-        if 'flower_color' in filters and filters['flower_color']:
-            conditions.append("Flower_Color LIKE ?")
-            params.append(f"%{filters['flower_color']}%")
-            
-        if 'native_region' in filters and filters['native_region']:
-            conditions.append("Native_Regions LIKE ?")
-            params.append(f"%{filters['native_region']}%")
-            
-        if 'fragrance' in filters and filters['fragrance']:
-            conditions.append("(Fragrance LIKE ? OR Fragrance_Description LIKE ?)")
-            params.extend([f"%{filters['fragrance']}%", f"%{filters['fragrance']}%"])
-        
-        if 'min_temp' in filters and filters['min_temp'] is not None:
-            conditions.append("Temperature_Min_C >= ?")
-            params.append(filters['min_temp'])
-            
-        if 'max_temp' in filters and filters['max_temp'] is not None:
-            conditions.append("Temperature_Max_C <= ?")
-            params.append(filters['max_temp'])
-        
-        if 'difficulty' in filters and filters['difficulty']:
-            conditions.append("Horticultural_Difficulty LIKE ?")
-            params.append(f"%{filters['difficulty']}%")
-        
-        if conditions:
-            base_query += " AND (" + " AND ".join(conditions) + ")"
-        
-        base_query += f" LIMIT ?"
-        params.append(limit)
-        
-        self.cursor.execute(base_query, params)
-        return [dict(row) for row in self.cursor.fetchall()]
-    
-    def get_statistics(self) -> Dict:
-        """Get database statistics"""
-        stats = {}
-        
-        self.cursor.execute("SELECT COUNT(*) as count FROM orchids")
-        stats['total'] = self.cursor.fetchone()['count']
-        
-        self.cursor.execute("SELECT COUNT(DISTINCT Genus) as count FROM orchids")
-        stats['genera'] = self.cursor.fetchone()['count']
-        
-        self.cursor.execute("SELECT COUNT(DISTINCT Flower_Color) as count FROM orchids")
-        stats['colors'] = self.cursor.fetchone()['count']
-        
-        self.cursor.execute("SELECT COUNT(DISTINCT Native_Regions) as count FROM orchids")
-        stats['regions'] = self.cursor.fetchone()['count']
-        
-        return stats
-    
-    def get_unique_values(self, column: str) -> List[str]:
-        """Get unique values for a column"""
-        self.cursor.execute(f"SELECT DISTINCT {column} FROM orchids WHERE {column} IS NOT NULL ORDER BY {column}")
-        return [row[0] for row in self.cursor.fetchall()]
+DATA_URL = "https://raw.githubusercontent.com/rashadul-se/orchids/refs/heads/main/orchid_complete_dataset_67fields_2025-11-16.csv"
 
 # Initialize session state
 if 'db' not in st.session_state:
@@ -546,22 +77,70 @@ if 'db' not in st.session_state:
 # Initialize database
 @st.cache_resource
 def init_database():
-    db = OrchidSearchDB()
+    options = dict(pool_size=int(os.environ.get("ORCHIDS_POOL_SIZE", 4)),
+                   nlp_mode=NLP_MODE,
+                   synonyms_path=os.environ.get("ORCHIDS_SYNONYMS"),
+                   bitmap_index=os.environ.get("ORCHIDS_BITMAP_INDEX") == "1",
+                   instrumentation=Instrumentation(
+                       enabled=INSTRUMENT,
+                       slow_ms=float(SLOW_QUERY_MS) if SLOW_QUERY_MS else None,
+                       slow_log_path=os.environ.get("ORCHIDS_SLOW_LOG"),
+                       explain=os.environ.get("ORCHIDS_EXPLAIN") == "1"))
+    
+    # Prebuilt snapshot (python -m orchid_search.snapshot): open read-only, no load or index build
+    snapshot = os.environ.get("ORCHIDS_SNAPSHOT")
+    if snapshot:
+        try:
+            db = open_snapshot(snapshot, **options)
+            return db, True, db.count()
+        except Exception as e:
+            return None, False, str(e)
+    
+    db = OrchidSearchDB(**options)
     db.connect()
     db.create_tables()
     
-    db.cursor.execute("SELECT COUNT(*) as count FROM orchids")
-    count = db.cursor.fetchone()['count']
+    count = db.count()
     
     if count == 0:
         try:
-            url = "https://raw.githubusercontent.com/rashadul-se/orchids/refs/heads/main/orchid_complete_dataset_67fields_2025-11-16.csv"
-            count = db.load_data_from_url(url)
+            count = db.load_data_from_url(DATA_URL)
+            db.build_similarity_index()
             return db, True, count
         except Exception as e:
             return db, False, str(e)
     return db, True, count
 
+def show_similar_species(orchid: dict, k: int = 5):
+    """Similar species for a detail expander, one lookup in the precomputed index"""
+    similar = db.similar_orchids(orchid['id'], k=k) if orchid.get('id') is not None else []
+    if similar:
+        st.markdown("**🌿 Similar species**")
+        st.write(" · ".join(f"{s.get('Scientific_Name', 'Unknown')} ({s['similarity']:.0%})" for s in similar))
+
+def _fill(key: str, value: str):
+    st.session_state[key] = value
+
+def show_suggestions(key: str, quote: bool = False, k: int = 6):
+    """Species, genus and common names completing a search box, as buttons that fill it in"""
+    text = st.session_state.get(key) or ""
+    suggestions = db.suggest(text, k) if text.strip() else []
+    if suggestions:
+        for button_col, (orchid_id, label, kind) in zip(st.columns(len(suggestions)), suggestions):
+            with button_col:
+                value = f'"{label}"' if quote and " " in label else label
+                st.button(label, key=f"{key}_suggest_{orchid_id}_{kind}", help=kind.replace('_', ' '),
+                          on_click=_fill, args=(key, value))
+
+def run_search(search, *args, **kwargs):
+    """Run a search within SEARCH_BUDGET_MS, cancelling this session's previous search if it still runs"""
+    session = st.session_state.setdefault("query_session", uuid.uuid4().hex)
+    with db.sessions.query(session) as cancel:
+        results = search(*args, budget_ms=SEARCH_BUDGET_MS, cancel=cancel, **kwargs)
+    if (results[0] if isinstance(results, tuple) else results).truncated:
+        st.info("⏱️ The search was cut short; these are the best matches found by then")
+    return results
+
 db, data_loaded, load_info = init_database()
 st.session_state.db = db
 st.session_state.data_loaded = data_loaded
@@ -590,17 +169,41 @@ with st.sidebar:
             st.metric("Flower Colors", stats['colors'])
             st.metric("Native Regions", stats['regions'])
         
+        if db.cache is not None:
+            cache_stats = db.cache.stats()
+            st.caption(f"⚡ Query cache: {cache_stats['hits']} hits · {cache_stats['misses']} misses · "
+                       f"{cache_stats['size']}/{cache_stats['maxsize']} entries")
+
+        if db.bitmap_index:
+            bitmap_memory = db.bitmap_memory()
+            st.caption(f"🧮 Category bitmaps: {bitmap_memory['bytes'] / 2**20:.1f} MiB for "
+                       f"{bitmap_memory['rows']} rows")
+
         st.markdown("---")
-        if st.button("🔄 Reset Database", help="Clear all data and reload"):
-            try:
-                db.cursor.execute("DELETE FROM orchids")
-                db.cursor.execute("DELETE FROM orchids_fts")
-                db.conn.commit()
-                st.cache_resource.clear()
-                st.success("Database reset! Refreshing...")
-                st.rerun()
-            except Exception as e:
-                st.error(f"Error: {str(e)}")
+        if db.read_only:
+            st.caption(f"📦 Read-only snapshot: {os.path.basename(db.db_path)}")
+        else:
+            if st.button("🔁 Refresh Dataset", help="Apply only the rows that changed in the source CSV"):
+                try:
+                    changes = db.sync_data(DATA_URL, delete_missing=True)
+                    if changes['inserted'] or changes['updated'] or changes['deleted']:
+                        db.build_similarity_index()
+                    st.success(f"Refreshed: {changes['inserted']} added, {changes['updated']} updated, "
+                               f"{changes['deleted']} removed")
+                    if changes['missing_key'] or changes['duplicate_key']:
+                        st.warning(f"Skipped {changes['missing_key']} rows without a Species_Key and "
+                                   f"{changes['duplicate_key']} rows repeating one")
+                except Exception as e:
+                    st.error(f"Error: {str(e)}")
+        
+            if st.button("🔄 Reset Database", help="Clear all data and reload"):
+                try:
+                    db.clear_data()
+                    st.cache_resource.clear()
+                    st.success("Database reset! Refreshing...")
+                    st.rerun()
+                except Exception as e:
+                    st.error(f"Error: {str(e)}")
     else:
         st.error("❌ Failed to load database")
         if isinstance(load_info, str):
@@ -627,10 +230,10 @@ with st.sidebar:
 
 # Main content
 if st.session_state.data_loaded:
-    tabs = st.tabs(["🧠 Smart Search", "🔍 Full-Text", "🎯 Advanced Filter", "🔗 Combined", "📊 Browse"])
+    tabs = st.tabs(["🧠 Smart Search", "🔍 Full-Text", "🎯 Advanced Filter", "🔗 Combined", "🪴 Recommend", "📊 Browse"])
     
     # Tab 1: Smart Semantic Search
-    with tabs[0]:
+    with tabs[0], db.instrumentation.trace("Smart Search tab", remainder="render"):
         st.markdown('<div class="search-box">', unsafe_allow_html=True)
         st.markdown("### 🧠 Intelligent Semantic Search")
         st.info("💡 Just describe what you're looking for in natural language!")
@@ -662,21 +265,28 @@ if st.session_state.data_loaded:
         if smart_query and smart_search_btn:
             with st.spinner("🤖 Analyzing your query..."):
                 try:
-                    results = db.intelligent_search(smart_query, limit=50)
+                    download_nltk_data()
+                    results = run_search(db.intelligent_search, smart_query, limit=50, columns=SUMMARY_COLUMNS)
                     
                     if results:
                         st.success(f"✅ Found {len(results)} matching orchids")
                         
-                        tokens = db.preprocess_text(smart_query)
+                        analysis = db.analyze_query(smart_query)
                         with st.expander("🔍 Query Analysis"):
-                            st.write(f"**Keywords:** {', '.join(tokens)}")
+                            st.write(f"**Keywords:** {', '.join(analysis.tokens)}")
                             expanded = []
-                            for token in tokens[:3]:
-                                exp = db.expand_query(token)
+                            for token in analysis.tokens[:3]:
+                                exp = analysis.expanded_terms(token)
                                 if len(exp) > 1:
                                     expanded.append(f"{token} → {', '.join(exp[:3])}")
                             if expanded:
                                 st.write(f"**Expanded:** {' | '.join(expanded)}")
+                            if analysis.regions:
+                                regions = []
+                                for region in dict.fromkeys(analysis.regions.values()):
+                                    within = len(db.resolve_regions(region)) - 1
+                                    regions.append(f"{region} (+{within} within)" if within else region)
+                                st.write(f"**Regions:** {', '.join(regions)}")
                         
                         for i, result in enumerate(results[:20], 1):
                             relevance = result.get('relevance_score', 1)
@@ -705,21 +315,29 @@ if st.session_state.data_loaded:
                                 
                                 if result.get('Special_Features'):
                                     st.info(f"✨ {result['Special_Features']}")
+                                
+                                show_similar_species(result)
                     else:
-                        st.warning("No results found. Try different keywords.")
+                        suggestion = db.did_you_mean(smart_query)
+                        if suggestion:
+                            st.warning(f"No results found. Did you mean: **{suggestion}**?")
+                        else:
+                            st.warning("No results found. Try different keywords.")
                 except Exception as e:
                     st.error(f"Error: {str(e)}")
     
     # Tab 2: Full-Text Search
-    with tabs[1]:
+    with tabs[1], db.instrumentation.trace("Full-Text tab", remainder="render"):
         st.markdown("### 🔍 Full-Text Search (FTS5)")
-        fts_query = st.text_input("Search query", placeholder="e.g., pink AND fragrant")
+        fts_query = st.text_input("Search query", placeholder="e.g., pink AND fragrant", key="fts_query",
+                                  help="Names starting with what you typed are suggested below")
+        show_suggestions("fts_query", quote=True)
         
         if st.button("Search", type="primary"):
-            results = db.fulltext_search(fts_query, limit=50)
+            results = run_search(db.fulltext_search, fts_query, limit=50, columns=SUMMARY_COLUMNS)
             if results:
                 st.success(f"Found {len(results)} orchids")
-                df = pd.DataFrame(results)
+                df = to_dataframe(results)
                 
                 # Display as table
                 display_cols = ['Scientific_Name', 'Genus', 'Flower_Color', 'Native_Regions', 
@@ -741,33 +359,82 @@ if st.session_state.data_loaded:
                             st.write(f"**Temperature:** {r.get('Temperature_Min_C', 'N/A')}-{r.get('Temperature_Max_C', 'N/A')}°C")
                             st.write(f"**Humidity:** {r.get('Humidity_Min_Percent', 'N/A')}-{r.get('Humidity_Max_Percent', 'N/A')}%")
                             st.write(f"**Difficulty:** {r.get('Horticultural_Difficulty', 'N/A')}")
+                        show_similar_species(r)
             else:
                 st.warning("No results found")
     
     # Tab 3: Advanced Filter
-    with tabs[2]:
+    with tabs[2], db.instrumentation.trace("Advanced Filter tab", remainder="render"):
         st.markdown("### 🎯 Advanced Filter")
         
         col1, col2, col3 = st.columns(3)
         with col1:
-            genus = st.selectbox("Genus", [""] + db.get_unique_values("Genus"))
-            flower_color = st.text_input("Flower Color")
+            facet_counts = db.get_facets(["Genus", "Flower_Color", "Native_Regions"])
+            genus_counts = dict(facet_counts["Genus"])
+            genus = st.selectbox("Genus", [""] + sorted(genus_counts),
+                                 format_func=lambda g: f"{g} ({genus_counts[g]})" if g else "")
+            color_counts = dict(facet_counts["Flower_Color"])
+            flower_color = st.multiselect("Flower Color", sorted(color_counts),
+                                          format_func=lambda c: f"{c} ({color_counts[c]})")
         with col2:
-            native_region = st.text_input("Native Region")
+            region_counts = dict(facet_counts["Native_Regions"])
+            native_region = st.multiselect("Native Region", sorted(region_counts),
+                                           format_func=lambda r: f"{r} ({region_counts[r]})")
             fragrance = st.selectbox("Fragrance", ["", "Fragrant", "Slightly fragrant"])
         with col3:
             min_temp = st.number_input("Min Temp (°C)", value=None)
             max_temp = st.number_input("Max Temp (°C)", value=None)
         
+        with st.expander("📏 More ranges"):
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                min_humidity = st.number_input("Min Humidity (%)", value=None)
+                max_humidity = st.number_input("Max Humidity (%)", value=None)
+            with col2:
+                min_light = st.number_input("Min Light (fc)", value=None)
+                max_light = st.number_input("Max Light (fc)", value=None)
+            with col3:
+                min_size = st.number_input("Min Flower Size (cm)", value=None)
+                max_size = st.number_input("Max Flower Size (cm)", value=None)
+            with col4:
+                min_elevation = st.number_input("Min Elevation (m)", value=None)
+                max_elevation = st.number_input("Max Elevation (m)", value=None)
+        
+        with st.expander("🏷️ Categories"):
+            category_counts = db.category_facets(columns=CATEGORY_FILTER_COLUMNS)
+            categories = {}
+            for category_col, column in zip(st.columns(len(CATEGORY_FILTER_COLUMNS)), CATEGORY_FILTER_COLUMNS):
+                with category_col:
+                    counts = dict(category_counts[column])
+                    chosen = st.multiselect(column.replace('_', ' '), sorted(counts),
+                                            format_func=lambda v, counts=counts: f"{v} ({counts[v]})")
+                    if chosen:
+                        categories[column] = chosen
+        
         if st.button("Apply Filters", type="primary"):
-            results = db.semantic_search(
+            results, facets = run_search(
+                db.semantic_search_with_facets,
                 genus=genus, flower_color=flower_color, native_region=native_region,
-                fragrance=fragrance, min_temp=min_temp, max_temp=max_temp, limit=50
+                fragrance=fragrance, categories=categories, min_temp=min_temp, max_temp=max_temp,
+                min_humidity=min_humidity, max_humidity=max_humidity,
+                min_light=min_light, max_light=max_light,
+                min_size=min_size, max_size=max_size,
+                min_elevation=min_elevation, max_elevation=max_elevation, limit=50,
+                columns=SUMMARY_COLUMNS
             )
             
             if results:
                 st.success(f"Found {len(results)} orchids")
-                df = pd.DataFrame(results)
+                
+                # Live facet counts over every match, not just the rows shown
+                facet_cols = st.columns(len(facets))
+                for facet_col, (column, counts) in zip(facet_cols, facets.items()):
+                    with facet_col:
+                        st.markdown(f"**{column.replace('_', ' ')}**")
+                        for value, count in counts[:5]:
+                            st.caption(f"{value} ({count})")
+                
+                df = to_dataframe(results)
                 
                 # Display as table
                 display_cols = ['Scientific_Name', 'Genus', 'Flower_Color', 'Native_Regions', 
@@ -789,29 +456,33 @@ if st.session_state.data_loaded:
                             st.write(f"**Temperature:** {r.get('Temperature_Min_C', 'N/A')}-{r.get('Temperature_Max_C', 'N/A')}°C")
                             st.write(f"**Humidity:** {r.get('Humidity_Min_Percent', 'N/A')}-{r.get('Humidity_Max_Percent', 'N/A')}%")
                             st.write(f"**Difficulty:** {r.get('Horticultural_Difficulty', 'N/A')}")
+                        show_similar_species(r)
             else:
                 st.warning("No results found with these filters")
     
     # Tab 4: Combined Search
-    with tabs[3]:
+    with tabs[3], db.instrumentation.trace("Combined tab", remainder="render"):
         st.markdown("### 🔗 Combined Search")
         st.info("Combine text search with filters for precise results")
         
-        combined_text = st.text_input("Text search", placeholder="e.g., fragrant")
+        combined_text = st.text_input("Text search", placeholder="e.g., fragrant", key="combined_text",
+                                      help="Names starting with what you typed are suggested below")
+        show_suggestions("combined_text")
         
         col1, col2, col3 = st.columns(3)
         with col1:
             comb_genus = st.text_input("Filter by Genus")
             comb_color = st.text_input("Filter by Color")
         with col2:
-            comb_region = st.text_input("Filter by Region")
+            comb_region = st.text_input("Filter by Region", help="Includes every region within it, e.g. Asia or Borneo")
             comb_fragrance = st.text_input("Filter by Fragrance")
         with col3:
             comb_min_temp = st.number_input("Min Temperature (°C)", value=None, key="comb_min")
             comb_max_temp = st.number_input("Max Temperature (°C)", value=None, key="comb_max")
         
         if st.button("🔍 Combined Search", type="primary"):
-            results = db.combined_search(
+            results = run_search(
+                db.combined_search,
                 text_query=combined_text,
                 genus=comb_genus,
                 flower_color=comb_color,
@@ -826,7 +497,7 @@ if st.session_state.data_loaded:
                 st.success(f"Found {len(results)} orchids")
                 
                 # Create DataFrame for display
-                df = pd.DataFrame(results)
+                df = to_dataframe(results)
                 display_cols = ['Scientific_Name', 'Genus', 'Flower_Color', 'Fragrance', 
                                'Native_Regions', 'Temperature_Min_C', 'Temperature_Max_C']
                 available_cols = [col for col in display_cols if col in df.columns]
@@ -876,90 +547,161 @@ if st.session_state.data_loaded:
                         
                         if r.get('Horticultural_Notes'):
                             st.success(f"📝 **Care Notes:** {r['Horticultural_Notes']}")
+                        
+                        show_similar_species(r)
             else:
                 st.warning("No results found")
     
-    # Tab 5: Browse All
-    with tabs[4]:
-        st.markdown("### 📊 Browse Database")
+    # Tab 5: Recommendations for the user's growing conditions
+    with tabs[4], db.instrumentation.trace("Recommend tab", remainder="render"):
+        st.markdown("### 🪴 Recommend for My Conditions")
+        st.info("Rank every orchid by how well it fits your temperature, humidity, light and experience")
         
-        # Get all data with pagination
-        page_size = st.selectbox("Results per page", [10, 25, 50, 100], index=1)
-        
-        # Get total count
-        db.cursor.execute("SELECT COUNT(*) as count FROM orchids")
-        total_records = db.cursor.fetchone()['count']
-        total_pages = (total_records + page_size - 1) // page_size
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            rec_temp = st.number_input("Temperature (°C)", value=22.0, step=0.5)
+        with col2:
+            rec_humidity = st.number_input("Humidity (%)", value=60.0, min_value=0.0, max_value=100.0, step=5.0)
+        with col3:
+            rec_light = st.number_input("Light (foot-candles)", value=1500.0, min_value=0.0, step=100.0)
+        with col4:
+            rec_skill = st.selectbox("Experience", ["beginner", "intermediate", "expert"])
+        rec_k = st.slider("Number of recommendations", 5, 50, 10)
         
-        page = st.number_input("Page", min_value=1, max_value=total_pages, value=1)
-        offset = (page - 1) * page_size
+        if st.button("🪴 Recommend", type="primary"):
+            results = db.recommend_for_environment(rec_temp, rec_humidity, rec_light, skill=rec_skill, k=rec_k)
+            
+            if results:
+                df = to_dataframe(results)
+                display_cols = ['match_score', 'Scientific_Name', 'Genus', 'Flower_Color',
+                               'Temperature_Min_C', 'Temperature_Max_C', 'Humidity_Min_Percent',
+                               'Humidity_Max_Percent', 'Light_Requirement_FC', 'Horticultural_Difficulty']
+                available_cols = [col for col in display_cols if col in df.columns]
+                st.dataframe(df[available_cols], use_container_width=True)
+            else:
+                st.warning("No orchids to recommend")
+    
+    # Tab 6: Browse All
+    with tabs[5], db.instrumentation.trace("Browse tab", remainder="render"):
+        st.markdown("### 📊 Browse Database")
         
         # Sorting options
-        sort_col = st.selectbox("Sort by", ["Scientific_Name", "Genus", "Flower_Color", 
-                                            "Temperature_Min_C", "Native_Regions"])
-        sort_order = st.radio("Order", ["Ascending", "Descending"], horizontal=True)
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            sort_col = st.selectbox("Sort by", ["Scientific_Name", "Genus", "Flower_Color", 
+                                                "Temperature_Min_C", "Native_Regions"])
+        with col2:
+            sort_order = st.radio("Order", ["Ascending", "Descending"], horizontal=True)
+        with col3:
+            page_size = st.selectbox("Results per page", [10, 25, 50, 100], index=1)
         order = "ASC" if sort_order == "Ascending" else "DESC"
         
-        if st.button("📊 Load Data", type="primary"):
-            sql = f"SELECT * FROM orchids ORDER BY {sort_col} {order} LIMIT ? OFFSET ?"
-            db.cursor.execute(sql, (page_size, offset))
-            results = [dict(row) for row in db.cursor.fetchall()]
+        # Keyset pagination: the cursor of the current page lives in the session
+        # and starts over whenever the sort or page size changes
+        browse_key = (sort_col, order, page_size)
+        if st.session_state.get('browse_key') != browse_key:
+            st.session_state.browse_key = browse_key
+            st.session_state.browse_cursor = None
+            st.session_state.browse_page_number = 1
+        
+        page_data = db.browse_page(sort_col, order, limit=page_size, cursor=st.session_state.browse_cursor)
+        results = page_data.rows
+        total_records = db.count()
+        total_pages = max(1, (total_records + page_size - 1) // page_size)
+        
+        def go_to(cursor, step):
+            st.session_state.browse_cursor = cursor
+            st.session_state.browse_page_number += step
+        
+        col1, col2, col3 = st.columns([1, 3, 1])
+        with col1:
+            st.button("◀ Previous", disabled=page_data.prev_cursor is None,
+                      on_click=go_to, args=(page_data.prev_cursor, -1))
+        with col2:
+            st.caption(f"Page {st.session_state.browse_page_number} of {total_pages} · {total_records} records")
+        with col3:
+            st.button("Next ▶", disabled=page_data.next_cursor is None,
+                      on_click=go_to, args=(page_data.next_cursor, 1))
+        
+        if results:
+            df = to_dataframe(results)
             
-            if results:
-                st.info(f"Showing {offset + 1} to {min(offset + page_size, total_records)} of {total_records} records")
+            # Select columns to display
+            all_columns = list(df.columns)
+            default_cols = ['Scientific_Name', 'Genus', 'Flower_Color', 'Native_Regions', 
+                           'Temperature_Min_C', 'Temperature_Max_C', 'Fragrance', 'Horticultural_Difficulty']
+            available_default = [col for col in default_cols if col in all_columns]
+            
+            selected_cols = st.multiselect(
+                "Select columns to display",
+                all_columns,
+                default=available_default
+            )
+            
+            if selected_cols:
+                st.dataframe(df[selected_cols], use_container_width=True)
                 
-                df = pd.DataFrame(results)
+                # Download option
+                csv = df[selected_cols].to_csv(index=False)
+                st.download_button(
+                    label="📥 Download Current Page as CSV",
+                    data=csv,
+                    file_name=f"orchids_page_{st.session_state.browse_page_number}.csv",
+                    mime="text/csv"
+                )
+            else:
+                st.warning("Please select at least one column to display")
+            
+            # Summary statistics
+            with st.expander("📈 Summary Statistics"):
+                col1, col2, col3 = st.columns(3)
                 
-                # Select columns to display
-                all_columns = list(df.columns)
-                default_cols = ['Scientific_Name', 'Genus', 'Flower_Color', 'Native_Regions', 
-                               'Temperature_Min_C', 'Temperature_Max_C', 'Fragrance', 'Horticultural_Difficulty']
-                available_default = [col for col in default_cols if col in all_columns]
+                with col1:
+                    if 'Flower_Color' in df.columns:
+                        st.markdown("**Top Flower Colors**")
+                        color_counts = df['Flower_Color'].value_counts().head(5)
+                        for color, count in color_counts.items():
+                            st.write(f"• {color}: {count}")
                 
-                selected_cols = st.multiselect(
-                    "Select columns to display",
-                    all_columns,
-                    default=available_default
-                )
+                with col2:
+                    if 'Genus' in df.columns:
+                        st.markdown("**Top Genera**")
+                        genus_counts = df['Genus'].value_counts().head(5)
+                        for genus, count in genus_counts.items():
+                            st.write(f"• {genus}: {count}")
                 
-                if selected_cols:
-                    st.dataframe(df[selected_cols], use_container_width=True)
-                    
-                    # Download option
-                    csv = df[selected_cols].to_csv(index=False)
-                    st.download_button(
-                        label="📥 Download Current Page as CSV",
-                        data=csv,
-                        file_name=f"orchids_page_{page}.csv",
-                        mime="text/csv"
-                    )
-                else:
-                    st.warning("Please select at least one column to display")
+                with col3:
+                    if 'Native_Regions' in df.columns:
+                        st.markdown("**Top Regions**")
+                        region_counts = df['Native_Regions'].value_counts().head(5)
+                        for region, count in region_counts.items():
+                            st.write(f"• {region}: {count}")
+
+    
+    # Where the time of the last searches went, newest first
+    if db.instrumentation.enabled:
+        with st.expander("⏱️ Performance"):
+            traces = db.instrumentation.recent(20)
+            if traces:
+                import pandas as pd
+                stage_names = sorted({name for t in traces for name in t.stages})
+                st.dataframe(pd.DataFrame([
+                    {'trace': t.name, 'total ms': round(t.total_ms, 1),
+                     **{f'{name} ms': round(t.stages.get(name, 0.0), 1) for name in stage_names},
+                     'statements': len(t.statements), 'params': t.param_count,
+                     'cache hits': t.cache_hits, 'calls': '; '.join(t.calls)}
+                    for t in traces
+                ]), use_container_width=True)
                 
-                # Summary statistics
-                with st.expander("📈 Summary Statistics"):
-                    col1, col2, col3 = st.columns(3)
-                    
-                    with col1:
-                        if 'Flower_Color' in df.columns:
-                            st.markdown("**Top Flower Colors**")
-                            color_counts = df['Flower_Color'].value_counts().head(5)
-                            for color, count in color_counts.items():
-                                st.write(f"• {color}: {count}")
-                    
-                    with col2:
-                        if 'Genus' in df.columns:
-                            st.markdown("**Top Genera**")
-                            genus_counts = df['Genus'].value_counts().head(5)
-                            for genus, count in genus_counts.items():
-                                st.write(f"• {genus}: {count}")
-                    
-                    with col3:
-                        if 'Native_Regions' in df.columns:
-                            st.markdown("**Top Regions**")
-                            region_counts = df['Native_Regions'].value_counts().head(5)
-                            for region, count in region_counts.items():
-                                st.write(f"• {region}: {count}")
+                picked = st.selectbox("Statements of", range(len(traces)),
+                                      format_func=lambda i: f"{traces[i].name} ({traces[i].total_ms:.1f} ms)")
+                for statement in traces[picked].statements:
+                    st.caption(f"{statement.ms:.2f} ms · {statement.param_count} params · {statement.rows} rows")
+                    st.code(statement.sql, language="sql")
+                    if statement.plan:
+                        st.code("\n".join(statement.plan), language="text")
+            else:
+                st.caption("No queries traced yet")
 
 else:
     st.error("⚠️ Database not loaded. Please check the sidebar for error details.")